@@ -0,0 +1,135 @@
+"""Compare the legacy fixed-width chunker with the structure-aware chunker on one doc.
+
+Reports chunk count, token sizes, chunking time and how many questionnaire
+variable blocks stay whole. With ``--embed`` it also embeds both chunk sets and
+measures index time and retrieval hit rate on "relevance of <variable>" queries.
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import time
+from pathlib import Path
+
+from src.config import settings
+from src.integrations.openai_client import OpenAIClient, cosine_similarity
+from src.knowledge.chunker import MarkdownChunker, estimate_tokens
+
+_VARIABLE = re.compile(r"^### Variable: `([^`]+)`", re.MULTILINE)
+
+
+def _legacy_chunks(content: str) -> list[str]:
+	"""Previous behaviour: ##/### sections cut every 512 chars with 64 overlap."""
+
+	sections: list[str] = []
+	current: list[str] = []
+	for line in content.split("\n"):
+		if re.match(r"^(#{2,3})\s+(.+)$", line):
+			if current:
+				sections.append("\n".join(current).strip())
+				current = []
+		else:
+			current.append(line)
+	if current:
+		sections.append("\n".join(current).strip())
+
+	chunks: list[str] = []
+	for text in sections:
+		if not text.strip():
+			continue
+		if len(text) <= 512:
+			chunks.append(text)
+			continue
+		chunks.extend(text[start : start + 512] for start in range(0, len(text), 448))
+	return chunks
+
+
+def _variable_bodies(content: str) -> dict[str, str]:
+	"""Map each variable name to its block body with whitespace collapsed."""
+
+	bodies: dict[str, str] = {}
+	for block in re.split(r"^---\s*$", content, flags=re.MULTILINE):
+		match = _VARIABLE.search(block)
+		if match:
+			body = block[match.end() :].split("\n#", 1)[0]
+			bodies[match.group(1)] = " ".join(body.split())
+	return bodies
+
+
+def _summary(label: str, chunks: list[str], seconds: float, bodies: dict[str, str]) -> None:
+	sizes = sorted(estimate_tokens(chunk) for chunk in chunks) or [0]
+	flattened = [" ".join(chunk.split()) for chunk in chunks]
+	whole = sum(1 for body in bodies.values() if any(body in chunk for chunk in flattened))
+	print(
+		f"{label:>10}: chunks={len(chunks)} "
+		f"tokens(median={sizes[len(sizes) // 2]}, max={sizes[-1]}) "
+		f"chunk_time={seconds * 1000:.1f}ms variables_in_one_chunk={whole}/{len(bodies)}"
+	)
+
+
+async def _hit_rate(
+	client: OpenAIClient, label: str, chunks: list[str], variables: list[str], top_k: int,
+) -> None:
+	started = time.perf_counter()
+	embeddings = await client.embed_batch_async(chunks)
+	index_seconds = time.perf_counter() - started
+	hits = 0
+	for name in variables:
+		query = await client.embed_text_async(f"What is the relevance of {name}?")
+		ranked = sorted(
+			range(len(chunks)),
+			key=lambda index: cosine_similarity(query, embeddings[index]),
+			reverse=True,
+		)
+		if any("Logic" in chunks[index] and name in chunks[index] for index in ranked[:top_k]):
+			hits += 1
+	print(f"{label:>10}: index_time={index_seconds:.1f}s hit_rate@{top_k}={hits}/{len(variables)}")
+
+
+async def _run(doc: Path, embed: bool, sample: int, top_k: int) -> None:
+	content = doc.read_text(encoding="utf-8")
+	bodies = _variable_bodies(content)
+
+	started = time.perf_counter()
+	legacy = _legacy_chunks(content)
+	legacy_seconds = time.perf_counter() - started
+	started = time.perf_counter()
+	structured = [text for _, text in MarkdownChunker().chunk(content)]
+	structured_seconds = time.perf_counter() - started
+
+	print(f"doc={doc} chars={len(content)} variables={len(bodies)}")
+	_summary("legacy", legacy, legacy_seconds, bodies)
+	_summary("structured", structured, structured_seconds, bodies)
+
+	if embed:
+		client = OpenAIClient()
+		with_logic = sorted(name for name, body in bodies.items() if "Logic" in body)
+		queries = random.Random(7).sample(with_logic, min(sample, len(with_logic)))
+		await _hit_rate(client, "legacy", legacy, queries, top_k)
+		await _hit_rate(client, "structured", structured, queries, top_k)
+
+
+def _largest_doc() -> Path:
+	docs = sorted(
+		Path(settings.knowledge_base_path).rglob("*.md"), key=lambda path: path.stat().st_size
+	)
+	if not docs:
+		raise SystemExit(f"No markdown docs under {settings.knowledge_base_path}")
+	return docs[-1]
+
+
+def main() -> None:
+	"""Parse args and run the comparison."""
+
+	parser = argparse.ArgumentParser(description="Benchmark knowledge base chunking.")
+	parser.add_argument("doc", nargs="?", type=Path, help="Markdown doc (default: largest in KB).")
+	parser.add_argument("--embed", action="store_true", help="Embed chunks and measure hit rate.")
+	parser.add_argument("--sample", type=int, default=50, help="Variables to query with --embed.")
+	parser.add_argument("--top-k", type=int, default=4, help="Retrieval depth for hit rate.")
+	args = parser.parse_args()
+	asyncio.run(_run(args.doc or _largest_doc(), args.embed, args.sample, args.top_k))
+
+
+if __name__ == "__main__":
+	main()
@@ -1,23 +1,42 @@
 """CLI entry point for barangay prefix lookup export."""
 
+import asyncio
+import csv
 import json
+import sys
 from pathlib import Path
 
+from src.config import settings
+from src.integrations.surveycto import SurveyCTOClient
+from src.services.barangay_lookup import build_location_mapping
 
-def main() -> None:
-	"""Generate placeholder barangay lookup mapping."""
 
-	mapping = {
-		"H030832": {
-			"barangay": "Guinacas",
-			"municipality": "Pototan",
-			"province": "Iloilo",
-		}
-	}
-	output_path = Path("docs/knowledge_base/brgy_lookup.json")
-	output_path.write_text(json.dumps(mapping, indent=2), encoding="utf-8")
-	print(f"Wrote lookup to {output_path}")
+async def main() -> None:
+	"""Generate the case-ID prefix to barangay lookup from the cases dataset.
+
+	Pass ``--offline`` to build from the last export at SURVEYCTO_CASES_CSV_PATH
+	instead of downloading it again.
+	"""
+
+	csv_path = Path(settings.surveycto_cases_csv_path)
+	if "--offline" in sys.argv[1:]:
+		with csv_path.open(encoding="utf-8-sig", errors="ignore", newline="") as handle:
+			rows = list(csv.DictReader(handle))
+	else:
+		rows = await SurveyCTOClient().fetch_cases_rows_with_fallback(
+			settings.surveycto_cases_source_id,
+			output_path=csv_path,
+		)
+	if not rows:
+		print("No case rows available; lookup not written")
+		return
+
+	mapping = build_location_mapping(rows)
+	output_path = Path(settings.brgy_lookup_path)
+	output_path.parent.mkdir(parents=True, exist_ok=True)
+	output_path.write_text(json.dumps(mapping, indent=2, ensure_ascii=False), encoding="utf-8")
+	print(f"Wrote {len(mapping)} prefixes from {len(rows)} cases to {output_path}")
 
 
 if __name__ == "__main__":
-	main()
+	asyncio.run(main())
@@ -1,6 +1,7 @@
 """Discord bot application entry point."""
 
 import asyncio
+import re
 from datetime import datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
@@ -13,12 +14,15 @@ from src.db import init_db
 from src.db.repositories.announcement_repo import AnnouncementRepository
 from src.db.repositories.escalation_repo import EscalationRepository
 from src.db.repositories.interaction_repo import InteractionRepository
+from src.db.repositories.job_repo import BackgroundJobRepository
 from src.integrations.google_sheets import GoogleSheetsClient
 from src.integrations.openai_client import OpenAIClient
 from src.integrations.surveycto import SurveyCTOClient
 from src.knowledge.collector import KnowledgeCollector
-from src.knowledge.indexer import KnowledgeIndexer
+from src.knowledge.index_manager import KnowledgeIndexManager
+from src.knowledge.watcher import KnowledgeBaseWatcher
 from src.knowledge.retriever import KnowledgeRetriever
+from src.models.background_job import BackgroundJobRecord
 from src.services.announcement_service import AnnouncementService
 from src.services.assignment_service import AssignmentService
 from src.services.case_service import CaseService
@@ -29,11 +33,17 @@ from src.services.progress_exceptions_service import ProgressExceptionsService
 from src.services.protocol_service import ProtocolService, _escalation_mention
 from src.services.remote_automation_service import RemoteAutomationService
 from src.services.scheduler_service import SchedulerService
+from src.services.submission_warehouse import SubmissionWarehouse
 from src.services.issue_triage_service import IssueTriageService
+from src.services.job_runner import JobFactory, JobListener, JobRunner, render_job
 from src.services.surveycto_issue_service import SurveyCTOIssueService
 from src.utils.logger import configure_logging, get_logger
 
 
+async def _noop_progress(_note: str) -> None:
+	return None
+
+
 COGS = [
 	"src.cogs.admin",
 	"src.cogs.cases",
@@ -68,6 +78,7 @@ class FieldAssistBot(commands.Bot):
 		self.interaction_repository = InteractionRepository()
 		self.escalation_repository = EscalationRepository()
 		self.announcement_repository = AnnouncementRepository()
+		self.job_repository = BackgroundJobRepository()
 
 		self.escalation_service = EscalationService(self.escalation_repository)
 		self.case_service = CaseService(self.survey_client, self.escalation_service)
@@ -76,41 +87,37 @@ class FieldAssistBot(commands.Bot):
 		self.progress_exceptions_service = ProgressExceptionsService(self.sheets_client)
 		self.announcement_service = AnnouncementService(self.announcement_repository)
 		self.issue_triage_service = IssueTriageService(self.openai_client)
-		self.remote_automation_service = RemoteAutomationService(self.survey_client)
+		self.submission_warehouse = SubmissionWarehouse()
+		self.remote_automation_service = RemoteAutomationService(
+			self.survey_client,
+			self.submission_warehouse,
+		)
+		self.job_runner = JobRunner(self.job_repository)
 		# protocol_service is finalized in setup_hook after async index build
 		self.protocol_service: ProtocolService | None = None
 		self.scheduler_service = SchedulerService(settings.timezone)
 		self.intent_classifier: IntentClassifier | None = None
 		self.surveycto_issue_service = SurveyCTOIssueService(self.sheets_client, self.openai_client)
-		self._knowledge_docs_seen: set[str] = set()
+		self.knowledge_index = KnowledgeIndexManager(self.openai_client)
+		self.knowledge_watcher = KnowledgeBaseWatcher(
+			Path(settings.knowledge_base_path),
+			self._on_knowledge_change,
+		)
 		self.knowledge_collector = KnowledgeCollector(Path(settings.knowledge_candidates_path))
 
 	async def setup_hook(self) -> None:
 		"""Load initial cogs and sync application commands."""
 
 		await init_db()
+		interrupted = await self.job_repository.mark_interrupted()
+		if interrupted:
+			self.log.warning("jobs.marked_interrupted", count=interrupted)
 
 		# Build/load persistent knowledge index with incremental re-embedding
-		indexer = KnowledgeIndexer(
-			Path(settings.knowledge_base_path),
-			self.openai_client,
-			cache_path=Path(settings.knowledge_index_cache_path),
-		)
-		chunks, index_stats = await indexer.build_index()
-		self.retriever = KnowledgeRetriever(chunks, self.openai_client)
-		kb_base = Path(settings.knowledge_base_path)
-		self._knowledge_docs_seen = {
-			path.relative_to(kb_base).as_posix() for path in kb_base.rglob("*.md")
-		}
-		self.log.info(
-			"knowledge.indexed",
-			chunk_count=index_stats.chunk_count,
-			total_docs=index_stats.total_docs,
-			reused_chunks=index_stats.reused_chunks,
-			embedded_chunks=index_stats.embedded_chunks,
-			changed_docs=index_stats.changed_docs,
-			cache_hit=index_stats.cache_hit,
-		)
+		await self.knowledge_index.rebuild(reason="startup")
+		self.knowledge_index.subscribe(self._use_retriever)
+		if self.retriever is None:
+			raise RuntimeError("Knowledge index rebuild did not publish a retriever")
 
 		self.protocol_service = ProtocolService(
 			self.retriever,
@@ -119,6 +126,8 @@ class FieldAssistBot(commands.Bot):
 			self.escalation_service,
 		)
 		self.intent_classifier = IntentClassifier(self.openai_client)
+		await self.case_service.load_case_index()
+		await self.case_service.load_locations()
 		for cog in COGS:
 			await self.load_extension(cog)
 		self.scheduler_service.schedule_cron(
@@ -159,7 +168,14 @@ class FieldAssistBot(commands.Bot):
 			minute=30,
 			job_id="form_version_monitor",
 		)
+		self.scheduler_service.schedule_interval(
+			self.case_service.refresh_case_index,
+			minutes=max(settings.case_index_refresh_minutes, 5),
+			job_id="case_index_refresh",
+		)
 		if settings.auto_reindex_on_new_docs:
+			self.knowledge_watcher.start()
+			# Safety net for events the watcher cannot see (e.g. network drives)
 			self.scheduler_service.schedule_interval(
 				self.check_knowledge_base_updates,
 				minutes=max(settings.knowledge_scan_interval_minutes, 10),
@@ -304,6 +320,11 @@ class FieldAssistBot(commands.Bot):
 	) -> str:
 		"""Classify intent and route to the right service."""
 
+		# "What controls hh_q12?" is answered from the form dependency graph.
+		controls = await self.surveycto_issue_service.answer_controls_question(question)
+		if controls:
+			return controls
+
 		intent, param = await self.intent_classifier.classify(question)
 		self.log.info("mention.classified", intent=intent.value, param=param)
 
@@ -348,7 +369,9 @@ class FieldAssistBot(commands.Bot):
 		if intent == Intent.PROGRESS:
 			from src.utils.formatters import format_progress_text
 			values = await self.progress_service.overall_progress()
-			return format_progress_text(values, "\U0001f4ca Overall Progress")
+			return format_progress_text(
+				values, "\U0001f4ca Overall Progress", self.progress_service.staleness_note()
+			)
 
 		if intent == Intent.FORM_VERSION:
 			versions = await self.get_form_versions()
@@ -398,7 +421,7 @@ class FieldAssistBot(commands.Bot):
 			return await self._dm_chat(question)
 
 		answer, confidence = await self.protocol_service.answer_question(
-			question, user_id=user_id, channel=channel
+			question, user_id=user_id, channel=channel, intent=intent
 		)
 		if is_dm:
 			return answer  # skip confidence tag in DMs — keep it conversational
@@ -607,43 +630,100 @@ class FieldAssistBot(commands.Bot):
 		# --- Automation job intents ------------------------------------------
 		from src.services.remote_automation_service import RemoteAutomationService
 
-		if intent == Intent.RC_DOWNLOAD_HH:
-			result = await self.remote_automation_service.download_form(
-				RemoteAutomationService.FORM_HH, requester=user_id,
-			)
-			return f"{result.summary}\n" + "\n".join(f"- {d}" for d in result.details)
+		force = bool(re.search(r"\b(force|forced|rerun|re-run)\b", raw_text, re.IGNORECASE))
+		service = self.remote_automation_service
+		downloads = {
+			Intent.RC_DOWNLOAD_HH: RemoteAutomationService.FORM_HH,
+			Intent.RC_DOWNLOAD_BIZ: RemoteAutomationService.FORM_BIZ,
+			Intent.RC_DOWNLOAD_PHASE_A: RemoteAutomationService.FORM_PHASE_A,
+		}
+		single_dms = {
+			Intent.RC_RUN_HH_DMS: RemoteAutomationService.FORM_HH,
+			Intent.RC_RUN_BIZ_DMS: RemoteAutomationService.FORM_BIZ,
+		}
 
-		if intent == Intent.RC_DOWNLOAD_BIZ:
-			result = await self.remote_automation_service.download_form(
-				RemoteAutomationService.FORM_BIZ, requester=user_id,
+		if intent in downloads:
+			form_key = downloads[intent]
+			return await self._run_automation_job(
+				f"download_{form_key}",
+				user_id,
+				message,
+				lambda progress: service.download_form(
+					form_key, requester=user_id, progress=progress,
+				),
 			)
-			return f"{result.summary}\n" + "\n".join(f"- {d}" for d in result.details)
 
-		if intent == Intent.RC_DOWNLOAD_PHASE_A:
-			result = await self.remote_automation_service.download_form(
-				RemoteAutomationService.FORM_PHASE_A, requester=user_id,
+		if intent in single_dms:
+			form_key = single_dms[intent]
+			return await self._run_automation_job(
+				f"run_dms_{form_key}",
+				user_id,
+				message,
+				lambda progress: service.run_single_dms(
+					form_key, requester=user_id, force=force, progress=progress,
+				),
 			)
-			return f"{result.summary}\n" + "\n".join(f"- {d}" for d in result.details)
 
-		if intent == Intent.RC_RUN_HH_DMS:
-			result = await self.remote_automation_service.run_single_dms(
-				RemoteAutomationService.FORM_HH, requester=user_id,
+		if intent == Intent.RC_RUN_DMS:
+			return await self._run_automation_job(
+				RemoteAutomationService.DAILY_DMS_JOB,
+				user_id,
+				message,
+				lambda progress: service.run_job(
+					job_name=RemoteAutomationService.DAILY_DMS_JOB,
+					requester=user_id,
+					force=force,
+					progress=progress,
+				),
 			)
-			return f"{result.summary}\n" + "\n".join(f"- {d}" for d in result.details)
 
-		if intent == Intent.RC_RUN_BIZ_DMS:
-			result = await self.remote_automation_service.run_single_dms(
-				RemoteAutomationService.FORM_BIZ, requester=user_id,
-			)
-			return f"{result.summary}\n" + "\n".join(f"- {d}" for d in result.details)
+		return (
+			"🤔 I recognized a remote-control request but couldn't figure out what to do. "
+			"Try rephrasing?"
+		)
 
-		if intent == Intent.RC_RUN_DMS:
-			result = await self.remote_automation_service.run_job(
-				job_name=RemoteAutomationService.DAILY_DMS_JOB, requester=user_id,
-			)
-			return f"{result.summary}\n" + "\n".join(f"- {d}" for d in result.details)
+	def job_message_listener(
+		self,
+		channel: discord.abc.Messageable,
+		*,
+		reply_to: discord.Message | None = None,
+	) -> JobListener:
+		"""Return a listener that posts a job's status once, then edits it in place."""
+
+		posted: list[discord.Message] = []
+
+		async def _listener(record: BackgroundJobRecord) -> int:
+			text = render_job(record)
+			if posted:
+				await posted[0].edit(content=text)
+			elif reply_to is not None:
+				posted.append(await reply_to.reply(text))
+			else:
+				posted.append(await channel.send(text))
+			return posted[0].id
 
-		return "🤔 I recognized a remote-control request but couldn't figure out what to do. Try rephrasing?"
+		return _listener
+
+	async def _run_automation_job(
+		self,
+		name: str,
+		user_id: str,
+		message: discord.Message | None,
+		factory: JobFactory,
+	) -> str:
+		"""Run an automation in the background, tracking it in a status message."""
+
+		if message is None:
+			result = await factory(_noop_progress)
+			return f"{result.summary}\n" + "\n".join(f"- {d}" for d in result.details)
+		await self.job_runner.submit(
+			name,
+			user_id,
+			factory,
+			channel_id=message.channel.id,
+			listener=self.job_message_listener(message.channel, reply_to=message),
+		)
+		return ""
 
 	async def _send_reply(self, message: discord.Message, text: str) -> None:
 		"""Reply, splitting if over Discord's 2000-char limit."""
@@ -698,6 +778,7 @@ class FieldAssistBot(commands.Bot):
 		"""Close bot and shutdown scheduler."""
 
 		self.scheduler_service.shutdown()
+		await self.knowledge_watcher.stop()
 		await super().close()
 
 	async def run_morning_briefing(self) -> None:
@@ -719,34 +800,30 @@ class FieldAssistBot(commands.Bot):
 
 		self.log.info("scheduler.morning_briefing", content=content)
 
+	def _use_retriever(self, retriever: KnowledgeRetriever) -> None:
+		"""Point answering at a freshly built retriever."""
+
+		self.retriever = retriever
+		if self.protocol_service is not None:
+			self.protocol_service.retriever = retriever
+		self.surveycto_issue_service.retriever = retriever
+
+	async def _on_knowledge_change(self, docs: set[str] | None) -> None:
+		"""Patch the index for watched doc changes, or rescan when paths are unknown."""
+
+		if docs is None:
+			await self.knowledge_index.refresh_if_changed()
+		else:
+			await self.knowledge_index.apply_changes(docs)
+
 	async def check_knowledge_base_updates(self) -> None:
-		"""Reindex only when new markdown files are added to KB directory."""
+		"""Reindex when KB markdown files are added, modified, or deleted.
 
-		kb_path = Path(settings.knowledge_base_path)
-		current_docs = {path.relative_to(kb_path).as_posix() for path in kb_path.rglob("*.md")}
-		new_docs = current_docs - self._knowledge_docs_seen
-		if not new_docs:
-			self.log.info("knowledge.scan.no_new_docs", scanned_docs=len(current_docs))
-			return
+		The scan stats each file and re-hashes only those whose size or mtime
+		changed since the last scan, so an idle KB costs a few stat calls.
+		"""
 
-		self.log.info("knowledge.scan.new_docs_found", count=len(new_docs), docs=sorted(new_docs))
-		indexer = KnowledgeIndexer(
-			kb_path,
-			self.openai_client,
-			cache_path=Path(settings.knowledge_index_cache_path),
-		)
-		chunks, stats = await indexer.build_index()
-		self.retriever = KnowledgeRetriever(chunks, self.openai_client)
-		if self.protocol_service is not None:
-			self.protocol_service.retriever = self.retriever
-		self._knowledge_docs_seen = current_docs
-		self.log.info(
-			"knowledge.reindexed_on_new_docs",
-			chunk_count=stats.chunk_count,
-			reused_chunks=stats.reused_chunks,
-			embedded_chunks=stats.embedded_chunks,
-			changed_docs=stats.changed_docs,
-		)
+		await self.knowledge_index.refresh_if_changed()
 
 	async def get_form_versions(self) -> dict[str, str]:
 		"""Get form versions from SurveyCTO Google Sheet Settings tabs."""
@@ -780,8 +857,12 @@ class FieldAssistBot(commands.Bot):
 		"""Scheduled form version monitor hook."""
 
 		versions = await self.get_form_versions()
-		for form, version in versions.items():
-			content = self.announcement_service.from_template("form_update", form=form, version=version)
+		# Only versions that differ from the last ones seen are announced.
+		updates = await self.announcement_service.pending_form_updates(versions)
+		for record in updates:
+			content = self.announcement_service.from_template(
+				"form_update", form=record.form_id, version=record.version
+			)
 			await self.announcement_service.log_announcement("form_update", "#scto", content)
 
 			# Send to Discord channel if configured
@@ -789,15 +870,23 @@ class FieldAssistBot(commands.Bot):
 				channel = self.get_channel(settings.scto_channel_id)
 				if channel and hasattr(channel, "send"):
 					await channel.send(content)
-					self.log.info("scheduler.form_version_monitor.sent", channel_id=settings.scto_channel_id)
+					self.log.info(
+						"scheduler.form_version_monitor.sent", channel_id=settings.scto_channel_id
+					)
+			await self.announcement_service.mark_form_update_announced(record)
 
 		if not settings.scto_channel_id:
-			self.log.info("scheduler.form_version_monitor", forms=len(versions))
+			self.log.info("scheduler.form_version_monitor", forms=len(versions), changed=len(updates))
 
 	async def run_progress_exceptions(self) -> None:
 		"""Post nightly productivity anomalies only (no dashboard dump)."""
 
-		report = await self.progress_exceptions_service.build_nightly_report()
+		try:
+			report = await self.progress_exceptions_service.build_nightly_report()
+		except Exception as error:
+			# Better no report than one built from a copy cached hours ago.
+			self.log.error("scheduler.progress_exceptions.sheet_unavailable", error=str(error))
+			return
 		if not report.has_anomalies:
 			self.log.info("scheduler.progress_exceptions.none")
 			return
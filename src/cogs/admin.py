@@ -9,8 +9,6 @@ from discord.ext import commands
 
 from src.bot import FieldAssistBot
 from src.config import settings
-from src.knowledge.indexer import KnowledgeIndexer
-from src.knowledge.retriever import KnowledgeRetriever
 from src.utils.permissions import SRA_ROLE, has_any_role
 
 
@@ -34,8 +32,13 @@ class AdminCog(commands.Cog):
 		interactions = await self.bot.interaction_repository.count()
 		open_escalations = await self.bot.escalation_repository.open_count()
 		announcements = await self.bot.announcement_repository.count()
+		sheets = self.bot.sheets_client.api.metrics()
 		await interaction.followup.send(
-			f"Interactions: {interactions}\nOpen escalations: {open_escalations}\nAnnouncements: {announcements}"
+			f"Interactions: {interactions}\nOpen escalations: {open_escalations}\n"
+			f"Announcements: {announcements}\n"
+			f"Sheets API: queued={sheets['queued']} running={sheets['running']} "
+			f"requests={sheets['requests']} rate_limited={sheets['rate_limited']} "
+			f"retries={sheets['retries']} throttled={sheets['throttled_seconds']:.1f}s"
 		)
 
 	@app_commands.command(name="reload_kb", description="Reload knowledge base index")
@@ -47,14 +50,7 @@ class AdminCog(commands.Cog):
 			await interaction.response.send_message("insufficient permissions", ephemeral=True)
 			return
 		await interaction.response.defer()
-		indexer = KnowledgeIndexer(
-			Path(settings.knowledge_base_path),
-			self.bot.openai_client,
-			cache_path=Path(settings.knowledge_index_cache_path),
-		)
-		chunks, stats = await indexer.build_index()
-		retriever = KnowledgeRetriever(chunks, self.bot.openai_client)
-		self.bot.protocol_service.retriever = retriever
+		stats = await self.bot.knowledge_index.rebuild(reason="reload_kb")
 		await interaction.followup.send(
 			"Knowledge base reloaded "
 			f"({stats.chunk_count} chunks, reused {stats.reused_chunks}, embedded {stats.embedded_chunks})."
@@ -166,16 +162,7 @@ class AdminCog(commands.Cog):
 		)
 		target_path.write_text(existing + entry, encoding="utf-8")
 
-		indexer = KnowledgeIndexer(
-			Path(settings.knowledge_base_path),
-			self.bot.openai_client,
-			cache_path=Path(settings.knowledge_index_cache_path),
-		)
-		chunks, stats = await indexer.build_index()
-		retriever = KnowledgeRetriever(chunks, self.bot.openai_client)
-		self.bot.retriever = retriever
-		if self.bot.protocol_service is not None:
-			self.bot.protocol_service.retriever = retriever
+		stats = await self.bot.knowledge_index.rebuild(reason="promote_candidate")
 
 		await interaction.followup.send(
 			"Promoted and reindexed: "
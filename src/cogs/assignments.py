@@ -1,5 +1,7 @@
 """Assignment command handlers."""
 
+import re
+
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -23,20 +25,28 @@ class AssignmentsCog(commands.Cog):
 			await interaction.followup.send(f"No assignments for {team_name}.")
 			return
 		lines = [f"{row['case_id']} → {row['fo']}" for row in rows]
-		await interaction.followup.send("\n".join(lines))
+		note = self.bot.assignment_service.staleness_note()
+		await interaction.followup.send("\n".join([*lines, note] if note else lines))
 
-	@app_commands.command(name="where_is", description="Find team for a case")
+	@app_commands.command(name="where_is", description="Find team for one or more cases")
+	@app_commands.describe(case_id="Case ID, or several separated by commas or spaces")
 	async def where_is(self, interaction: discord.Interaction, case_id: str) -> None:
-		"""Return assignment row for given case ID."""
+		"""Return assignment rows for the given case IDs."""
 
 		await interaction.response.defer()
-		row = await self.bot.assignment_service.where_is_case(case_id)
-		if row is None:
-			await interaction.followup.send("Case not found in assignments.")
-			return
-		await interaction.followup.send(
-			f"{case_id} is assigned to {row['team']} ({row['fo']})"
-		)
+		case_ids = [part for part in re.split(r"[\s,]+", case_id) if part]
+		found = await self.bot.assignment_service.where_are_cases(case_ids)
+		lines = []
+		for requested, row in found.items():
+			if row is not None:
+				lines.append(f"{requested} is assigned to {row['team']} ({row['fo']})")
+				continue
+			similar = await self.bot.assignment_service.cases_with_prefix(requested, limit=3)
+			line = f"{requested}: not found in assignments."
+			if similar:
+				line += f" Did you mean {', '.join(str(match['case_id']) for match in similar)}?"
+			lines.append(line)
+		await interaction.followup.send("\n".join(lines) or "Case not found in assignments.")
 
 	@app_commands.command(name="team_for", description="Find team for FO")
 	async def team_for(self, interaction: discord.Interaction, fo_name: str) -> None:
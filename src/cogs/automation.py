@@ -8,6 +8,7 @@ from discord.ext import commands
 
 from src.bot import FieldAssistBot
 from src.config import settings
+from src.services.job_runner import render_job
 from src.services.remote_automation_service import RemoteAutomationService
 from src.utils.permissions import SRA_ROLE, has_any_role
 
@@ -20,7 +21,10 @@ class AutomationCog(commands.Cog):
 		self.bot = bot
 
 	@app_commands.command(name="run_job", description="Run a whitelisted remote automation job")
-	@app_commands.describe(job_name="Allowed job name")
+	@app_commands.describe(
+		job_name="Allowed job name",
+		force="Re-run Stata DMS steps even if their inputs are unchanged",
+	)
 	@app_commands.choices(
 		job_name=[
 			app_commands.Choice(
@@ -33,6 +37,7 @@ class AutomationCog(commands.Cog):
 		self,
 		interaction: discord.Interaction,
 		job_name: app_commands.Choice[str],
+		force: bool = False,
 	) -> None:
 		"""Execute a safe, pre-approved automation pipeline."""
 		if settings.bot_admin_channel_id and (
@@ -51,15 +56,87 @@ class AutomationCog(commands.Cog):
 			return
 
 		await interaction.response.defer()
-		result = await self.bot.remote_automation_service.run_job(
-			job_name=job_name.value,
-			requester=str(interaction.user.id),
+		requester = str(interaction.user.id)
+		service = self.bot.remote_automation_service
+		channel = interaction.channel
+		listener = (
+			self.bot.job_message_listener(channel)
+			if isinstance(channel, discord.abc.Messageable)
+			else None
+		)
+		record = await self.bot.job_runner.submit(
+			job_name.value,
+			requester,
+			lambda progress: service.run_job(
+				job_name=job_name.value,
+				requester=requester,
+				force=force,
+				progress=progress,
+			),
+			channel_id=interaction.channel_id,
+			listener=listener,
+		)
+		await interaction.followup.send(
+			f"🧾 Queued job `{record.job_id}`. Progress is posted below; "
+			f"use `/job_status job_id:{record.job_id}` any time."
 		)
-		lines = (
-			"\n".join(f"- {item}" for item in result.details)
-			if result.details
-			else "- no details"
+
+	@app_commands.command(name="job_status", description="Show a background job or recent jobs")
+	@app_commands.describe(job_id="Job ID (leave empty to list recent jobs)")
+	async def job_status(self, interaction: discord.Interaction, job_id: str | None = None) -> None:
+		"""Read job state from the background job table."""
+		await interaction.response.defer(ephemeral=True)
+		if job_id:
+			record = await self.bot.job_runner.get(job_id.strip())
+			if record is None:
+				await interaction.followup.send(f"Job `{job_id}` not found.", ephemeral=True)
+				return
+			await interaction.followup.send(render_job(record), ephemeral=True)
+			return
+
+		records = await self.bot.job_runner.recent(limit=10)
+		if not records:
+			await interaction.followup.send("No background jobs yet.", ephemeral=True)
+			return
+		lines = [
+			f"- `{record.job_id}` {record.name} — {record.status.value} "
+			f"({record.created_at:%Y-%m-%d %H:%M} UTC)"
+			for record in records
+			if record.created_at
+		]
+		await interaction.followup.send("Recent jobs:\n" + "\n".join(lines), ephemeral=True)
+
+	@app_commands.command(name="cancel_job", description="Cancel a queued or running job")
+	@app_commands.describe(job_id="Job ID from /run_job or /job_status")
+	async def cancel_job(self, interaction: discord.Interaction, job_id: str) -> None:
+		"""Cancel an active background job (Stata processes are killed)."""
+		member = interaction.user if isinstance(interaction.user, discord.Member) else None
+		if not has_any_role(member, {SRA_ROLE}):
+			await interaction.response.send_message("insufficient permissions", ephemeral=True)
+			return
+		if self.bot.job_runner.cancel(job_id.strip()):
+			await interaction.response.send_message(f"🛑 Cancelling job `{job_id}`.")
+		else:
+			await interaction.response.send_message(
+				f"Job `{job_id}` is not queued or running.", ephemeral=True,
+			)
+
+	@app_commands.command(
+		name="check_consistency",
+		description="Cross-check downloaded HH, business, Phase A and cases exports",
+	)
+	async def check_consistency(self, interaction: discord.Interaction) -> None:
+		"""Report orphan and duplicate caseids across the local form exports."""
+		member = interaction.user if isinstance(interaction.user, discord.Member) else None
+		if not has_any_role(member, {SRA_ROLE}):
+			await interaction.response.send_message("insufficient permissions", ephemeral=True)
+			return
+
+		await interaction.response.defer()
+		result = await self.bot.remote_automation_service.check_consistency(
+			requester=str(interaction.user.id),
 		)
+		lines = "\n".join(f"- {item}" for item in result.details) or "- no details"
 		await interaction.followup.send(f"{result.summary}\n{lines}")
 
 
@@ -67,6 +67,21 @@ class CasesCog(commands.Cog):
 		)
 		await interaction.followup.send(format_escalation_text(escalation_id))
 
+	@check_case.autocomplete("case_id")
+	@case_status.autocomplete("case_id")
+	@request_reopen.autocomplete("case_id")
+	async def case_id_autocomplete(
+		self,
+		interaction: discord.Interaction,
+		current: str,
+	) -> list[app_commands.Choice[str]]:
+		"""Suggest known case IDs from the in-memory index."""
+
+		return [
+			app_commands.Choice(name=case_id, value=case_id)
+			for case_id in self.bot.case_service.complete_case_ids(current)
+		]
+
 
 async def setup(bot: FieldAssistBot) -> None:
 	"""Load cog into bot instance."""
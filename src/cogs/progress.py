@@ -1,10 +1,13 @@
 """Progress reporting command handlers."""
 
+from datetime import datetime, timedelta
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 from src.bot import FieldAssistBot
+from src.services.remote_automation_service import RemoteAutomationService
 from src.utils.formatters import format_progress_text
 
 
@@ -20,7 +23,8 @@ class ProgressCog(commands.Cog):
 
 		await interaction.response.defer()
 		values = await self.bot.progress_service.overall_progress()
-		await interaction.followup.send(format_progress_text(values, "Overall progress"))
+		note = self.bot.progress_service.staleness_note()
+		await interaction.followup.send(format_progress_text(values, "Overall progress", note))
 
 	@app_commands.command(name="team_status", description="Show team-specific progress")
 	async def team_status(self, interaction: discord.Interaction, team_name: str) -> None:
@@ -28,7 +32,8 @@ class ProgressCog(commands.Cog):
 
 		await interaction.response.defer()
 		values = await self.bot.progress_service.team_status(team_name)
-		await interaction.followup.send(format_progress_text(values, f"Team {team_name}"))
+		note = self.bot.progress_service.staleness_note()
+		await interaction.followup.send(format_progress_text(values, f"Team {team_name}", note))
 
 	@app_commands.command(name="fo_productivity", description="Show FO productivity")
 	async def fo_productivity(self, interaction: discord.Interaction, fo_name: str) -> None:
@@ -36,7 +41,63 @@ class ProgressCog(commands.Cog):
 
 		await interaction.response.defer()
 		values = await self.bot.progress_service.fo_productivity(fo_name)
-		await interaction.followup.send(format_progress_text(values, f"FO {fo_name}"))
+		note = self.bot.progress_service.staleness_note()
+		await interaction.followup.send(format_progress_text(values, f"FO {fo_name}", note))
+
+	@app_commands.command(
+		name="submission_counts",
+		description="Count downloaded submissions from the local warehouse",
+	)
+	@app_commands.describe(
+		form="Downloaded form export",
+		group_by="Column to group by",
+		days="Only count submissions from the last N days (0 = all)",
+	)
+	@app_commands.choices(
+		form=[
+			app_commands.Choice(name="Household", value=RemoteAutomationService.FORM_HH),
+			app_commands.Choice(name="Business", value=RemoteAutomationService.FORM_BIZ),
+			app_commands.Choice(name="Phase A revisit", value=RemoteAutomationService.FORM_PHASE_A),
+		],
+		group_by=[
+			app_commands.Choice(name="team", value="team"),
+			app_commands.Choice(name="enumerator", value="enumerator"),
+		],
+	)
+	async def submission_counts(
+		self,
+		interaction: discord.Interaction,
+		form: app_commands.Choice[str],
+		group_by: app_commands.Choice[str],
+		days: int = 7,
+	) -> None:
+		"""Return per-team or per-enumerator submission counts from local data."""
+
+		await interaction.response.defer()
+		warehouse = self.bot.submission_warehouse
+		if not warehouse.has_form(form.value):
+			await interaction.followup.send(
+				f"No local export for {form.name} yet. Run a download first."
+			)
+			return
+		since = datetime.now() - timedelta(days=days) if days > 0 else None
+		try:
+			counts = await warehouse.counts_by(form.value, group_by.value, since=since)
+		except KeyError:
+			await interaction.followup.send(
+				f"{form.name} export has no `{group_by.value}` column."
+			)
+			return
+		window = f"last {days} days" if since else "all time"
+		if not counts:
+			await interaction.followup.send(f"No {form.name} submissions ({window}).")
+			return
+		lines = [f"{value or '(blank)'}: {count}" for value, count in counts[:25]]
+		total = sum(count for _, count in counts)
+		await interaction.followup.send(
+			f"{form.name} submissions by {group_by.value} ({window}, total {total}):\n"
+			+ "\n".join(lines)
+		)
 
 
 async def setup(bot: FieldAssistBot) -> None:
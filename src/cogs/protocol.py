@@ -5,6 +5,7 @@ from discord import app_commands
 from discord.ext import commands
 
 from src.bot import FieldAssistBot
+from src.services.intent_classifier import Intent
 from src.services.protocol_service import _escalation_mention
 
 
@@ -22,7 +23,7 @@ class ProtocolCog(commands.Cog):
 		user_id = str(interaction.user.id)
 		channel = f"#{interaction.channel.name}" if interaction.channel else "#unknown"
 		answer, confidence = await self.bot.protocol_service.answer_question(
-			question, user_id=user_id, channel=channel
+			question, user_id=user_id, channel=channel, intent=Intent.PROTOCOL
 		)
 		await interaction.followup.send(
 			f"{answer}\n\nConfidence: {confidence.value}"
@@ -41,6 +41,27 @@ class Settings(BaseSettings):
 	google_form_phase_a_revisit_sheet_id: str = Field(
 		default="", alias="GOOGLE_FORM_PHASE_A_REVISIT_SHEET_ID"
 	)
+	google_assignments_cache_ttl_seconds: float = Field(
+		default=900.0, alias="GOOGLE_ASSIGNMENTS_CACHE_TTL_SECONDS"
+	)
+	google_productivity_cache_ttl_seconds: float = Field(
+		default=300.0, alias="GOOGLE_PRODUCTIVITY_CACHE_TTL_SECONDS"
+	)
+	google_sheets_read_workers: int = Field(default=4, alias="GOOGLE_SHEETS_READ_WORKERS")
+	google_sheets_requests_per_minute: float = Field(
+		default=60.0, alias="GOOGLE_SHEETS_REQUESTS_PER_MINUTE"
+	)
+	google_sheets_max_retries: int = Field(default=5, alias="GOOGLE_SHEETS_MAX_RETRIES")
+	google_sheets_backoff_seconds: float = Field(default=1.0, alias="GOOGLE_SHEETS_BACKOFF_SECONDS")
+	xlsform_snapshot_dir: str = Field(
+		default=".cache/xlsform_snapshots", alias="XLSFORM_SNAPSHOT_DIR"
+	)
+	xlsform_version_check_minutes: float = Field(
+		default=10.0, alias="XLSFORM_VERSION_CHECK_MINUTES"
+	)
+	xlsform_semantic_min_score: float = Field(
+		default=0.35, alias="XLSFORM_SEMANTIC_MIN_SCORE"
+	)
 
 	surveycto_server_name: str = Field(default="", alias="SURVEYCTO_SERVER_NAME")
 	surveycto_username: str = Field(default="", alias="SURVEYCTO_USERNAME")
@@ -51,6 +72,11 @@ class Settings(BaseSettings):
 		default=".cache/cases_icm.csv",
 		alias="SURVEYCTO_CASES_CSV_PATH",
 	)
+	case_index_refresh_minutes: int = Field(default=60, alias="CASE_INDEX_REFRESH_MINUTES")
+	brgy_lookup_path: str = Field(
+		default="docs/knowledge_base/brgy_lookup.json",
+		alias="BRGY_LOOKUP_PATH",
+	)
 
 	database_url: str = Field(default="sqlite+aiosqlite:///./field_assist.db", alias="DATABASE_URL")
 
@@ -93,8 +119,36 @@ class Settings(BaseSettings):
 
 	stata_executable: str = Field(default="stata-mp", alias="STATA_EXECUTABLE")
 	stata_run_timeout_seconds: int = Field(default=1800, alias="STATA_RUN_TIMEOUT_SECONDS")
+	automation_max_parallel: int = Field(default=2, alias="AUTOMATION_MAX_PARALLEL")
+	automation_node_timeout_seconds: int = Field(
+		default=2400,
+		alias="AUTOMATION_NODE_TIMEOUT_SECONDS",
+	)
+	dms_fingerprints_path: str = Field(
+		default=".cache/dms_fingerprints.json",
+		alias="DMS_FINGERPRINTS_PATH",
+	)
+	dms_fingerprint_mode: str = Field(default="content", alias="DMS_FINGERPRINT_MODE")
+	stata_log_dir: str = Field(default=".cache/stata_logs", alias="STATA_LOG_DIR")
+	stata_log_keep_files: int = Field(default=50, alias="STATA_LOG_KEEP_FILES")
+	stata_tail_lines: int = Field(default=200, alias="STATA_TAIL_LINES")
+	stata_live_tail_seconds: float = Field(default=15.0, alias="STATA_LIVE_TAIL_SECONDS")
+	job_runner_max_workers: int = Field(default=1, alias="JOB_RUNNER_MAX_WORKERS")
+	job_progress_edit_seconds: float = Field(default=5.0, alias="JOB_PROGRESS_EDIT_SECONDS")
 	surveycto_sctoapi_date: int = Field(default=0, alias="SURVEYCTO_SCTOAPI_DATE")
 	remote_jobs_log_path: str = Field(default=".cache/remote_jobs_log.jsonl", alias="REMOTE_JOBS_LOG_PATH")
+	submission_warehouse_path: str = Field(
+		default=".cache/submissions.db",
+		alias="SUBMISSION_WAREHOUSE_PATH",
+	)
+	data_quality_rules_path: str = Field(
+		default="config/data_quality_rules.json",
+		alias="DATA_QUALITY_RULES_PATH",
+	)
+	consistency_hh_business_flag_column: str = Field(
+		default="",
+		alias="CONSISTENCY_HH_BUSINESS_FLAG_COLUMN",
+	)
 	surveycto_form_household_id: str = Field(
 		default="ICM_follow_up_launch_integrated",
 		alias="SURVEYCTO_FORM_HOUSEHOLD_ID",
@@ -157,6 +211,15 @@ class Settings(BaseSettings):
 	knowledge_scan_interval_minutes: int = Field(
 		default=30, alias="KNOWLEDGE_SCAN_INTERVAL_MINUTES"
 	)
+	knowledge_chunk_max_tokens: int = Field(default=256, alias="KNOWLEDGE_CHUNK_MAX_TOKENS")
+	variable_lookup_enabled: bool = Field(default=True, alias="VARIABLE_LOOKUP_ENABLED")
+	knowledge_extract_workers: int = Field(default=4, alias="KNOWLEDGE_EXTRACT_WORKERS")
+	knowledge_watch_debounce_seconds: float = Field(
+		default=2.0, alias="KNOWLEDGE_WATCH_DEBOUNCE_SECONDS"
+	)
+	knowledge_poll_interval_seconds: float = Field(
+		default=60.0, alias="KNOWLEDGE_POLL_INTERVAL_SECONDS"
+	)
 	passive_learning_enabled: bool = Field(default=True, alias="PASSIVE_LEARNING_ENABLED")
 	knowledge_candidates_path: str = Field(
 		default=".cache/knowledge_candidates.jsonl", alias="KNOWLEDGE_CANDIDATES_PATH"
@@ -75,6 +75,26 @@ async def init_db() -> None:
 			created_at TEXT NOT NULL
 		)
 		""",
+		"""
+		CREATE TABLE IF NOT EXISTS background_jobs (
+			job_id TEXT PRIMARY KEY,
+			name TEXT NOT NULL,
+			requester TEXT NOT NULL,
+			status TEXT NOT NULL,
+			progress TEXT NOT NULL,
+			summary TEXT,
+			details TEXT NOT NULL,
+			channel_id INTEGER,
+			message_id INTEGER,
+			created_at TEXT NOT NULL,
+			started_at TEXT,
+			finished_at TEXT
+		)
+		""",
+		"""
+		CREATE INDEX IF NOT EXISTS idx_background_jobs_created_at
+		ON background_jobs (created_at)
+		""",
 	]
 
 	async with engine.begin() as conn:
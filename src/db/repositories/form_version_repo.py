@@ -0,0 +1,50 @@
+"""Repository for last-seen SurveyCTO form versions."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from src.db.engine import engine
+from src.models.form_version import FormVersionRecord
+
+
+class FormVersionRepository:
+	"""Data access for the form_versions table."""
+
+	async def all(self) -> dict[str, FormVersionRecord]:
+		"""Return the last-seen version of every tracked form, keyed by form ID."""
+
+		async with engine.begin() as conn:
+			result = await conn.execute(
+				text("SELECT form_id, version, detected_at, announced FROM form_versions")
+			)
+			rows = result.fetchall()
+		return {
+			row.form_id: FormVersionRecord(
+				form_id=row.form_id,
+				version=row.version,
+				detected_at=datetime.fromisoformat(row.detected_at),
+				announced=bool(row.announced),
+			)
+			for row in rows
+		}
+
+	async def save(self, record: FormVersionRecord) -> None:
+		"""Insert or replace the row for ``record.form_id``."""
+
+		payload = {
+			"form_id": record.form_id,
+			"version": record.version,
+			"detected_at": (record.detected_at or datetime.now(timezone.utc)).isoformat(),
+			"announced": int(record.announced),
+		}
+		async with engine.begin() as conn:
+			await conn.execute(
+				text(
+					"""
+					INSERT OR REPLACE INTO form_versions (form_id, version, detected_at, announced)
+					VALUES (:form_id, :version, :detected_at, :announced)
+					"""
+				),
+				payload,
+			)
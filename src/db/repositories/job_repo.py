@@ -0,0 +1,120 @@
+"""Repository for background automation jobs."""
+
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from src.db.engine import engine
+from src.models.background_job import BackgroundJobRecord, JobStatus
+
+
+def _iso(value: datetime | None) -> str | None:
+	return value.isoformat() if value else None
+
+
+def _parse(value: str | None) -> datetime | None:
+	return datetime.fromisoformat(value) if value else None
+
+
+class BackgroundJobRepository:
+	"""Data access for the background job table."""
+
+	@staticmethod
+	def _payload(record: BackgroundJobRecord) -> dict[str, object]:
+		return {
+			"job_id": record.job_id,
+			"name": record.name,
+			"requester": record.requester,
+			"status": record.status.value,
+			"progress": json.dumps(record.progress, ensure_ascii=False),
+			"summary": record.summary,
+			"details": json.dumps(record.details, ensure_ascii=False),
+			"channel_id": record.channel_id,
+			"message_id": record.message_id,
+			"created_at": _iso(record.created_at or datetime.now(timezone.utc)),
+			"started_at": _iso(record.started_at),
+			"finished_at": _iso(record.finished_at),
+		}
+
+	@staticmethod
+	def _record(row: object) -> BackgroundJobRecord:
+		data = dict(row._mapping)  # type: ignore[attr-defined]
+		return BackgroundJobRecord(
+			job_id=data["job_id"],
+			name=data["name"],
+			requester=data["requester"],
+			status=JobStatus(data["status"]),
+			progress=json.loads(data["progress"] or "[]"),
+			summary=data["summary"],
+			details=json.loads(data["details"] or "[]"),
+			channel_id=data["channel_id"],
+			message_id=data["message_id"],
+			created_at=_parse(data["created_at"]),
+			started_at=_parse(data["started_at"]),
+			finished_at=_parse(data["finished_at"]),
+		)
+
+	async def save(self, record: BackgroundJobRecord) -> None:
+		"""Insert or replace the full job row."""
+
+		async with engine.begin() as conn:
+			await conn.execute(
+				text(
+					"""
+					INSERT OR REPLACE INTO background_jobs (
+						job_id, name, requester, status, progress, summary, details,
+						channel_id, message_id, created_at, started_at, finished_at
+					)
+					VALUES (
+						:job_id, :name, :requester, :status, :progress, :summary, :details,
+						:channel_id, :message_id, :created_at, :started_at, :finished_at
+					)
+					"""
+				),
+				self._payload(record),
+			)
+
+	async def get(self, job_id: str) -> BackgroundJobRecord | None:
+		"""Return one job by ID."""
+
+		async with engine.begin() as conn:
+			result = await conn.execute(
+				text("SELECT * FROM background_jobs WHERE job_id = :job_id"),
+				{"job_id": job_id},
+			)
+			row = result.first()
+		return self._record(row) if row else None
+
+	async def recent(self, limit: int = 10) -> list[BackgroundJobRecord]:
+		"""Return the most recently created jobs, newest first."""
+
+		async with engine.begin() as conn:
+			result = await conn.execute(
+				text("SELECT * FROM background_jobs ORDER BY created_at DESC LIMIT :limit"),
+				{"limit": limit},
+			)
+			rows = result.fetchall()
+		return [self._record(row) for row in rows]
+
+	async def mark_interrupted(self) -> int:
+		"""Fail jobs left queued or running by a previous process."""
+
+		async with engine.begin() as conn:
+			result = await conn.execute(
+				text(
+					"""
+					UPDATE background_jobs
+					SET status = :failed, summary = :summary, finished_at = :finished_at
+					WHERE status IN (:queued, :running)
+					"""
+				),
+				{
+					"failed": JobStatus.FAILED.value,
+					"summary": "❌ Interrupted: the bot restarted before this job finished.",
+					"finished_at": datetime.now(timezone.utc).isoformat(),
+					"queued": JobStatus.QUEUED.value,
+					"running": JobStatus.RUNNING.value,
+				},
+			)
+		return result.rowcount
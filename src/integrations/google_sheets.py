@@ -3,17 +3,28 @@
 import asyncio
 import base64
 import json
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
+from functools import partial
 
 import gspread
 from google.oauth2.service_account import Credentials
+from gspread.urls import DRIVE_FILES_API_V3_URL
 
 from src.config import settings
+from src.integrations.sheets_scheduler import SheetsApiScheduler
+from src.integrations.swr_cache import SWRCache
+from src.integrations.xlsform_snapshot import FormSnapshot, XLSFormSnapshotStore, issue_keywords
 from src.utils.logger import get_logger
 
 
 log = get_logger("google_sheets")
 
+SOURCE_ASSIGNMENTS = "assignments"
+SOURCE_PRODUCTIVITY = "productivity"
+
+# XLSForm tabs that issue triage reads; other tabs (e.g. translations) are skipped.
+_FORM_TABS = ("survey", "choices")
+
 
 class GoogleSheetsClient:
 	"""Async wrapper for assignment and productivity data."""
@@ -24,6 +35,23 @@ class GoogleSheetsClient:
 
 	def __init__(self) -> None:
 		self.has_credentials = bool(settings.google_service_account_json)
+		self.form_snapshots = XLSFormSnapshotStore()
+		self.sheet_cache = SWRCache(
+			{
+				SOURCE_ASSIGNMENTS: settings.google_assignments_cache_ttl_seconds,
+				SOURCE_PRODUCTIVITY: settings.google_productivity_cache_ttl_seconds,
+			}
+		)
+		# Drive modifiedTime at the last full read, per cached source / form sheet.
+		self._source_modified: dict[str, str] = {}
+		self._settings_rows: dict[str, tuple[str, dict[str, str]]] = {}
+		# All Sheets/Drive I/O runs on this pool, each HTTP request under the quota.
+		self.api = SheetsApiScheduler(
+			workers=settings.google_sheets_read_workers,
+			requests_per_minute=settings.google_sheets_requests_per_minute,
+			max_retries=settings.google_sheets_max_retries,
+			backoff_seconds=settings.google_sheets_backoff_seconds,
+		)
 		if self.has_credentials:
 			try:
 				# Decode base64-encoded service account JSON
@@ -36,7 +64,9 @@ class GoogleSheetsClient:
 						"https://www.googleapis.com/auth/drive.readonly",
 					],
 				)
-				self.client = gspread.authorize(credentials)
+				self.client = gspread.authorize(
+					credentials, http_client=self.api.http_client_class()
+				)
 				log.info("google_sheets.initialized", has_credentials=True)
 			except Exception as e:
 				log.error("google_sheets.init_failed", error=str(e))
@@ -46,8 +76,8 @@ class GoogleSheetsClient:
 				"google_sheets.no_credentials", message="Using hardcoded sample data"
 			)
 
-	async def read_assignments(self) -> list[dict[str, str]]:
-		"""Return assignment rows.
+	async def read_assignments(self, fresh: bool = False) -> list[dict[str, str]]:
+		"""Return assignment rows, from cache unless ``fresh``.
 
 		Expected columns: A=date, B=team, C=brgy_prefix, D=(spacer), E-H=stata command
 		"""
@@ -65,19 +95,16 @@ class GoogleSheetsClient:
 			]
 
 		def _read() -> list[dict[str, str]]:
-			try:
-				sheet = self.client.open_by_key(settings.google_assignments_sheet_id)
-				worksheet = sheet.get_worksheet(0)
-				records = worksheet.get_all_records()
-				return [dict(record) for record in records]
-			except Exception as e:
-				log.error("google_sheets.read_assignments_failed", error=str(e))
-				return []
+			sheet = self.client.open_by_key(settings.google_assignments_sheet_id)
+			worksheet = sheet.get_worksheet(0)
+			return [dict(record) for record in worksheet.get_all_records()]
 
-		return await asyncio.to_thread(_read)
+		return await self._cached_rows(
+			SOURCE_ASSIGNMENTS, settings.google_assignments_sheet_id, _read, fresh
+		)
 
-	async def read_productivity(self) -> list[dict[str, str]]:
-		"""Return productivity rows."""
+	async def read_productivity(self, fresh: bool = False) -> list[dict[str, str]]:
+		"""Return productivity rows, from cache unless ``fresh`` (which raises on failure)."""
 
 		if not self.has_credentials:
 			return [
@@ -87,44 +114,151 @@ class GoogleSheetsClient:
 			]
 
 		def _read() -> list[dict[str, str]]:
-			try:
-				sheet = self.client.open_by_key(settings.google_productivity_sheet_id)
-				worksheet = sheet.get_worksheet(0)
-				records = worksheet.get_all_records()
-				return [dict(record) for record in records]
-			except Exception as e:
-				log.error("google_sheets.read_productivity_failed", error=str(e))
-				return []
+			sheet = self.client.open_by_key(settings.google_productivity_sheet_id)
+			worksheet = sheet.get_worksheet(0)
+			return [dict(record) for record in worksheet.get_all_records()]
+
+		return await self._cached_rows(
+			SOURCE_PRODUCTIVITY, settings.google_productivity_sheet_id, _read, fresh
+		)
 
-		return await asyncio.to_thread(_read)
+	async def _cached_rows(
+		self,
+		source: str,
+		sheet_id: str,
+		read: Callable[[], list[dict[str, str]]],
+		fresh: bool,
+	) -> list[dict[str, str]]:
+		"""Serve ``source`` rows through the SWR cache; [] if never read successfully.
+
+		A refresh first asks Drive for the sheet's ``modifiedTime`` and keeps the
+		cached rows (as revalidated) when it has not moved since the last read.
+		A ``fresh`` read that fails raises instead of returning old or no rows.
+		"""
+
+		def _revalidate() -> list[dict[str, str]]:
+			modified = self._modified_time(sheet_id)
+			cached = self.sheet_cache.peek(source)
+			if modified and cached is not None and self._source_modified.get(source) == modified:
+				unchanged: list[dict[str, str]] = cached.value
+				return unchanged
+			rows = read()
+			self._source_modified[source] = modified
+			return rows
+
+		try:
+			cached = await self.sheet_cache.get(
+				source, lambda: self.api.run(_revalidate), fresh=fresh
+			)
+		except Exception as e:
+			log.error(f"google_sheets.read_{source}_failed", error=str(e))
+			if fresh:
+				raise
+			return []
+		return cached.value
+
+	def staleness_note(self, source: str) -> str:
+		"""Return a reply footer if ``source`` was last served from an out-of-date copy."""
+
+		cached = self.sheet_cache.peek(source)
+		if cached is None or not cached.stale:
+			return ""
+		minutes = int(cached.age_seconds // 60)
+		note = f"_Sheet data as of {minutes} min ago"
+		return note + ("; refreshing now._" if cached.refreshing else "._")
 
 	async def write_log(self, values: Sequence[str]) -> None:
 		"""Write log event (no-op placeholder)."""
 
 		_ = values
 
+	def _batch_values(
+		self, sheet_id: str, tabs: Sequence[str], cells: str = ""
+	) -> dict[str, list[list[str]]]:
+		"""Read several tabs (optionally just ``cells``, e.g. ``1:2``) in one call (blocking).
+
+		Tabs are addressed by their lowercase XLSForm titles. If one is titled
+		differently the batch fails, so the real titles are looked up and the
+		read retried once with the tabs that exist.
+		"""
+
+		def ranges(titles: Sequence[str]) -> list[str]:
+			quoted = ["'" + title.replace("'", "''") + "'" for title in titles]
+			return [f"{title}!{cells}" if cells else title for title in quoted]
+
+		try:
+			response = self.client.http_client.values_batch_get(sheet_id, ranges(tabs))
+		except gspread.exceptions.APIError:
+			titles = {
+				worksheet.title.strip().lower(): worksheet.title
+				for worksheet in self.client.open_by_key(sheet_id).worksheets()
+			}
+			tabs = [tab for tab in tabs if tab in titles]
+			if not tabs:
+				return {}
+			response = self.client.http_client.values_batch_get(
+				sheet_id, ranges([titles[tab] for tab in tabs])
+			)
+		return {
+			tab: value_range.get("values", [])
+			for tab, value_range in zip(tabs, response.get("valueRanges", []), strict=False)
+		}
+
+	@staticmethod
+	def _value_records(values: list[list[str]]) -> list[dict[str, str]]:
+		"""Turn a header row plus data rows into records, skipping blank rows."""
+
+		if not values:
+			return []
+		header = [str(cell).strip() for cell in values[0]]
+		return [
+			{
+				column: str(row[position]) if position < len(row) else ""
+				for position, column in enumerate(header)
+				if column
+			}
+			for row in values[1:]
+			if any(str(cell).strip() for cell in row)
+		]
+
 	async def read_form_sheet_tabs(self, sheet_id: str) -> dict[str, list[dict[str, str]]]:
-		"""Read all worksheets from a SurveyCTO form Google Sheet."""
+		"""Read the `survey` and `choices` tabs of a SurveyCTO form Google Sheet."""
 
 		if not self.has_credentials or not sheet_id.strip():
 			return {}
 
 		def _read() -> dict[str, list[dict[str, str]]]:
 			try:
-				sheet = self.client.open_by_key(sheet_id)
-				result: dict[str, list[dict[str, str]]] = {}
-				for worksheet in sheet.worksheets():
-					try:
-						records = worksheet.get_all_records()
-					except Exception:
-						records = []
-					result[worksheet.title] = [dict(record) for record in records]
-				return result
+				tabs = self._batch_values(sheet_id, _FORM_TABS)
+				return {tab: self._value_records(values) for tab, values in tabs.items()}
 			except Exception as e:
 				log.error("google_sheets.read_form_sheet_tabs_failed", sheet_id=sheet_id, error=str(e))
 				return {}
 
-		return await asyncio.to_thread(_read)
+		return await self.api.run(_read)
+
+	async def current_form_snapshots(self) -> dict[str, FormSnapshot]:
+		"""Return the up-to-date snapshot of every configured form that has one."""
+
+		if not self.has_credentials:
+			return {}
+
+		forms = settings.surveycto_form_sheet_ids
+		snapshots = await asyncio.gather(
+			*(
+				self.form_snapshots.current(
+					form_name,
+					fetch_version=partial(self.read_form_version, sheet_id),
+					fetch_tabs=partial(self.read_form_sheet_tabs, sheet_id),
+				)
+				for form_name, sheet_id in forms.items()
+			)
+		)
+		return {
+			form_name: snapshot
+			for form_name, snapshot in zip(forms, snapshots, strict=True)
+			if snapshot is not None
+		}
 
 	async def surveycto_issue_context(
 		self,
@@ -132,106 +266,134 @@ class GoogleSheetsClient:
 		variable_hints: list[str],
 		max_rows: int = 20,
 	) -> str:
-		"""Build compact context from configured form sheets for issue troubleshooting."""
+		"""Build compact context from configured form sheets for issue troubleshooting.
+
+		Rows come from each form's local snapshot index; the Sheets API is only
+		called to check the form version (at most once per check interval) and
+		to re-download a form whose version changed.
+		"""
 
 		if not self.has_credentials:
 			return ""
 
-		keywords = {word.lower() for word in issue_text.split() if len(word) >= 3}
-		keywords.update(hint.lower() for hint in variable_hints)
+		keywords = issue_keywords(issue_text, variable_hints)
 		if not keywords:
 			return ""
 
 		sections: list[str] = []
-		for form_name, sheet_id in settings.surveycto_form_sheet_ids.items():
-			tabs = await self.read_form_sheet_tabs(sheet_id)
-			if not tabs:
-				continue
-
-			matches: list[str] = []
-			for tab_name, rows in tabs.items():
-				for row in rows:
-					name = str(row.get("name", "")).strip()
-					type_ = str(row.get("type", "")).strip()
-					relevant = str(row.get("relevant", "")).strip()
-					constraint = str(row.get("constraint", "")).strip()
-					label = ""
-					for key, value in row.items():
-						if str(key).lower().startswith("label") and str(value).strip():
-							label = str(value).strip()
-							break
-
-					combined = f"{name} {type_} {label} {relevant} {constraint}".lower()
-					if not combined.strip():
-						continue
-
-					if any(keyword in combined for keyword in keywords):
-						matches.append(
-							f"[{tab_name}] name={name or '-'} type={type_ or '-'} "
-							f"relevant={relevant or '-'} constraint={constraint or '-'} label={label or '-'}"
-						)
-						if len(matches) >= max_rows:
-							break
-				if len(matches) >= max_rows:
-					break
-
+		for form_name, snapshot in (await self.current_form_snapshots()).items():
+			matches = [
+				f"[{row.tab}] name={row.name or '-'} type={row.type or '-'} "
+				f"relevant={row.relevant or '-'} constraint={row.constraint or '-'} "
+				f"label={row.label or '-'}"
+				for row in snapshot.search(keywords, set(variable_hints), max_rows)
+			]
 			if matches:
 				sections.append(f"Form {form_name}:\n" + "\n".join(matches))
 
 		return "\n\n".join(sections)
 
+	def _modified_time(self, file_id: str) -> str:
+		"""Return a spreadsheet's Drive ``modifiedTime`` ('' if unavailable) (blocking)."""
+
+		try:
+			response = self.client.http_client.request(
+				"get",
+				f"{DRIVE_FILES_API_V3_URL}/{file_id}",
+				params={"fields": "modifiedTime", "supportsAllDrives": True},
+			)
+			return str(response.json().get("modifiedTime", ""))
+		except Exception as error:
+			log.warning("google_sheets.modified_time_failed", file_id=file_id, error=str(error))
+			return ""
+
+	def _read_settings_row(self, sheet_id: str) -> dict[str, str]:
+		"""Return the Settings row, re-read only if Drive reports the file changed (blocking)."""
+
+		modified = self._modified_time(sheet_id)
+		cached = self._settings_rows.get(sheet_id)
+		if modified and cached is not None and cached[0] == modified:
+			return cached[1]
+		row = self._fetch_settings_row(sheet_id)
+		self._settings_rows[sheet_id] = (modified, row)
+		return row
+
+	def _fetch_settings_row(self, sheet_id: str) -> dict[str, str]:
+		"""Return the first data row of a form sheet's `Settings` tab (blocking)."""
+
+		values = self._batch_values(sheet_id, ["settings"], cells="1:2").get("settings")
+		if values is None:
+			raise ValueError("Settings")
+		if len(values) < 2:
+			return {}
+
+		headers = [self._normalize_header(item) for item in values[0]]
+		row = values[1]
+		if len(row) < len(headers):
+			row = row + [""] * (len(headers) - len(row))
+		return {
+			header: str(value or "").strip()
+			for header, value in zip(headers, row, strict=False)
+		}
+
+	async def read_form_version(self, sheet_id: str) -> str:
+		"""Read one form's version from its `Settings` tab ('' if unavailable)."""
+
+		if not self.has_credentials or not sheet_id.strip():
+			return ""
+
+		def _read() -> str:
+			try:
+				return self._read_settings_row(sheet_id).get("version", "").strip()
+			except Exception as error:
+				log.error(
+					"google_sheets.read_form_version_failed", sheet_id=sheet_id, error=str(error)
+				)
+				return ""
+
+		return await self.api.run(_read)
+
 	async def read_form_versions_from_settings(self) -> dict[str, str]:
 		"""Read form versions from each configured form sheet `Settings` tab."""
 
 		if not self.has_credentials:
 			return {}
 
-		def _read() -> dict[str, str]:
-			versions: dict[str, str] = {}
-			for form_key, sheet_id in settings.surveycto_form_sheet_ids.items():
-				try:
-					sheet = self.client.open_by_key(sheet_id)
-					worksheet = None
-					for candidate in sheet.worksheets():
-						if candidate.title.strip().lower() == "settings":
-							worksheet = candidate
-							break
-					if worksheet is None:
-						raise ValueError("Settings")
-					values = worksheet.get_all_values()
-				except Exception as error:
-					log.error(
-						"google_sheets.read_form_versions.settings_failed",
-						form=form_key,
-						sheet_id=sheet_id,
-						error=str(error),
-					)
-					continue
-
-				if len(values) < 2:
-					continue
-
-				headers = [self._normalize_header(item) for item in values[0]]
-				row = values[1]
-				if len(row) < len(headers):
-					row = row + [""] * (len(headers) - len(row))
-
-				row_dict = {
-					header: str(value or "").strip()
-					for header, value in zip(headers, row, strict=False)
-				}
+		def _read(form_key: str, sheet_id: str) -> dict[str, str] | None:
+			try:
+				return self._read_settings_row(sheet_id)
+			except Exception as error:
+				log.error(
+					"google_sheets.read_form_versions.settings_failed",
+					form=form_key,
+					sheet_id=sheet_id,
+					error=str(error),
+				)
+				return None
 
-				version = row_dict.get("version", "").strip()
-				if not version:
-					continue
+		forms = settings.surveycto_form_sheet_ids
+		rows = await asyncio.gather(
+			*(self.api.run(_read, form_key, sheet_id) for form_key, sheet_id in forms.items())
+		)
 
-				form_name = (
-					row_dict.get("form_title", "").strip()
-					or row_dict.get("form_id", "").strip()
-					or form_key
-				)
-				versions[form_name] = version
+		versions: dict[str, str] = {}
+		seen: dict[str, str] = {}
+		for form_key, row_dict in zip(forms, rows, strict=True):
+			if not row_dict:
+				continue
+			version = row_dict.get("version", "").strip()
+			if not version:
+				continue
+			seen[form_key] = version
 
-			return versions
+			form_name = (
+				row_dict.get("form_title", "").strip()
+				or row_dict.get("form_id", "").strip()
+				or form_key
+			)
+			versions[form_name] = version
 
-		return await asyncio.to_thread(_read)
+		# A version seen here saves the next issue lookup its own version check.
+		for form_key, version in seen.items():
+			self.form_snapshots.note_version(form_key, version)
+		return versions
@@ -0,0 +1,176 @@
+"""Quota-aware scheduling for blocking Google Sheets/Drive API calls."""
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+from http import HTTPStatus
+from typing import Any, TypeVar
+
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
+from requests import Response
+
+from src.utils.logger import get_logger
+
+log = get_logger("sheets_scheduler")
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+	"""Thread-safe token bucket allowing ``rate`` acquisitions per ``period`` seconds."""
+
+	def __init__(
+		self,
+		rate: float,
+		period: float = 60.0,
+		capacity: float | None = None,
+		clock: Callable[[], float] = time.monotonic,
+		sleep: Callable[[float], None] = time.sleep,
+	) -> None:
+		"""Initialize full, refilling continuously at ``rate / period`` tokens per second."""
+		self.capacity = capacity if capacity is not None else rate
+		self.refill_per_second = rate / period
+		self._clock = clock
+		self._sleep = sleep
+		self._tokens = self.capacity
+		self._updated = clock()
+		self._lock = threading.Lock()
+
+	def acquire(self) -> float:
+		"""Take one token, blocking until one is available; return seconds waited."""
+
+		waited = 0.0
+		while True:
+			with self._lock:
+				now = self._clock()
+				self._tokens = min(
+					self.capacity, self._tokens + (now - self._updated) * self.refill_per_second
+				)
+				self._updated = now
+				if self._tokens >= 1:
+					self._tokens -= 1
+					return waited
+				delay = (1 - self._tokens) / self.refill_per_second
+			self._sleep(delay)
+			waited += delay
+
+
+@dataclass
+class SheetsApiMetrics:
+	"""Counters for the Sheets worker pool and request limiter."""
+
+	queued: int = 0
+	running: int = 0
+	completed: int = 0
+	failed: int = 0
+	requests: int = 0
+	rate_limited: int = 0
+	retries: int = 0
+	throttled_seconds: float = 0.0
+
+
+def _is_rate_limited(error: APIError) -> bool:
+	if error.code == HTTPStatus.TOO_MANY_REQUESTS:
+		return True
+	# Drive reports quota exhaustion as 403 with a usageLimits domain.
+	details = error.error.get("errors") or [{}]
+	return error.code == HTTPStatus.FORBIDDEN and details[0].get("domain") == "usageLimits"
+
+
+class SheetsApiScheduler:
+	"""Runs blocking gspread calls on a dedicated bounded pool under a shared quota.
+
+	Every HTTP request made through ``http_client_class()`` takes a token from
+	a bucket sized to the per-minute quota. A 429 (or Drive usageLimits 403)
+	is retried with exponential backoff and jitter instead of failing the read.
+	"""
+
+	def __init__(
+		self,
+		workers: int,
+		requests_per_minute: float,
+		max_retries: int = 5,
+		backoff_seconds: float = 1.0,
+		max_backoff_seconds: float = 32.0,
+		sleep: Callable[[float], None] = time.sleep,
+	) -> None:
+		"""Initialize the pool, limiter and retry policy."""
+		self.max_retries = max_retries
+		self.backoff_seconds = backoff_seconds
+		self.max_backoff_seconds = max_backoff_seconds
+		self.bucket = TokenBucket(requests_per_minute, sleep=sleep)
+		self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sheets-api")
+		self._metrics = SheetsApiMetrics()
+		self._lock = threading.Lock()
+		self._sleep = sleep
+
+	def metrics(self) -> dict[str, Any]:
+		"""Return a snapshot of queue and request counters."""
+
+		with self._lock:
+			return asdict(self._metrics)
+
+	def _count(self, **deltas: float) -> None:
+		with self._lock:
+			for name, delta in deltas.items():
+				setattr(self._metrics, name, getattr(self._metrics, name) + delta)
+
+	async def run(self, func: Callable[..., T], *args: object) -> T:
+		"""Run ``func(*args)`` on the Sheets pool."""
+
+		self._count(queued=1)
+
+		def _job() -> T:
+			self._count(queued=-1, running=1)
+			try:
+				result = func(*args)
+			except Exception:
+				self._count(running=-1, failed=1)
+				raise
+			self._count(running=-1, completed=1)
+			return result
+
+		loop = asyncio.get_running_loop()
+		return await loop.run_in_executor(self._executor, _job)
+
+	def send(self, request: Callable[[], Response]) -> Response:
+		"""Send one HTTP request under the quota, retrying rate-limit errors (blocking)."""
+
+		attempt = 0
+		while True:
+			waited = self.bucket.acquire()
+			self._count(requests=1, throttled_seconds=waited)
+			try:
+				return request()
+			except APIError as error:
+				if not _is_rate_limited(error):
+					raise
+				self._count(rate_limited=1)
+				if attempt >= self.max_retries:
+					log.error("sheets_scheduler.rate_limited_giving_up", attempts=attempt + 1)
+					raise
+				delay = min(self.backoff_seconds * 2**attempt, self.max_backoff_seconds)
+				delay += random.uniform(0, self.backoff_seconds)
+				log.warning(
+					"sheets_scheduler.rate_limited", attempt=attempt + 1, retry_in=round(delay, 2)
+				)
+				self._count(retries=1)
+				self._sleep(delay)
+				attempt += 1
+
+	def http_client_class(self) -> type[HTTPClient]:
+		"""Return a gspread HTTP client class whose requests go through ``send``."""
+
+		scheduler = self
+
+		class QuotaHTTPClient(HTTPClient):
+			def request(self, *args: Any, **kwargs: Any) -> Response:
+				return scheduler.send(partial(HTTPClient.request, self, *args, **kwargs))
+
+		return QuotaHTTPClient
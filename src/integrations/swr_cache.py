@@ -0,0 +1,118 @@
+"""Stale-while-revalidate cache for slow, quota-limited data sources."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from src.utils.logger import get_logger
+
+log = get_logger("swr_cache")
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Cached(Generic[T]):
+	"""A cached value with its age, for replies that should mention staleness."""
+
+	value: T
+	fetched_at: float
+	age_seconds: float
+	stale: bool
+	refreshing: bool
+
+
+class SWRCache:
+	"""Per-source cache that answers from the last good copy and refreshes behind it.
+
+	A copy younger than its source's TTL is served as is. An older copy is
+	still served at once, while one background refresh (single-flight per
+	source) replaces it; a failed refresh keeps the old copy. Only a source
+	with no copy yet, or a caller asking for ``fresh`` data, waits for a fetch,
+	and for a ``fresh`` caller a failed fetch raises rather than serving the old copy.
+	"""
+
+	def __init__(self, ttls: dict[str, float], default_ttl: float = 300.0) -> None:
+		"""Initialize with per-source TTLs in seconds."""
+		self.ttls = ttls
+		self.default_ttl = default_ttl
+		self._values: dict[str, tuple[Any, float]] = {}
+		self._refreshes: dict[str, asyncio.Task[Any]] = {}
+
+	def _entry(self, source: str, value: T, fetched_at: float) -> Cached[T]:
+		age = max(time.time() - fetched_at, 0.0)
+		return Cached(
+			value=value,
+			fetched_at=fetched_at,
+			age_seconds=age,
+			stale=age >= self.ttls.get(source, self.default_ttl),
+			refreshing=source in self._refreshes,
+		)
+
+	def peek(self, source: str) -> Cached[Any] | None:
+		"""Return the current copy of ``source`` without fetching."""
+
+		if source not in self._values:
+			return None
+		value, fetched_at = self._values[source]
+		return self._entry(source, value, fetched_at)
+
+	def invalidate(self, source: str) -> None:
+		"""Drop the copy of ``source`` so the next read fetches."""
+
+		self._values.pop(source, None)
+
+	def _refresh(self, source: str, fetch: Callable[[], Awaitable[T]]) -> asyncio.Task[T]:
+		task = self._refreshes.get(source)
+		if task is None:
+			task = asyncio.create_task(self._run_refresh(source, fetch))
+			task.add_done_callback(lambda done: self._log_failure(source, done))
+			self._refreshes[source] = task
+		return task
+
+	async def _run_refresh(self, source: str, fetch: Callable[[], Awaitable[T]]) -> T:
+		started = time.monotonic()
+		try:
+			value = await fetch()
+			self._values[source] = (value, time.time())
+			log.info(
+				"swr_cache.refreshed",
+				source=source,
+				duration_ms=int((time.monotonic() - started) * 1000),
+			)
+			return value
+		finally:
+			self._refreshes.pop(source, None)
+
+	async def get(
+		self, source: str, fetch: Callable[[], Awaitable[T]], fresh: bool = False
+	) -> Cached[T]:
+		"""Return ``source`` from cache, fetching only when there is no usable copy.
+
+		Raises whatever ``fetch`` raises when ``fresh`` or when there is no copy
+		to fall back on.
+		"""
+
+		current = self.peek(source)
+		if current is not None and not fresh:
+			if current.stale:
+				self._refresh(source, fetch)
+				return self._entry(source, current.value, current.fetched_at)
+			return current
+
+		try:
+			await asyncio.shield(self._refresh(source, fetch))
+		except Exception:
+			# The failure is logged by the refresh task; fall back to the old copy
+			# unless the caller asked for data fetched now.
+			if current is None or fresh:
+				raise
+		value, fetched_at = self._values[source]
+		return self._entry(source, value, fetched_at)
+
+	@staticmethod
+	def _log_failure(source: str, task: asyncio.Task[Any]) -> None:
+		if not task.cancelled() and task.exception() is not None:
+			log.warning("swr_cache.refresh_failed", source=source, error=str(task.exception()))
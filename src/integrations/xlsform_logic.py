@@ -0,0 +1,372 @@
+"""XLSForm expression parsing and per-form variable dependency graphs."""
+
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from src.integrations.xlsform_snapshot import FormRow
+
+# Survey columns whose expressions make one variable depend on another.
+LOGIC_COLUMNS = ("relevant", "constraint", "calculation", "repeat_count", "choice_filter")
+# Pseudo-column for "inside this group": a group's relevance gates all its rows.
+GROUP_COLUMN = "group"
+
+_TOKEN = re.compile(
+	r"""\s*(?:
+	(?P<ref>\$\{\s*(?P<ref_name>[A-Za-z_][\w.-]*)\s*\})
+	|(?P<string>'[^']*'|"[^"]*")
+	|(?P<number>\d+(?:\.\d*)?|\.\d+)
+	|(?P<op>!=|<=|>=|\.\.|[=<>+\-*|(),.\[\]/])
+	|(?P<name>[A-Za-z_][\w.:-]*)
+	)""",
+	re.VERBOSE,
+)
+_REF = re.compile(r"\$\{\s*([A-Za-z_][\w.-]*)\s*\}")
+_BINARY_LEVELS: tuple[frozenset[str], ...] = (
+	frozenset({"or"}),
+	frozenset({"and"}),
+	frozenset({"=", "!="}),
+	frozenset({"<", "<=", ">", ">="}),
+	frozenset({"+", "-"}),
+	frozenset({"*", "div", "mod"}),
+)
+_KEYWORD_OPERATORS = frozenset({"or", "and", "div", "mod"})
+
+
+class ExpressionError(ValueError):
+	"""Raised when an XLSForm expression cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class Literal:
+	"""A string or number literal."""
+
+	value: str
+
+
+@dataclass(frozen=True)
+class Ref:
+	"""A ``${name}`` reference to another form field."""
+
+	name: str
+
+
+@dataclass(frozen=True)
+class Current:
+	"""``.`` (the current field) or ``..`` (its parent)."""
+
+	parent: bool = False
+
+
+@dataclass(frozen=True)
+class Call:
+	"""A function call such as ``selected(${q1}, 'yes')``."""
+
+	function: str
+	args: tuple["Node", ...]
+
+
+@dataclass(frozen=True)
+class Negate:
+	"""Unary minus."""
+
+	operand: "Node"
+
+
+@dataclass(frozen=True)
+class BinaryOp:
+	"""A binary operator, including ``and``/``or``/``div``/``mod``."""
+
+	operator: str
+	left: "Node"
+	right: "Node"
+
+
+Node = Literal | Ref | Current | Call | Negate | BinaryOp
+
+
+def _tokenize(text: str) -> list[tuple[str, str]]:
+	tokens: list[tuple[str, str]] = []
+	position = 0
+	while position < len(text):
+		if text[position:].strip() == "":
+			break
+		match = _TOKEN.match(text, position)
+		if match is None or match.end() == position or match.lastgroup is None:
+			raise ExpressionError(f"unexpected {text[position:].strip()[:10]!r} in {text!r}")
+		kind = match.lastgroup if match.lastgroup != "ref_name" else "ref"
+		if kind == "ref":
+			tokens.append(("ref", match.group("ref_name")))
+		elif kind == "name" and match.group("name") in _KEYWORD_OPERATORS:
+			tokens.append(("op", match.group("name")))
+		else:
+			tokens.append((kind, match.group(kind)))
+		position = match.end()
+	return tokens
+
+
+class _Parser:
+	"""Recursive descent over the XPath subset XLSForms use."""
+
+	def __init__(self, text: str) -> None:
+		self.text = text
+		self.tokens = _tokenize(text)
+		self.position = 0
+
+	def _peek(self) -> tuple[str, str] | None:
+		return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+	def _take(self, value: str | None = None) -> tuple[str, str]:
+		token = self._peek()
+		if token is None or (value is not None and token != ("op", value)):
+			raise ExpressionError(f"expected {value or 'a value'} in {self.text!r}")
+		self.position += 1
+		return token
+
+	def parse(self) -> Node:
+		node = self._binary(0)
+		token = self._peek()
+		if token is not None:
+			raise ExpressionError(f"unexpected {token[1]!r} in {self.text!r}")
+		return node
+
+	def _binary(self, level: int) -> Node:
+		if level == len(_BINARY_LEVELS):
+			return self._unary()
+		node = self._binary(level + 1)
+		operators = _BINARY_LEVELS[level]
+		while (token := self._peek()) is not None and token[0] == "op" and token[1] in operators:
+			self.position += 1
+			node = BinaryOp(token[1], node, self._binary(level + 1))
+		return node
+
+	def _unary(self) -> Node:
+		if self._peek() == ("op", "-"):
+			self.position += 1
+			return Negate(self._unary())
+		node = self._primary()
+		while self._peek() == ("op", "|"):
+			self.position += 1
+			node = BinaryOp("|", node, self._primary())
+		return node
+
+	def _primary(self) -> Node:
+		kind, value = self._take()
+		if kind == "ref":
+			node: Node = Ref(value)
+		elif kind == "string":
+			node = Literal(value[1:-1])
+		elif kind == "number":
+			node = Literal(value)
+		elif kind == "op" and value in {".", ".."}:
+			node = Current(parent=value == "..")
+		elif kind == "op" and value == "(":
+			node = self._binary(0)
+			self._take(")")
+		elif kind == "name" and self._peek() == ("op", "("):
+			self.position += 1
+			args: list[Node] = []
+			if self._peek() != ("op", ")"):
+				args.append(self._binary(0))
+				while self._peek() == ("op", ","):
+					self.position += 1
+					args.append(self._binary(0))
+			self._take(")")
+			node = Call(value, tuple(args))
+		else:
+			raise ExpressionError(f"unexpected {value!r} in {self.text!r}")
+		# Predicates (``${rep}[1]``) keep their references but not their structure.
+		while self._peek() == ("op", "["):
+			self.position += 1
+			node = Call("predicate", (node, self._binary(0)))
+			self._take("]")
+		return node
+
+
+def parse_expression(text: str) -> Node:
+	"""Parse an XLSForm relevance/constraint/calculation expression into an AST."""
+
+	if not text.strip():
+		raise ExpressionError("empty expression")
+	return _Parser(text).parse()
+
+
+def _walk(node: Node) -> Iterator[Node]:
+	yield node
+	if isinstance(node, Call):
+		for arg in node.args:
+			yield from _walk(arg)
+	elif isinstance(node, Negate):
+		yield from _walk(node.operand)
+	elif isinstance(node, BinaryOp):
+		yield from _walk(node.left)
+		yield from _walk(node.right)
+
+
+def expression_references(text: str) -> list[str]:
+	"""Return ``${...}`` names an expression reads, in order of appearance.
+
+	Expressions the parser rejects still yield their references, read by pattern.
+	"""
+
+	if not text.strip():
+		return []
+	try:
+		names = [node.name for node in _walk(parse_expression(text)) if isinstance(node, Ref)]
+	except ExpressionError:
+		names = _REF.findall(text)
+	return list(dict.fromkeys(names))
+
+
+@dataclass(frozen=True)
+class Dependency:
+	"""``target`` reads ``source`` through one of its ``column`` expressions."""
+
+	source: str
+	target: str
+	column: str
+
+
+@dataclass
+class FormField:
+	"""One named survey row with its logic and enclosing groups."""
+
+	name: str
+	type: str
+	label: str
+	expressions: dict[str, str] = field(default_factory=dict)
+	groups: tuple[str, ...] = ()
+	repeat: str = ""
+
+
+class DependencyGraph:
+	"""Upstream and downstream variable edges for one form version.
+
+	Fields inside a group depend on the group (column ``group``), so a walk
+	upstream reaches the group's own relevance too.
+	"""
+
+	def __init__(self, fields: Iterable[FormField]) -> None:
+		"""Index ``fields`` and the dependency edges between them."""
+		self.fields: dict[str, FormField] = {}
+		self._upstream: dict[str, list[Dependency]] = {}
+		self._downstream: dict[str, list[Dependency]] = {}
+		for form_field in fields:
+			self.fields.setdefault(form_field.name, form_field)
+		for form_field in self.fields.values():
+			if form_field.groups:
+				self._add(Dependency(form_field.groups[-1], form_field.name, GROUP_COLUMN))
+			for column, expression in form_field.expressions.items():
+				for name in expression_references(expression):
+					if name != form_field.name:
+						self._add(Dependency(name, form_field.name, column))
+
+	def _add(self, dependency: Dependency) -> None:
+		self._upstream.setdefault(dependency.target, []).append(dependency)
+		self._downstream.setdefault(dependency.source, []).append(dependency)
+
+	@classmethod
+	def from_rows(cls, rows: Iterable["FormRow"]) -> "DependencyGraph":
+		"""Build from snapshot rows of the ``survey`` tab, tracking group nesting."""
+
+		fields: list[FormField] = []
+		stack: list[tuple[str, bool]] = []
+		for row in rows:
+			if row.tab.strip().lower() != "survey":
+				continue
+			kind = row.type.strip().lower().replace("_", " ")
+			if kind.startswith("end "):
+				if stack:
+					stack.pop()
+				continue
+			if not row.name:
+				continue
+			repeats = [name for name, is_repeat in stack if is_repeat]
+			fields.append(
+				FormField(
+					name=row.name,
+					type=row.type,
+					label=row.label,
+					expressions={
+						column: getattr(row, column)
+						for column in LOGIC_COLUMNS
+						if getattr(row, column)
+					},
+					groups=tuple(name for name, _ in stack),
+					repeat=repeats[-1] if repeats else "",
+				)
+			)
+			if kind.startswith("begin "):
+				stack.append((row.name, kind == "begin repeat"))
+		return cls(fields)
+
+	def __contains__(self, name: str) -> bool:
+		"""Return True if the form defines a field called ``name``."""
+		return name in self.fields
+
+	def controls(self, name: str) -> list[Dependency]:
+		"""Return the direct dependencies of ``name`` (what controls it)."""
+		return list(self._upstream.get(name, []))
+
+	def dependents(self, name: str) -> list[Dependency]:
+		"""Return the fields reading ``name`` directly."""
+		return list(self._downstream.get(name, []))
+
+	def _reach(
+		self, name: str, edges: dict[str, list[Dependency]], upstream: bool
+	) -> list[Dependency]:
+		seen = {name}
+		found: list[Dependency] = []
+		queue = deque([name])
+		while queue:
+			for dependency in edges.get(queue.popleft(), []):
+				found.append(dependency)
+				following = dependency.source if upstream else dependency.target
+				if following not in seen:
+					seen.add(following)
+					queue.append(following)
+		return found
+
+	def upstream(self, name: str) -> list[Dependency]:
+		"""Return every edge upstream of ``name``, nearest first."""
+		return self._reach(name, self._upstream, upstream=True)
+
+	def downstream(self, name: str) -> list[Dependency]:
+		"""Return every edge downstream of ``name``, nearest first."""
+		return self._reach(name, self._downstream, upstream=False)
+
+
+def _describe(graph: DependencyGraph, dependency: Dependency) -> str:
+	target = graph.fields.get(dependency.target)
+	if dependency.column == GROUP_COLUMN:
+		return f"`{dependency.target}` sits inside group `{dependency.source}`"
+	expression = target.expressions.get(dependency.column, "") if target else ""
+	return f"`{dependency.target}` {dependency.column} `{expression}` reads `{dependency.source}`"
+
+
+def render_upstream_chain(
+	graph: DependencyGraph, name: str, form_key: str, max_edges: int = 25
+) -> str:
+	"""Render the logic chain controlling ``name`` for a prompt or a reply."""
+
+	form_field = graph.fields.get(name)
+	if form_field is None:
+		return ""
+	where = f"; repeat `{form_field.repeat}`" if form_field.repeat else ""
+	lines = [f"**{name}** in {form_key} ({form_field.type or 'unknown type'}{where})"]
+	chain = graph.upstream(name)
+	if chain:
+		lines.append("Controlled by:")
+		lines.extend(f"- {_describe(graph, dependency)}" for dependency in chain[:max_edges])
+		if len(chain) > max_edges:
+			lines.append(f"- ... {len(chain) - max_edges} more upstream rules")
+	else:
+		lines.append("No relevance, constraint, calculation or group rule controls it.")
+	dependents = graph.dependents(name)
+	if dependents:
+		feeds = ", ".join(f"{edge.target} ({edge.column})" for edge in dependents[:10])
+		lines.append(f"Feeds: {feeds}")
+	return "\n".join(lines)
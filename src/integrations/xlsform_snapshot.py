@@ -0,0 +1,255 @@
+"""Persisted XLSForm snapshots with an inverted token index, refreshed on version change."""
+
+import asyncio
+import json
+import math
+import re
+import time
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
+from pathlib import Path
+
+from src.config import settings
+from src.integrations.xlsform_logic import DependencyGraph
+from src.utils.logger import get_logger
+
+log = get_logger("xlsform_snapshot")
+
+_SNAPSHOT_FORMAT = 3
+_TOKEN = re.compile(r"[a-z0-9_]+")
+_STOP_WORDS = frozenset(
+	(
+		"and are but can for from has have not now the then this that was were when with why you"
+	).split()
+)
+
+
+def _tokens(text: str) -> set[str]:
+	"""Lowercase word tokens, plus the parts of snake_case names (hh_q12 -> hh, q12)."""
+
+	found: set[str] = set()
+	for token in _TOKEN.findall(text.lower()):
+		found.add(token)
+		if "_" in token:
+			found.update(part for part in token.split("_") if part)
+	return found
+
+
+@dataclass
+class FormRow:
+	"""One XLSForm row, reduced to the columns issue triage reads."""
+
+	tab: str
+	name: str
+	type: str
+	label: str
+	relevant: str
+	constraint: str
+	calculation: str = ""
+	repeat_count: str = ""
+	choice_filter: str = ""
+	hint: str = ""
+
+	@classmethod
+	def from_record(cls, tab: str, record: Mapping[str, object]) -> "FormRow":
+		"""Build from a gspread record, taking the first non-empty label/hint columns."""
+
+		def first(prefix: str) -> str:
+			for key, value in record.items():
+				if str(key).lower().startswith(prefix) and str(value).strip():
+					return str(value).strip()
+			return ""
+
+		return cls(
+			tab=tab,
+			name=str(record.get("name", "")).strip(),
+			type=str(record.get("type", "")).strip(),
+			label=first("label"),
+			relevant=str(record.get("relevant", record.get("relevance", ""))).strip(),
+			constraint=str(record.get("constraint", "")).strip(),
+			calculation=str(record.get("calculation", "")).strip(),
+			repeat_count=str(record.get("repeat_count", "")).strip(),
+			choice_filter=str(record.get("choice_filter", "")).strip(),
+			hint=first("hint"),
+		)
+
+
+@dataclass
+class FormSnapshot:
+	"""All rows of one form at one version, with token -> row postings."""
+
+	form_key: str
+	version: str
+	rows: list[FormRow]
+	index: dict[str, list[int]] = field(default_factory=dict)
+	fetched_at: float = 0.0
+
+	@classmethod
+	def build(
+		cls,
+		form_key: str,
+		version: str,
+		tabs: Mapping[str, Sequence[Mapping[str, object]]],
+	) -> "FormSnapshot":
+		"""Index name, label and logic expressions of every non-empty row."""
+
+		rows = [
+			row
+			for tab, records in tabs.items()
+			for row in (FormRow.from_record(tab, record) for record in records)
+			if row.name or row.type or row.label
+		]
+		index: dict[str, list[int]] = {}
+		for position, row in enumerate(rows):
+			text = f"{row.name} {row.label} {row.relevant} {row.constraint} {row.calculation}"
+			for token in _tokens(text):
+				index.setdefault(token, []).append(position)
+		return cls(form_key, version, rows, index, fetched_at=time.time())
+
+	@cached_property
+	def graph(self) -> DependencyGraph:
+		"""Variable dependency graph of this version, built on first use."""
+		return DependencyGraph.from_rows(self.rows)
+
+	def search(self, keywords: set[str], names: set[str], max_rows: int) -> list[FormRow]:
+		"""Rank rows by rare-token overlap with ``keywords``; exact ``names`` rank first."""
+
+		scores: dict[int, float] = {}
+		for keyword in keywords:
+			postings = self.index.get(keyword, [])
+			if not postings:
+				continue
+			weight = math.log(1 + len(self.rows) / len(postings))
+			for position in postings:
+				scores[position] = scores.get(position, 0.0) + weight
+		for name in {name.lower() for name in names}:
+			for position in self.index.get(name, []):
+				if self.rows[position].name.lower() == name:
+					scores[position] = scores.get(position, 0.0) + 100.0
+		ranked = sorted(scores, key=lambda position: (-scores[position], position))
+		return [self.rows[position] for position in ranked[:max_rows]]
+
+
+def issue_keywords(issue_text: str, variable_hints: list[str]) -> set[str]:
+	"""Tokens worth looking up for an issue report."""
+
+	keywords = {
+		token for token in _tokens(issue_text) if len(token) >= 3 and token not in _STOP_WORDS
+	}
+	for hint in variable_hints:
+		keywords.update(_tokens(hint))
+	return keywords
+
+
+class XLSFormSnapshotStore:
+	"""One snapshot per form on disk; the Sheets API is hit only when a version changes.
+
+	A form's version is re-checked at most once per check interval. Tabs are
+	re-downloaded only when the version differs from the snapshot's.
+	"""
+
+	def __init__(
+		self,
+		cache_dir: Path | None = None,
+		check_interval_seconds: float | None = None,
+	) -> None:
+		"""Initialize with the snapshot directory and version check interval."""
+		self.cache_dir = cache_dir or Path(settings.xlsform_snapshot_dir)
+		self.check_interval_seconds = (
+			check_interval_seconds
+			if check_interval_seconds is not None
+			else settings.xlsform_version_check_minutes * 60
+		)
+		self._snapshots: dict[str, FormSnapshot] = {}
+		self._checked_at: dict[str, float] = {}
+		self._locks: dict[str, asyncio.Lock] = {}
+
+	def _path(self, form_key: str) -> Path:
+		return self.cache_dir / f"{form_key}.json"
+
+	def get(self, form_key: str) -> FormSnapshot | None:
+		"""Return the snapshot in memory, loading it from disk on first use."""
+
+		if form_key not in self._snapshots:
+			path = self._path(form_key)
+			try:
+				data = json.loads(path.read_text(encoding="utf-8"))
+				if data.get("format") != _SNAPSHOT_FORMAT:
+					return None
+				self._snapshots[form_key] = FormSnapshot(
+					form_key=form_key,
+					version=str(data["version"]),
+					rows=[FormRow(**row) for row in data["rows"]],
+					index={token: list(rows) for token, rows in data["index"].items()},
+					fetched_at=float(data.get("fetched_at", 0.0)),
+				)
+			except (OSError, ValueError, KeyError, TypeError):
+				return None
+		return self._snapshots[form_key]
+
+	def _save(self, snapshot: FormSnapshot) -> None:
+		path = self._path(snapshot.form_key)
+		path.parent.mkdir(parents=True, exist_ok=True)
+		payload = {
+			"format": _SNAPSHOT_FORMAT,
+			"version": snapshot.version,
+			"fetched_at": snapshot.fetched_at,
+			"rows": [asdict(row) for row in snapshot.rows],
+			"index": snapshot.index,
+		}
+		temp_path = path.with_name(f"{path.name}.tmp")
+		temp_path.write_text(json.dumps(payload), encoding="utf-8")
+		temp_path.replace(path)
+
+	def note_version(self, form_key: str, version: str) -> None:
+		"""Record a version seen elsewhere (e.g. the form version monitor)."""
+
+		snapshot = self.get(form_key)
+		if snapshot is not None and snapshot.version == version:
+			self._checked_at[form_key] = time.monotonic()
+		else:
+			self._checked_at.pop(form_key, None)
+
+	async def current(
+		self,
+		form_key: str,
+		fetch_version: Callable[[], Awaitable[str]],
+		fetch_tabs: Callable[[], Awaitable[Mapping[str, Sequence[Mapping[str, object]]]]],
+	) -> FormSnapshot | None:
+		"""Return an up-to-date snapshot, downloading tabs only on a version change.
+
+		If the version or tabs cannot be read, the last snapshot is served.
+		"""
+
+		lock = self._locks.setdefault(form_key, asyncio.Lock())
+		async with lock:
+			snapshot = self.get(form_key)
+			checked_at = self._checked_at.get(form_key)
+			if (
+				snapshot is not None
+				and checked_at is not None
+				and time.monotonic() - checked_at < self.check_interval_seconds
+			):
+				return snapshot
+
+			version = await fetch_version()
+			if snapshot is not None and (not version or version == snapshot.version):
+				self._checked_at[form_key] = time.monotonic()
+				return snapshot
+
+			tabs = await fetch_tabs()
+			if not tabs:
+				return snapshot
+			fresh = FormSnapshot.build(form_key, version, tabs)
+			await asyncio.to_thread(self._save, fresh)
+			self._snapshots[form_key] = fresh
+			self._checked_at[form_key] = time.monotonic()
+			log.info(
+				"xlsform_snapshot.refreshed",
+				form=form_key,
+				version=version,
+				previous=snapshot.version if snapshot else None,
+				rows=len(fresh.rows),
+			)
+			return fresh
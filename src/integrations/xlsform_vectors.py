@@ -0,0 +1,224 @@
+"""Embedding index over XLSForm survey questions, built once per form version."""
+
+import asyncio
+import pickle
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from src.config import settings
+from src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+	from src.integrations.openai_client import OpenAIClient
+	from src.integrations.xlsform_snapshot import FormRow, FormSnapshot
+
+log = get_logger("xlsform_vectors")
+
+_VECTOR_FORMAT = 1
+
+
+def question_text(row: "FormRow") -> str:
+	"""Text embedded for one question: name, label and hint."""
+
+	text = f"{row.name}: {row.label}"
+	return f"{text} ({row.hint})" if row.hint else text
+
+
+def _is_question(row: "FormRow") -> bool:
+	kind = row.type.strip().lower().replace("_", " ")
+	return (
+		row.tab.strip().lower() == "survey"
+		and bool(row.name and row.label)
+		and not kind.startswith(("begin ", "end "))
+	)
+
+
+@dataclass(frozen=True)
+class VariableCandidate:
+	"""A form variable whose question text is close to an issue description."""
+
+	form_key: str
+	name: str
+	label: str
+	score: float
+
+
+class FormVectorIndex:
+	"""Row-normalized question embeddings of one form version."""
+
+	def __init__(
+		self, form_key: str, version: str, names: list[str], labels: list[str], matrix: np.ndarray
+	) -> None:
+		"""Initialize from parallel question names/labels and their embedding rows."""
+		self.form_key = form_key
+		self.version = version
+		self.names = names
+		self.labels = labels
+		norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+		self.matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+	def fits(self, dimensions: int | None) -> bool:
+		"""Return True if every question has a real embedding of ``dimensions`` floats."""
+
+		if not self.names:
+			return True
+		width = int(self.matrix.shape[1])
+		return width > 0 and (dimensions is None or width == dimensions)
+
+	def search(self, query: np.ndarray, top_k: int) -> list[VariableCandidate]:
+		"""Return the ``top_k`` questions closest to a normalized query vector."""
+
+		if not self.names or query.shape[0] != self.matrix.shape[1]:
+			return []
+		scores = self.matrix @ query
+		order = np.argsort(-scores, kind="stable")[:top_k]
+		return [
+			VariableCandidate(self.form_key, self.names[row], self.labels[row], float(scores[row]))
+			for row in order
+		]
+
+
+class XLSFormVectorStore:
+	"""Question embedding indexes per form, persisted next to the form snapshots.
+
+	An index is embedded once per (form version, embedding model). Search
+	results are cached per form version, so a repeated symptom costs neither a
+	query embedding nor a scan.
+	"""
+
+	def __init__(
+		self,
+		openai_client: "OpenAIClient",
+		cache_dir: Path | None = None,
+		max_cached_queries: int = 256,
+	) -> None:
+		"""Initialize with the embedding client and index directory."""
+		self.openai_client = openai_client
+		self.cache_dir = cache_dir or Path(settings.xlsform_snapshot_dir)
+		self.max_cached_queries = max_cached_queries
+		self._indexes: dict[str, FormVectorIndex] = {}
+		self._locks: dict[str, asyncio.Lock] = {}
+		self._results: OrderedDict[tuple[str, str, str], list[VariableCandidate]] = OrderedDict()
+
+	def _path(self, form_key: str) -> Path:
+		return self.cache_dir / f"{form_key}.vectors.pkl"
+
+	def _load(self, form_key: str, version: str) -> FormVectorIndex | None:
+		try:
+			with self._path(form_key).open("rb") as handle:
+				data: dict[str, Any] = pickle.load(handle)
+		except Exception:
+			return None
+		if (
+			data.get("format") != _VECTOR_FORMAT
+			or data.get("version") != version
+			or data.get("embedding_model") != settings.openai_embedding_model
+		):
+			return None
+		return FormVectorIndex(form_key, version, data["names"], data["labels"], data["matrix"])
+
+	def _save(self, index: FormVectorIndex) -> None:
+		path = self._path(index.form_key)
+		path.parent.mkdir(parents=True, exist_ok=True)
+		payload = {
+			"format": _VECTOR_FORMAT,
+			"version": index.version,
+			"embedding_model": settings.openai_embedding_model,
+			"names": index.names,
+			"labels": index.labels,
+			"matrix": index.matrix,
+		}
+		temp_path = path.with_name(f"{path.name}.tmp")
+		with temp_path.open("wb") as handle:
+			pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+		temp_path.replace(path)
+
+	async def index_for(
+		self, snapshot: "FormSnapshot", dimensions: int | None = None
+	) -> FormVectorIndex:
+		"""Return the snapshot version's index, embedding its questions on first use.
+
+		``dimensions`` is the length of a real query embedding. If any batch fell
+		back to placeholder vectors, the lengths disagree; the index is then
+		returned empty and neither cached nor saved, so the next call rebuilds it.
+		"""
+
+		lock = self._locks.setdefault(snapshot.form_key, asyncio.Lock())
+		async with lock:
+			index = self._indexes.get(snapshot.form_key)
+			if index is not None and index.version == snapshot.version and index.fits(dimensions):
+				return index
+
+			index = await asyncio.to_thread(self._load, snapshot.form_key, snapshot.version)
+			if index is not None and index.fits(dimensions):
+				self._indexes[snapshot.form_key] = index
+				return index
+
+			rows = [row for row in snapshot.rows if _is_question(row)]
+			names, labels = [row.name for row in rows], [row.label for row in rows]
+			embeddings = await self.openai_client.embed_batch_async(
+				[question_text(row) for row in rows]
+			)
+			if rows and dimensions is None:
+				probe = await self.openai_client.embed_text_async(question_text(rows[0]))
+				dimensions = len(probe)
+			if rows and {len(embedding) for embedding in embeddings} != {dimensions}:
+				log.warning(
+					"xlsform_vectors.inconsistent_embeddings",
+					form=snapshot.form_key,
+					version=snapshot.version,
+					expected=dimensions,
+					lengths=sorted({len(embedding) for embedding in embeddings}),
+				)
+				empty = np.zeros((len(rows), 0), dtype=np.float32)
+				return FormVectorIndex(snapshot.form_key, snapshot.version, names, labels, empty)
+
+			matrix = np.asarray(embeddings, dtype=np.float32).reshape(len(rows), -1)
+			index = FormVectorIndex(snapshot.form_key, snapshot.version, names, labels, matrix)
+			await asyncio.to_thread(self._save, index)
+			log.info(
+				"xlsform_vectors.built",
+				form=snapshot.form_key,
+				version=snapshot.version,
+				questions=len(rows),
+			)
+			self._indexes[snapshot.form_key] = index
+			return index
+
+	async def candidates(
+		self,
+		snapshots: dict[str, "FormSnapshot"],
+		text: str,
+		top_k: int = 5,
+	) -> list[VariableCandidate]:
+		"""Return the questions across ``snapshots`` best matching a symptom description."""
+
+		query_key = " ".join(text.lower().split())
+		found: list[VariableCandidate] = []
+		query: np.ndarray | None = None
+		for form_key, snapshot in snapshots.items():
+			key = (form_key, snapshot.version, query_key)
+			cached = self._results.get(key)
+			if cached is None:
+				if query is None:
+					vector = np.asarray(
+						await self.openai_client.embed_text_async(text), dtype=np.float32
+					)
+					norm = float(np.linalg.norm(vector))
+					query = vector / norm if norm else vector
+				index = await self.index_for(snapshot, int(query.shape[0]))
+				cached = index.search(query, top_k)
+				# An index that failed to embed is rebuilt next time; so is its result.
+				if self._indexes.get(form_key) is index:
+					self._results[key] = cached
+					if len(self._results) > self.max_cached_queries:
+						self._results.popitem(last=False)
+			else:
+				self._results.move_to_end(key)
+			found.extend(cached)
+		found.sort(key=lambda candidate: -candidate.score)
+		return found[:top_k]
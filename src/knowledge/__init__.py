@@ -1,13 +1,18 @@
 """Knowledge package exports."""
 
 from src.knowledge.confidence import from_score, score_from_matches
+from src.knowledge.index_manager import KnowledgeIndexManager
 from src.knowledge.indexer import KnowledgeChunk, KnowledgeIndexer
 from src.knowledge.retriever import KnowledgeRetriever
+from src.knowledge.variables import QuestionnaireVariable, VariableDictionary
 
 __all__ = [
 	"KnowledgeChunk",
+	"KnowledgeIndexManager",
 	"KnowledgeIndexer",
 	"KnowledgeRetriever",
+	"QuestionnaireVariable",
+	"VariableDictionary",
 	"from_score",
 	"score_from_matches",
 ]
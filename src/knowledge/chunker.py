@@ -0,0 +1,216 @@
+"""Structure-aware markdown chunking measured in (approximate) tokens."""
+
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+from src.config import settings
+
+# Bump when chunk boundaries change so cached embeddings are not reused.
+CHUNKER_VERSION = 2
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_VARIABLE = re.compile(r"^Variable:\s*`?([^`]+?)`?\s*$")
+_LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_RULE = re.compile(r"^\s*(?:-{3,}|\*{3,}|_{3,})\s*$")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9*_`\"'(\[])")
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+	"""Approximate BPE token count: words and punctuation marks.
+
+	Close enough to embedding-model tokens for sizing chunks without a
+	tokenizer dependency.
+	"""
+	return len(_TOKEN.findall(text))
+
+
+@dataclass
+class _Block:
+	kind: str  # paragraph | list | table | code | quote
+	lines: list[str] = field(default_factory=list)
+
+	@property
+	def text(self) -> str:
+		return "\n".join(self.lines).strip()
+
+
+def _block_kind(line: str) -> str:
+	stripped = line.lstrip()
+	if stripped.startswith("|"):
+		return "table"
+	if stripped.startswith(">"):
+		return "quote"
+	if _LIST_ITEM.match(line):
+		return "list"
+	return "paragraph"
+
+
+class MarkdownChunker:
+	"""Single-pass chunker that packs whole blocks up to a token budget.
+
+	Chunks never cross a heading. Within a section, paragraphs, lists, tables,
+	quotes and fenced code are kept whole where they fit; oversized blocks split
+	at item, row or sentence boundaries (table header rows are repeated). A
+	``### Variable: `name``` block from the questionnaire export is one unit.
+	"""
+
+	def __init__(self, max_tokens: int | None = None) -> None:
+		"""Initialize with the per-chunk token budget."""
+		self.max_tokens = max(max_tokens or settings.knowledge_chunk_max_tokens, 32)
+
+	def iter_chunks(self, lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+		"""Yield (section_path, text) chunks from markdown lines, in order."""
+
+		path: list[tuple[int, str]] = []
+		blocks: list[_Block] = []
+		block: _Block | None = None
+		variable_heading = ""
+		in_fence = False
+
+		def section_path() -> str:
+			names = [name for level, name in path if level >= 2]
+			return " > ".join(names) if names else "root"
+
+		def close_block() -> None:
+			nonlocal block
+			if block is not None and block.text:
+				blocks.append(block)
+			block = None
+
+		def flush_section() -> Iterator[tuple[str, str]]:
+			close_block()
+			if blocks:
+				current = section_path()
+				if variable_heading:
+					units = self._variable_unit(variable_heading, blocks)
+					yield from ((current, text) for text in units)
+				else:
+					yield from ((current, text) for text in self._pack(blocks))
+			blocks.clear()
+
+		for raw in lines:
+			line = raw.rstrip("\r\n")
+			if in_fence:
+				assert block is not None
+				block.lines.append(line)
+				if _FENCE.match(line):
+					in_fence = False
+					close_block()
+				continue
+
+			heading = _HEADING.match(line)
+			if heading:
+				yield from flush_section()
+				level, title = len(heading.group(1)), heading.group(2).strip()
+				path = [(depth, name) for depth, name in path if depth < level] + [(level, title)]
+				variable = _VARIABLE.match(title)
+				variable_heading = line.strip() if variable else ""
+				continue
+
+			if _FENCE.match(line):
+				close_block()
+				block = _Block("code", [line])
+				in_fence = True
+				continue
+
+			if not line.strip() or _RULE.match(line):
+				close_block()
+				if _RULE.match(line) and variable_heading:
+					# The export separates variable blocks with a rule; end the unit there.
+					yield from flush_section()
+					variable_heading = ""
+				continue
+
+			kind = _block_kind(line)
+			continues_list = block is not None and block.kind == "list" and line[:1].isspace()
+			if continues_list and kind == "paragraph":
+				kind = "list"  # indented continuation of a list item
+			if block is None or block.kind != kind:
+				close_block()
+				block = _Block(kind)
+			block.lines.append(line)
+
+		yield from flush_section()
+
+	def chunk(self, content: str) -> list[tuple[str, str]]:
+		"""Chunk a whole markdown document."""
+		return list(self.iter_chunks(content.splitlines()))
+
+	def _variable_unit(self, heading: str, blocks: list[_Block]) -> list[str]:
+		"""Keep a variable block together; only very long option lists are split."""
+
+		text = "\n\n".join([heading, *(item.text for item in blocks)])
+		if estimate_tokens(text) <= self.max_tokens * 4:
+			return [text]
+		return [f"{heading}\n{part}" for part in self._pack(blocks)]
+
+	def _pack(self, blocks: list[_Block]) -> list[str]:
+		"""Greedily pack blocks (split if oversized) into chunks within budget."""
+
+		chunks: list[str] = []
+		current: list[str] = []
+		used = 0
+		for piece in (part for item in blocks for part in self._split_block(item)):
+			size = estimate_tokens(piece)
+			if current and used + size > self.max_tokens:
+				chunks.append("\n\n".join(current))
+				current, used = [], 0
+			current.append(piece)
+			used += size
+		if current:
+			chunks.append("\n\n".join(current))
+		return chunks
+
+	def _split_block(self, block: _Block) -> list[str]:
+		"""Return the block whole, or pieces at its natural boundaries."""
+
+		text = block.text
+		if estimate_tokens(text) <= self.max_tokens:
+			return [text]
+		if block.kind == "table":
+			header, rows = block.lines[:2], block.lines[2:]
+			return self._group(rows, prefix="\n".join(header))
+		if block.kind == "list":
+			items: list[str] = []
+			for line in block.lines:
+				if _LIST_ITEM.match(line) or not items:
+					items.append(line)
+				else:
+					items[-1] += "\n" + line
+			return self._group(items)
+		if block.kind in {"code", "quote"}:
+			return self._group(block.lines)
+		return self._group(self._sentences(text), joiner=" ")
+
+	def _sentences(self, text: str) -> list[str]:
+		pieces: list[str] = []
+		for sentence in _SENTENCE_END.split(" ".join(text.split())):
+			if estimate_tokens(sentence) <= self.max_tokens:
+				pieces.append(sentence)
+				continue
+			words = sentence.split()
+			step = max(self.max_tokens // 2, 1)
+			pieces.extend(
+				" ".join(words[start : start + step]) for start in range(0, len(words), step)
+			)
+		return pieces
+
+	def _group(self, parts: list[str], *, prefix: str = "", joiner: str = "\n") -> list[str]:
+		"""Join consecutive parts while they fit, optionally repeating a prefix."""
+
+		budget = self.max_tokens - estimate_tokens(prefix)
+		groups: list[list[str]] = []
+		used = 0
+		for part in parts:
+			size = estimate_tokens(part)
+			if groups and used + size <= budget:
+				groups[-1].append(part)
+				used += size
+			else:
+				groups.append([part])
+				used = size
+		lead = f"{prefix}\n" if prefix else ""
+		return [lead + joiner.join(group) for group in groups]
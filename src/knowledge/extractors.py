@@ -0,0 +1,138 @@
+"""Turn knowledge base source files (markdown, HTML, XLSForm, text) into markdown."""
+
+import csv
+import hashlib
+import io
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+from src.knowledge.html_extractor import html_to_markdown
+from src.knowledge.xlsform import is_xlsform_header, xlsform_to_markdown, xlsx_rows
+
+# Takes the raw file bytes and its path; returns markdown for the chunker.
+Extractor = Callable[[bytes, Path], str]
+
+_EXTRACTORS: dict[str, Extractor] = {}
+
+# Bump when any extractor's output changes so cached extractions are redone.
+EXTRACTOR_VERSION = 1
+
+
+def register_extractor(*suffixes: str) -> Callable[[Extractor], Extractor]:
+	"""Register ``func`` as the extractor for the given file suffixes."""
+
+	def decorator(func: Extractor) -> Extractor:
+		for suffix in suffixes:
+			_EXTRACTORS[suffix.lower()] = func
+		return func
+
+	return decorator
+
+
+def supported_suffixes() -> frozenset[str]:
+	"""Return every suffix that has a registered extractor."""
+	return frozenset(_EXTRACTORS)
+
+
+def is_supported(path: Path) -> bool:
+	"""Return True when ``path`` can be indexed."""
+	return path.suffix.lower() in _EXTRACTORS and not path.name.startswith((".", "~$"))
+
+
+def _decode(data: bytes) -> str:
+	return data.decode("utf-8-sig", errors="replace")
+
+
+@register_extractor(".md", ".markdown")
+def extract_markdown(data: bytes, path: Path) -> str:
+	"""Markdown is indexed as-is."""
+	return _decode(data)
+
+
+@register_extractor(".txt")
+def extract_text(data: bytes, path: Path) -> str:
+	"""Plain text gets a title heading so chunks carry the file name."""
+	return f"# {path.stem}\n\n{_decode(data)}"
+
+
+@register_extractor(".html", ".htm")
+def extract_html(data: bytes, path: Path) -> str:
+	"""SurveyCTO printables become variable blocks; other pages become text."""
+	return html_to_markdown(_decode(data), default_title=path.stem)
+
+
+def _markdown_table(rows: list[list[str]], title: str) -> str:
+	rows = [row for row in rows if any(cell.strip() for cell in row)]
+	if not rows:
+		return f"# {title}\n"
+	width = max(len(row) for row in rows)
+
+	def line(row: list[str]) -> str:
+		cells = [cell.replace("|", "\\|").replace("\n", " ").strip() for cell in row]
+		return "| " + " | ".join(cells + [""] * (width - len(cells))) + " |"
+
+	body = [line(rows[0]), "|" + "---|" * width, *(line(row) for row in rows[1:])]
+	return f"# {title}\n\n" + "\n".join(body) + "\n"
+
+
+@register_extractor(".csv")
+def extract_csv(data: bytes, path: Path) -> str:
+	"""An XLSForm survey sheet becomes variable blocks; any other CSV becomes a table.
+
+	A CSV holds one sheet, so select options are only listed for .xlsx forms.
+	"""
+
+	rows = list(csv.reader(io.StringIO(_decode(data))))
+	if rows and is_xlsform_header(rows[0]):
+		return xlsform_to_markdown(rows, [], title=path.stem)
+	return _markdown_table(rows, path.stem)
+
+
+@register_extractor(".xlsx")
+def extract_xlsx(data: bytes, path: Path) -> str:
+	"""An XLSForm workbook (survey + choices sheets), or its first sheet as a table."""
+
+	sheets = xlsx_rows(data)
+	survey = sheets.get("survey")
+	if survey and is_xlsform_header(survey[0]):
+		settings_rows = sheets.get("settings") or []
+		title = path.stem
+		if len(settings_rows) > 1 and "form_title" in settings_rows[0]:
+			row = settings_rows[1]
+			index = settings_rows[0].index("form_title")
+			title = (row[index] if index < len(row) else "") or title
+		return xlsform_to_markdown(survey, sheets.get("choices") or [], title=title)
+	first = next(iter(sheets.values()), [])
+	return _markdown_table(first, path.stem)
+
+
+def extract(path: Path) -> str:
+	"""Return markdown for one source file."""
+
+	extractor = _EXTRACTORS.get(path.suffix.lower())
+	if extractor is None:
+		raise ValueError(f"No extractor registered for {path.suffix!r}")
+	return extractor(path.read_bytes(), path)
+
+
+def extract_cached(path: str, digest: str, cache_dir: str) -> str:
+	"""Extract ``path``, reusing a previous result for the same content hash.
+
+	Module-level so it can run in a process pool worker.
+	"""
+
+	source = Path(path)
+	if source.suffix.lower() in {".md", ".markdown"}:
+		return extract(source)  # nothing to save by caching a copy
+	fingerprint = f"{EXTRACTOR_VERSION}:{source.suffix.lower()}:{digest}"
+	key = hashlib.sha256(fingerprint.encode()).hexdigest()
+	cached = Path(cache_dir) / f"{key}.md"
+	if cached.is_file():
+		return cached.read_text(encoding="utf-8")
+	text = extract(source)
+	cached.parent.mkdir(parents=True, exist_ok=True)
+	temp_path = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+	temp_path.write_text(text, encoding="utf-8")
+	temp_path.replace(cached)
+	return text
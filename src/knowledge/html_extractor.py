@@ -0,0 +1,225 @@
+"""Streaming HTML to markdown, with SurveyCTO printable forms rendered as variable blocks.
+
+Replaces the one-off BeautifulSoup converter: the stdlib parser is fed the page
+in chunks and each table row is converted and dropped as soon as it closes, so
+memory is bounded by one row rather than the whole document tree.
+"""
+
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+_VOID_TAGS = frozenset("area base br col embed hr img input link meta source track wbr".split())
+_TEXT_TAGS = {
+	"h1": "# ",
+	"h2": "## ",
+	"h3": "### ",
+	"h4": "#### ",
+	"h5": "##### ",
+	"h6": "###### ",
+	"p": "",
+	"li": "- ",
+}
+_FEED_CHARS = 256 * 1024
+
+
+def _clean(text: str) -> str:
+	return re.sub(r"\s+", " ", text).strip()
+
+
+@dataclass
+class _Node:
+	tag: str
+	attrs: dict[str, str] = field(default_factory=dict)
+	children: list["_Node | str"] = field(default_factory=list)
+
+	@property
+	def classes(self) -> list[str]:
+		return self.attrs.get("class", "").split()
+
+	def text(self) -> str:
+		return "".join(child if isinstance(child, str) else child.text() for child in self.children)
+
+	def find_all(self, tag: str) -> list["_Node"]:
+		found: list[_Node] = []
+		for child in self.children:
+			if isinstance(child, _Node):
+				if child.tag == tag:
+					found.append(child)
+				found.extend(child.find_all(tag))
+		return found
+
+	def cells(self) -> list["_Node"]:
+		return [
+			child
+			for child in self.children
+			if isinstance(child, _Node) and child.tag in {"td", "th"}
+		]
+
+
+def _question_text(cell: _Node) -> tuple[str, str, str]:
+	"""Return (question, relevance, constraint) from a printable question cell."""
+
+	relevance = constraint = ""
+	parts: list[str] = []
+	for element in cell.children:
+		if isinstance(element, str):
+			if _clean(element):
+				parts.append(_clean(element))
+			continue
+		text = _clean(element.text())
+		if element.tag == "p" and "relevance" in element.classes:
+			relevance = text.replace("Question relevant when:", "").strip()
+		elif element.tag == "p" and "constraint" in element.classes:
+			constraint = text.replace("Response constrained to:", "").strip()
+		elif element.tag == "p" and "hint" in element.classes:
+			parts.append(f"_{text}_")
+		elif element.tag in {"b", "strong"}:
+			parts.append(f"**{text}**")
+		elif element.tag in {"i", "em"}:
+			parts.append(f"*{text}*")
+		elif element.tag == "br":
+			parts.append("__BR__")
+		else:
+			parts.append(text)
+	question = _clean(" ".join(parts)).replace("__BR__", "\n\n")
+	return question, relevance, constraint
+
+
+def _answers(cell: _Node) -> list[str]:
+	tables = cell.find_all("table")
+	if not tables:
+		text = _clean(cell.text())
+		return [f"- {text}"] if text else []
+	answers: list[str] = []
+	for row in tables[0].find_all("tr"):
+		texts = [text for text in (_clean(item.text()) for item in row.find_all("td")) if text]
+		if len(texts) >= 2:
+			answers.append(f"- **{texts[0]}**: {texts[1]}")
+		elif texts:
+			answers.append(f"- {texts[0]}")
+	return answers
+
+
+class _PrintableParser(HTMLParser):
+	"""Emits markdown lines as rows and text blocks close."""
+
+	def __init__(self) -> None:
+		super().__init__(convert_charrefs=True)
+		self.title = ""
+		self.variables: list[str] = []
+		self.text_lines: list[str] = []
+		self.printable = False
+		self._tables: list[_Node] = []
+		self._row: _Node | None = None
+		self._stack: list[_Node] = []
+		self._skip = 0
+		self._in_title = False
+		self._capture: tuple[str, list[str]] | None = None
+
+	def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+		if tag in {"script", "style"}:
+			self._skip += 1
+			return
+		if tag == "title":
+			self._in_title = True
+			return
+		node = _Node(tag, {key: value or "" for key, value in attrs})
+		if tag == "table":
+			self._tables.append(node)
+			if "table-condensed" in node.classes:
+				# The form table itself: drop any layout row that was wrapping it.
+				self.printable = True
+				self._row, self._stack = None, []
+		if self._row is None and tag == "tr" and self._tables:
+			self._row, self._stack = node, [node]
+			return
+		if self._row is not None:
+			self._stack[-1].children.append(node)
+			if tag not in _VOID_TAGS:
+				self._stack.append(node)
+			return
+		if tag in _TEXT_TAGS and not self._tables:
+			self._capture = (tag, [])
+
+	def handle_endtag(self, tag: str) -> None:
+		if tag in {"script", "style"}:
+			self._skip = max(self._skip - 1, 0)
+			return
+		if tag == "title":
+			self._in_title = False
+			return
+		if tag == "table" and self._tables:
+			self._tables.pop()
+		if self._row is not None:
+			if tag == "tr" and len(self._stack) == 1:
+				self._emit_row(self._row)
+				self._row, self._stack = None, []
+				return
+			for depth in range(len(self._stack) - 1, 0, -1):
+				if self._stack[depth].tag == tag:
+					del self._stack[depth:]
+					break
+			return
+		if self._capture is not None and tag == self._capture[0]:
+			text = _clean("".join(self._capture[1]))
+			if text:
+				self.text_lines.extend([_TEXT_TAGS[tag] + text, ""])
+			self._capture = None
+
+	def handle_data(self, data: str) -> None:
+		if self._skip:
+			return
+		if self._in_title:
+			self.title += data
+		elif self._row is not None:
+			self._stack[-1].children.append(data)
+		elif self._capture is not None:
+			self._capture[1].append(data)
+
+	def _emit_row(self, row: _Node) -> None:
+		cells = row.cells()
+		if len(cells) == 1 and cells[0].attrs.get("colspan") == "3" and self.printable:
+			text = _clean(cells[0].text())
+			if text:
+				self.variables.extend([f"## {text.split('>')[-1].strip()}", ""])
+			return
+		if len(cells) == 3:
+			name = _clean(cells[0].text()).replace("(required)", "").strip()
+			question, relevance, constraint = _question_text(cells[1])
+			if "field" in name.lower() and "question" in question.lower():
+				self.printable = True  # the printable's header row
+				return
+			if self.printable and name:
+				self._emit_variable(name, question, _answers(cells[2]), relevance, constraint)
+				return
+		texts = [text for text in (_clean(cell.text()) for cell in cells) if text]
+		if texts:
+			self.text_lines.append(" | ".join(texts))
+
+	def _emit_variable(
+		self, name: str, question: str, answers: list[str], relevance: str, constraint: str,
+	) -> None:
+		lines = [f"### Variable: `{name}`", f"**Question:** {question}"]
+		if answers:
+			lines.extend(["", "**Options:**", *answers])
+		else:
+			lines.extend(["", "**Type:** Free Text / Input"])
+		if relevance:
+			lines.extend(["", f"> **Logic:** Show if `{relevance}`"])
+		if constraint:
+			lines.extend(["", f"> **Validation:** `{constraint}`"])
+		lines.extend(["", "---", ""])
+		self.variables.extend(lines)
+
+
+def html_to_markdown(html: str, *, default_title: str) -> str:
+	"""Convert an HTML page; questionnaire printables yield ``### Variable:`` blocks."""
+
+	parser = _PrintableParser()
+	for start in range(0, len(html), _FEED_CHARS):
+		parser.feed(html[start : start + _FEED_CHARS])
+	parser.close()
+	title = _clean(parser.title) or default_title
+	body = parser.variables if parser.variables else parser.text_lines
+	return "\n".join([f"# {title}", "", *body]).rstrip() + "\n"
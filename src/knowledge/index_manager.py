@@ -0,0 +1,142 @@
+"""Single owner of the live knowledge index: rebuilds, change scans, and hot swap."""
+
+import asyncio
+from collections.abc import Callable
+from pathlib import Path
+
+from src.config import settings
+from src.integrations.openai_client import OpenAIClient
+from src.knowledge.indexer import (
+	KnowledgeChunk,
+	KnowledgeDocChanges,
+	KnowledgeIndexer,
+	KnowledgeIndexStats,
+)
+from src.knowledge.retriever import KnowledgeRetriever
+from src.knowledge.variables import QuestionnaireVariable, VariableDictionary
+from src.utils.logger import get_logger
+
+log = get_logger("knowledge_index")
+
+RetrieverListener = Callable[[KnowledgeRetriever], None]
+
+
+class KnowledgeIndexManager:
+	"""Rebuilds the index off the event loop and swaps the retriever atomically.
+
+	Concurrent rebuild requests are coalesced: callers that arrive while a build
+	is running wait for one follow-up build that covers all of them. The swap is
+	a single reference assignment, so queries already holding the old retriever
+	finish against it.
+	"""
+
+	def __init__(
+		self,
+		openai_client: OpenAIClient,
+		base_path: Path | None = None,
+		cache_path: Path | None = None,
+	) -> None:
+		"""Initialize with KB location and index cache."""
+		self.openai_client = openai_client
+		self.base_path = base_path or Path(settings.knowledge_base_path)
+		self.cache_path = cache_path or Path(settings.knowledge_index_cache_path)
+		self.retriever: KnowledgeRetriever | None = None
+		self.doc_hashes: dict[str, str] = {}
+		self.doc_variables: dict[str, list[QuestionnaireVariable]] = {}
+		self.last_stats: KnowledgeIndexStats | None = None
+		self._listeners: list[RetrieverListener] = []
+		self._lock = asyncio.Lock()
+		self._requested = 0
+		self._completed = 0
+
+	def _indexer(self) -> KnowledgeIndexer:
+		return KnowledgeIndexer(self.base_path, self.openai_client, cache_path=self.cache_path)
+
+	def subscribe(self, listener: RetrieverListener) -> None:
+		"""Call ``listener`` with each new retriever (and the current one, if any)."""
+		self._listeners.append(listener)
+		if self.retriever is not None:
+			listener(self.retriever)
+
+	async def rebuild(
+		self, *, force_rebuild: bool = False, reason: str = ""
+	) -> KnowledgeIndexStats:
+		"""Rebuild the index (deduplicated) and publish the new retriever."""
+
+		self._requested += 1
+		ticket = self._requested
+		async with self._lock:
+			if not force_rebuild and self._completed >= ticket and self.last_stats is not None:
+				log.info("knowledge.rebuild_coalesced", reason=reason)
+				return self.last_stats
+			covers = self._requested
+			indexer = self._indexer()
+			chunks, stats = await indexer.build_index(force_rebuild=force_rebuild)
+			self.doc_hashes = indexer.doc_hashes
+			self.doc_variables = indexer.variables
+			self._swap(self._retriever(chunks))
+			self.last_stats = stats
+			self._completed = covers
+		log.info(
+			"knowledge.indexed",
+			reason=reason,
+			chunk_count=stats.chunk_count,
+			total_docs=stats.total_docs,
+			reused_chunks=stats.reused_chunks,
+			embedded_chunks=stats.embedded_chunks,
+			changed_docs=stats.changed_docs,
+			cache_hit=stats.cache_hit,
+			variables=sum(len(items) for items in self.doc_variables.values()),
+		)
+		return stats
+
+	def _retriever(self, chunks: list[KnowledgeChunk]) -> KnowledgeRetriever:
+		variables = [
+			variable for doc in sorted(self.doc_variables) for variable in self.doc_variables[doc]
+		]
+		return KnowledgeRetriever(chunks, self.openai_client, VariableDictionary(variables))
+
+	def _swap(self, retriever: KnowledgeRetriever) -> None:
+		self.retriever = retriever
+		for listener in self._listeners:
+			listener(retriever)
+
+	async def apply_changes(self, docs: set[str]) -> KnowledgeIndexStats:
+		"""Re-embed only the given doc paths and swap in the patched index."""
+
+		if self.retriever is None:
+			return await self.rebuild(reason="watch")
+		async with self._lock:
+			indexer = self._indexer()
+			chunks, stats = await indexer.patch_index(
+				self.retriever.chunks, self.doc_hashes, docs, self.doc_variables
+			)
+			self.doc_hashes = indexer.doc_hashes
+			self.doc_variables = indexer.variables
+			if stats.changed_docs:
+				self._swap(self._retriever(chunks))
+				self.last_stats = stats
+		log.info(
+			"knowledge.patched",
+			docs=sorted(docs),
+			changed_docs=stats.changed_docs,
+			embedded_chunks=stats.embedded_chunks,
+			chunk_count=stats.chunk_count,
+		)
+		return stats
+
+	async def refresh_if_changed(self) -> KnowledgeDocChanges:
+		"""Scan for added, modified, or deleted docs and patch the index if any."""
+
+		changes = await asyncio.to_thread(self._indexer().scan_changes, self.doc_hashes)
+		if changes.changed:
+			log.info(
+				"knowledge.scan.changes_found",
+				added=changes.added,
+				modified=changes.modified,
+				deleted=changes.deleted,
+			)
+			await self.apply_changes({*changes.added, *changes.modified, *changes.deleted})
+		else:
+			log.info("knowledge.scan.no_changes", scanned_docs=len(changes.doc_hashes))
+		return changes
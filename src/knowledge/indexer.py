@@ -1,25 +1,41 @@
 """Knowledge base indexing utilities."""
 
+import asyncio
 import hashlib
+import json
+import multiprocessing
 import pickle
 import re
-from dataclasses import dataclass
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any
 
 from src.config import settings
 from src.integrations.openai_client import OpenAIClient
+from src.knowledge.chunker import CHUNKER_VERSION, MarkdownChunker
+from src.knowledge.extractors import extract_cached, is_supported
+from src.knowledge.metadata import DOC_GROUP_PROTOCOL, DocMetadata, doc_metadata, split_front_matter
+from src.knowledge.variables import QuestionnaireVariable, parse_variables
+from src.utils.logger import get_logger
+
+log = get_logger("knowledge_indexer")
 
 
 @dataclass
 class KnowledgeChunk:
-	"""Indexed chunk with embedding."""
+	"""Indexed chunk with embedding and filterable metadata."""
 
 	chunk_id: str
 	source_doc: str
 	section_path: str
 	text: str
 	embedding: list[float]
+	doc_group: str = DOC_GROUP_PROTOCOL
+	form: str = ""
+	section_depth: int = 0
+	tags: tuple[str, ...] = ()
 
 
 @dataclass
@@ -34,18 +50,82 @@ class KnowledgeIndexStats:
 	cache_hit: bool
 
 
+@dataclass
+class KnowledgeDocChanges:
+	"""Docs added, modified, or deleted relative to a known set of hashes."""
+
+	added: list[str] = field(default_factory=list)
+	modified: list[str] = field(default_factory=list)
+	deleted: list[str] = field(default_factory=list)
+	doc_hashes: dict[str, str] = field(default_factory=dict)
+
+	@property
+	def changed(self) -> bool:
+		"""Return True when any doc was added, modified, or deleted."""
+		return bool(self.added or self.modified or self.deleted)
+
+
+@dataclass
+class _IndexPlan:
+	"""Blocking-phase output of an index build: what to reuse and what to embed."""
+
+	doc_hashes: dict[str, str]
+	reused_chunks: list[KnowledgeChunk] = field(default_factory=list)
+	# (chunk_id, source_doc, section_path, text)
+	pending: list[tuple[str, str, str, str]] = field(default_factory=list)
+	# Questionnaire variable blocks per doc (docs without any are omitted).
+	variables: dict[str, list[QuestionnaireVariable]] = field(default_factory=dict)
+	# Metadata for every doc with pending chunks.
+	metadata: dict[str, DocMetadata] = field(default_factory=dict)
+	changed_docs: int = 0
+	cache_hit: bool = False
+
+
+# Bump when data derived from doc text without embeddings (variable
+# dictionary, chunk metadata) changes: cached docs are re-extracted, not re-embedded.
+_DERIVED_VERSION = 2
+
+# Files modified this recently may still change within the same mtime tick,
+# so their stat entry is not trusted on the next scan.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def _with_metadata(chunk: KnowledgeChunk, metadata: DocMetadata) -> KnowledgeChunk:
+	"""Return ``chunk`` stamped with its doc's metadata and its section depth."""
+
+	depth = 0 if chunk.section_path == "root" else chunk.section_path.count(" > ") + 1
+	return replace(
+		chunk,
+		doc_group=metadata.doc_group,
+		form=metadata.form,
+		section_depth=depth,
+		tags=metadata.tags,
+	)
+
+
 class KnowledgeIndexer:
-	"""Builds chunked index from markdown docs."""
+	"""Builds chunked index from KB docs (markdown, HTML, XLSForm, text)."""
 
 	def __init__(
 		self,
 		base_path: Path,
 		openai_client: OpenAIClient,
 		cache_path: Path | None = None,
+		stat_cache_path: Path | None = None,
+		extract_cache_dir: Path | None = None,
 	) -> None:
 		self.base_path = base_path
 		self.openai_client = openai_client
 		self.cache_path = cache_path or Path(settings.knowledge_index_cache_path)
+		self.stat_cache_path = stat_cache_path or self.cache_path.with_name(
+			f"{self.cache_path.stem}_stats.json"
+		)
+		self.extract_cache_dir = extract_cache_dir or self.cache_path.with_name(
+			f"{self.cache_path.stem}_extracted"
+		)
+		self.doc_hashes: dict[str, str] = {}
+		self.variables: dict[str, list[QuestionnaireVariable]] = {}
+		self.chunker = MarkdownChunker()
 
 	def _file_hash(self, path: Path) -> str:
 		"""Compute SHA256 hash for change detection."""
@@ -56,6 +136,66 @@ class KnowledgeIndexer:
 				hasher.update(block)
 		return hasher.hexdigest()
 
+	def _load_stat_cache(self) -> dict[str, dict[str, Any]]:
+		"""Load the (path -> size, mtime_ns, sha256) cache; empty if unreadable."""
+
+		if not self.stat_cache_path.exists():
+			return {}
+		try:
+			data = json.loads(self.stat_cache_path.read_text(encoding="utf-8"))
+		except (OSError, json.JSONDecodeError):
+			return {}
+		return data if isinstance(data, dict) else {}
+
+	def current_doc_hashes(self) -> dict[str, str]:
+		"""Return SHA256 per source doc, re-hashing only files whose stat changed."""
+
+		stat_cache = self._load_stat_cache()
+		updated: dict[str, dict[str, Any]] = {}
+		hashes: dict[str, str] = {}
+		trust_before_ns = time.time_ns() - _RACY_WINDOW_NS
+		sources = (
+			path for path in self.base_path.rglob("*") if is_supported(path) and path.is_file()
+		)
+		for path in sorted(sources, key=lambda item: item.as_posix()):
+			doc = self._relative_doc_path(path)
+			stat = path.stat()
+			entry = stat_cache.get(doc)
+			if (
+				entry
+				and entry.get("size") == stat.st_size
+				and entry.get("mtime_ns") == stat.st_mtime_ns
+			):
+				digest = str(entry["sha256"])
+			else:
+				digest = self._file_hash(path)
+			hashes[doc] = digest
+			if stat.st_mtime_ns < trust_before_ns:
+				updated[doc] = {
+					"size": stat.st_size,
+					"mtime_ns": stat.st_mtime_ns,
+					"sha256": digest,
+				}
+
+		if updated != stat_cache:
+			self.stat_cache_path.parent.mkdir(parents=True, exist_ok=True)
+			self.stat_cache_path.write_text(json.dumps(updated, indent=1), encoding="utf-8")
+		return hashes
+
+	def scan_changes(self, known_hashes: dict[str, str]) -> KnowledgeDocChanges:
+		"""Compare the KB on disk with previously indexed doc hashes."""
+
+		current = self.current_doc_hashes()
+		return KnowledgeDocChanges(
+			added=sorted(set(current) - set(known_hashes)),
+			modified=sorted(
+				doc for doc, digest in current.items()
+				if doc in known_hashes and known_hashes[doc] != digest
+			),
+			deleted=sorted(set(known_hashes) - set(current)),
+			doc_hashes=current,
+		)
+
 	def _load_cache(self) -> dict[str, Any] | None:
 		"""Load persisted index cache if available."""
 
@@ -72,162 +212,288 @@ class KnowledgeIndexer:
 		"""Persist index cache to disk."""
 
 		self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-		with self.cache_path.open("wb") as handle:
+		temp_path = self.cache_path.with_name(f"{self.cache_path.name}.tmp")
+		with temp_path.open("wb") as handle:
 			pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
-
-	def _parse_markdown_sections(self, content: str) -> list[tuple[str, str]]:
-		"""Parse markdown into sections based on headers.
-
-		Returns list of (section_path, text) tuples.
-		"""
-
-		sections: list[tuple[str, str]] = []
-		current_path: list[str] = []
-		current_text: list[str] = []
-
-		lines = content.split("\n")
-		for line in lines:
-			# Check for markdown headers (## or ###)
-			header_match = re.match(r"^(#{2,3})\s+(.+)$", line)
-			if header_match:
-				# Save previous section if it has content
-				if current_text:
-					section_path = " > ".join(current_path) if current_path else "root"
-					sections.append((section_path, "\n".join(current_text).strip()))
-					current_text = []
-
-				# Update path based on header level
-				level = len(header_match.group(1))
-				header_text = header_match.group(2).strip()
-
-				if level == 2:  # ## Header
-					current_path = [header_text]
-				elif level == 3:  # ### Sub-header
-					if len(current_path) >= 1:
-						current_path = [current_path[0], header_text]
-					else:
-						current_path = [header_text]
-			else:
-				current_text.append(line)
-
-		# Add final section
-		if current_text:
-			section_path = " > ".join(current_path) if current_path else "root"
-			sections.append((section_path, "\n".join(current_text).strip()))
-
-		return sections
-
-	def _chunk_text(self, text: str, size: int = 512, overlap: int = 64) -> list[str]:
-		"""Split text into overlapping chunks by characters."""
-
-		if not text.strip():
-			return []
-		chunks: list[str] = []
-		step = max(size - overlap, 1)
-		for start in range(0, len(text), step):
-			part = text[start : start + size]
-			if part:
-				chunks.append(part)
-		return chunks
+		temp_path.replace(self.cache_path)
 
 	def _relative_doc_path(self, path: Path) -> str:
 		"""Return stable document key relative to KB root."""
 
 		return path.relative_to(self.base_path).as_posix()
 
-	async def build_index(self, force_rebuild: bool = False) -> tuple[list[KnowledgeChunk], KnowledgeIndexStats]:
-		"""Read markdown files and produce embedded chunks with incremental cache reuse."""
+	def _extract_docs(self, docs: dict[str, str]) -> dict[str, str]:
+		"""Return markdown per doc path (keyed by content hash in ``docs``).
+
+		Non-markdown sources are extracted in a process pool when there are
+		several; results are cached per content hash so only new files are parsed.
+		A file that fails to extract is indexed as empty and logged.
+		"""
 
-		markdown_files = sorted(self.base_path.rglob("*.md"), key=lambda item: item.as_posix())
-		current_hashes = {self._relative_doc_path(path): self._file_hash(path) for path in markdown_files}
+		cache_dir = str(self.extract_cache_dir)
+		heavy = [doc for doc in docs if not doc.endswith((".md", ".markdown"))]
+		workers = min(settings.knowledge_extract_workers, len(heavy))
+		texts: dict[str, str] = {}
+		if workers > 1:
+			# spawn: the bot process has live threads, which fork would copy mid-state.
+			context = multiprocessing.get_context("spawn")
+			with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+				futures = {
+					doc: pool.submit(
+						extract_cached, str(self.base_path / doc), docs[doc], cache_dir
+					)
+					for doc in heavy
+				}
+				for doc, future in futures.items():
+					try:
+						texts[doc] = future.result()
+					except Exception as error:
+						log.warning("knowledge.extract_failed", doc=doc, error=str(error))
+						texts[doc] = ""
+		for doc, digest in docs.items():
+			if doc in texts:
+				continue
+			try:
+				texts[doc] = extract_cached(str(self.base_path / doc), digest, cache_dir)
+			except Exception as error:
+				log.warning("knowledge.extract_failed", doc=doc, error=str(error))
+				texts[doc] = ""
+		return texts
+
+	def _doc_pending(self, file_name: str, content: str) -> list[tuple[str, str, str, str]]:
+		"""Split one doc into (chunk_id, source_doc, section_path, text) entries to embed."""
+
+		safe_doc_key = re.sub(r"[^a-zA-Z0-9_-]+", "_", file_name)
+		_, body = split_front_matter(content)
+		pending: list[tuple[str, str, str, str]] = []
+		for index, (section_path, text) in enumerate(self.chunker.iter_chunks(body.splitlines())):
+			safe_section_path = section_path.replace(" > ", "__").replace(" ", "_")
+			chunk_id = f"{safe_doc_key}-{safe_section_path}-{index}"
+			pending.append((chunk_id, file_name, section_path, text))
+		return pending
+
+	def _doc_derived(
+		self, doc: str, content: str
+	) -> tuple[list[QuestionnaireVariable], DocMetadata]:
+		"""Parse a doc's variable blocks and metadata from its extracted text."""
+
+		front_matter, body = split_front_matter(content)
+		variables = parse_variables(body, doc)
+		return variables, doc_metadata(doc, front_matter, bool(variables))
+
+	def _plan_index(self, force_rebuild: bool) -> _IndexPlan:
+		"""Hash, load the cache, and extract changed docs (blocking; run in a thread)."""
+
+		current_hashes = self.current_doc_hashes()
 
 		cache = None if force_rebuild else self._load_cache()
-		cache_model = cache.get("embedding_model") if cache else None
+		# Embeddings are reusable only for the same model and chunk boundaries.
+		cache_usable = cache is not None and (
+			cache.get("embedding_model") == settings.openai_embedding_model
+			and cache.get("chunker_version") == CHUNKER_VERSION
+		)
 		cache_hashes: dict[str, str] = cache.get("doc_hashes", {}) if cache else {}
 		cache_chunks: list[KnowledgeChunk] = cache.get("chunks", []) if cache else []
+		derived_fresh = (
+			cache is not None
+			and cache_usable
+			and cache.get("derived_version") == _DERIVED_VERSION
+		)
+		cache_variables: dict[str, list[QuestionnaireVariable]] = (
+			cache.get("variables", {}) if cache is not None and derived_fresh else {}
+		)
 
-		if cache and cache_model == settings.openai_embedding_model and cache_hashes == current_hashes:
-			stats = KnowledgeIndexStats(
-				total_docs=len(markdown_files),
-				chunk_count=len(cache_chunks),
-				reused_chunks=len(cache_chunks),
-				embedded_chunks=0,
-				changed_docs=0,
+		if derived_fresh and cache_hashes == current_hashes:
+			return _IndexPlan(
+				doc_hashes=current_hashes,
+				reused_chunks=cache_chunks,
+				variables=cache_variables,
 				cache_hit=True,
 			)
-			return cache_chunks, stats
 
 		reusable_by_doc: dict[str, list[KnowledgeChunk]] = {}
-		if cache and cache_model == settings.openai_embedding_model:
+		if cache_usable:
 			for chunk in cache_chunks:
 				reusable_by_doc.setdefault(chunk.source_doc, []).append(chunk)
 
 		# Collect all chunk metadata first, then batch-embed
 		pending: list[tuple[str, str, str, str]] = []  # (chunk_id, source_doc, section_path, text)
 		reused_chunks: list[KnowledgeChunk] = []
+		variables: dict[str, list[QuestionnaireVariable]] = {}
+		metadata: dict[str, DocMetadata] = {}
 		changed_docs = 0
 
-		for markdown_file in markdown_files:
-			file_name = self._relative_doc_path(markdown_file)
-			if (
-				not force_rebuild
-				and cache_model == settings.openai_embedding_model
-				and cache_hashes.get(file_name) == current_hashes[file_name]
-				and file_name in reusable_by_doc
-			):
+		reused_docs = {
+			doc for doc, digest in current_hashes.items()
+			if not force_rebuild
+			and cache_usable
+			and cache_hashes.get(doc) == digest
+			and doc in reusable_by_doc
+		}
+		to_extract = {
+			doc: digest for doc, digest in current_hashes.items()
+			if doc not in reused_docs or not derived_fresh
+		}
+		texts = self._extract_docs(to_extract)
+
+		for file_name in current_hashes:
+			if file_name in reused_docs and derived_fresh:
 				reused_chunks.extend(reusable_by_doc[file_name])
-				continue
+				doc_variables = cache_variables.get(file_name, [])
+			elif file_name in reused_docs:
+				# Same embeddings, refreshed variables and metadata.
+				doc_variables, doc_meta = self._doc_derived(file_name, texts[file_name])
+				reused_chunks.extend(
+					_with_metadata(chunk, doc_meta) for chunk in reusable_by_doc[file_name]
+				)
+			else:
+				changed_docs += 1
+				pending.extend(self._doc_pending(file_name, texts[file_name]))
+				doc_variables, metadata[file_name] = self._doc_derived(file_name, texts[file_name])
+			if doc_variables:
+				variables[file_name] = doc_variables
+
+		return _IndexPlan(
+			doc_hashes=current_hashes,
+			reused_chunks=reused_chunks,
+			pending=pending,
+			variables=variables,
+			metadata=metadata,
+			changed_docs=changed_docs,
+		)
+
+	async def build_index(
+		self, force_rebuild: bool = False
+	) -> tuple[list[KnowledgeChunk], KnowledgeIndexStats]:
+		"""Read markdown files and produce embedded chunks with incremental cache reuse.
+
+		File hashing, markdown parsing and pickle I/O run in a worker thread; only
+		the embedding requests run on the event loop.
+		"""
 
-			changed_docs += 1
-			content = markdown_file.read_text(encoding="utf-8")
-			sections = self._parse_markdown_sections(content)
+		plan = await asyncio.to_thread(self._plan_index, force_rebuild)
+		self.doc_hashes = plan.doc_hashes
+		self.variables = plan.variables
+		if plan.cache_hit:
+			stats = KnowledgeIndexStats(
+				total_docs=len(plan.doc_hashes),
+				chunk_count=len(plan.reused_chunks),
+				reused_chunks=len(plan.reused_chunks),
+				embedded_chunks=0,
+				changed_docs=0,
+				cache_hit=True,
+			)
+			return plan.reused_chunks, stats
+		return await self._finish(plan)
+
+	def _plan_patch(
+		self,
+		chunks: list[KnowledgeChunk],
+		doc_hashes: dict[str, str],
+		docs: set[str],
+		variables: dict[str, list[QuestionnaireVariable]],
+	) -> _IndexPlan:
+		"""Re-hash and re-extract only ``docs``; keep every other doc's chunks as-is."""
+
+		new_hashes = dict(doc_hashes)
+		new_variables = dict(variables)
+		pending: list[tuple[str, str, str, str]] = []
+		replaced: set[str] = set()
+		changed: dict[str, str] = {}
+		for doc in sorted(docs):
+			path = self.base_path / doc
+			if not path.is_file() or not is_supported(path):
+				new_variables.pop(doc, None)
+				if new_hashes.pop(doc, None) is not None:
+					replaced.add(doc)
+				continue
+			digest = self._file_hash(path)
+			if doc_hashes.get(doc) == digest:
+				continue
+			new_hashes[doc] = digest
+			replaced.add(doc)
+			changed[doc] = digest
+
+		metadata: dict[str, DocMetadata] = {}
+		for doc, content in self._extract_docs(changed).items():
+			pending.extend(self._doc_pending(doc, content))
+			doc_variables, metadata[doc] = self._doc_derived(doc, content)
+			if doc_variables:
+				new_variables[doc] = doc_variables
+			else:
+				new_variables.pop(doc, None)
+		return _IndexPlan(
+			doc_hashes=dict(sorted(new_hashes.items())),
+			reused_chunks=[chunk for chunk in chunks if chunk.source_doc not in replaced],
+			pending=pending,
+			variables=new_variables,
+			metadata=metadata,
+			changed_docs=len(replaced),
+		)
 
-			for section_path, section_text in sections:
-				safe_section_path = section_path.replace(" > ", "__").replace(" ", "_")
-				safe_doc_key = re.sub(r"[^a-zA-Z0-9_-]+", "_", file_name)
+	async def patch_index(
+		self,
+		chunks: list[KnowledgeChunk],
+		doc_hashes: dict[str, str],
+		docs: set[str],
+		variables: dict[str, list[QuestionnaireVariable]] | None = None,
+	) -> tuple[list[KnowledgeChunk], KnowledgeIndexStats]:
+		"""Update an existing index for a few changed doc paths without a full scan."""
+
+		plan = await asyncio.to_thread(self._plan_patch, chunks, doc_hashes, docs, variables or {})
+		self.doc_hashes = plan.doc_hashes
+		self.variables = plan.variables
+		if not plan.changed_docs:
+			return chunks, KnowledgeIndexStats(
+				total_docs=len(plan.doc_hashes),
+				chunk_count=len(chunks),
+				reused_chunks=len(chunks),
+				embedded_chunks=0,
+				changed_docs=0,
+				cache_hit=True,
+			)
+		return await self._finish(plan)
 
-				if len(section_text) > 512:
-					text_chunks = self._chunk_text(section_text)
-					for index, text_chunk in enumerate(text_chunks):
-						chunk_id = f"{safe_doc_key}-{safe_section_path}-{index}"
-						pending.append((chunk_id, file_name, section_path, text_chunk))
-				else:
-					chunk_id = f"{safe_doc_key}-{safe_section_path}"
-					pending.append((chunk_id, file_name, section_path, section_text))
+	async def _finish(self, plan: _IndexPlan) -> tuple[list[KnowledgeChunk], KnowledgeIndexStats]:
+		"""Embed pending chunks, merge with reused ones, and persist the cache."""
 
+		pending = plan.pending
 		# Batch embed only changed/new texts
 		texts = [text for _, _, _, text in pending]
 		all_embeddings = await self.openai_client.embed_batch_async(texts) if texts else []
 
 		new_chunks: list[KnowledgeChunk] = []
 		for (chunk_id, source_doc, section_path, text), embedding in zip(pending, all_embeddings, strict=True):
-			new_chunks.append(
-				KnowledgeChunk(
-					chunk_id=chunk_id,
-					source_doc=source_doc,
-					section_path=section_path,
-					text=text,
-					embedding=embedding,
-				)
+			chunk = KnowledgeChunk(
+				chunk_id=chunk_id,
+				source_doc=source_doc,
+				section_path=section_path,
+				text=text,
+				embedding=embedding,
 			)
+			new_chunks.append(_with_metadata(chunk, plan.metadata.get(source_doc, DocMetadata())))
 
-		chunks = reused_chunks + new_chunks
+		chunks = plan.reused_chunks + new_chunks
 		chunks.sort(key=lambda chunk: chunk.chunk_id)
 
-		self._save_cache(
+		await asyncio.to_thread(
+			self._save_cache,
 			{
 				"embedding_model": settings.openai_embedding_model,
-				"doc_hashes": current_hashes,
+				"chunker_version": CHUNKER_VERSION,
+				"derived_version": _DERIVED_VERSION,
+				"doc_hashes": plan.doc_hashes,
 				"chunks": chunks,
-			}
+				"variables": plan.variables,
+			},
 		)
 
 		stats = KnowledgeIndexStats(
-			total_docs=len(markdown_files),
+			total_docs=len(plan.doc_hashes),
 			chunk_count=len(chunks),
-			reused_chunks=len(reused_chunks),
+			reused_chunks=len(plan.reused_chunks),
 			embedded_chunks=len(new_chunks),
-			changed_docs=changed_docs,
+			changed_docs=plan.changed_docs,
 			cache_hit=False,
 		)
 		return chunks, stats
@@ -0,0 +1,85 @@
+"""Per-doc metadata (group, form, tags) and the filters retrieval applies to it."""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+
+DOC_GROUP_QUESTIONNAIRE = "questionnaire"
+DOC_GROUP_PROTOCOL = "protocol"
+DOC_GROUP_FAQ = "faq"
+
+_FRONT_MATTER = re.compile(r"\A---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|\Z)", re.DOTALL)
+_FRONT_MATTER_LINE = re.compile(r"^([A-Za-z_][\w-]*)\s*:\s*(.*)$")
+_QUESTIONNAIRE_SUFFIXES = frozenset({".xlsx", ".csv", ".html", ".htm"})
+
+
+@dataclass(frozen=True)
+class DocMetadata:
+	"""Metadata shared by every chunk of one doc."""
+
+	doc_group: str = DOC_GROUP_PROTOCOL
+	form: str = ""
+	tags: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ChunkFilter:
+	"""Restricts a search to chunks matching every non-empty criterion."""
+
+	doc_groups: frozenset[str] = field(default_factory=frozenset)
+	forms: frozenset[str] = field(default_factory=frozenset)
+	tags: frozenset[str] = field(default_factory=frozenset)  # any of these
+	max_section_depth: int | None = None
+
+
+def split_front_matter(content: str) -> tuple[dict[str, str | list[str]], str]:
+	"""Split a leading ``---`` key/value block from markdown; returns (fields, body).
+
+	Supports the flat subset KB docs use: ``key: value`` and ``key: [a, b]``.
+	"""
+
+	match = _FRONT_MATTER.match(content)
+	if not match:
+		return {}, content
+	fields: dict[str, str | list[str]] = {}
+	for line in match.group(1).splitlines():
+		parsed = _FRONT_MATTER_LINE.match(line.strip())
+		if not parsed:
+			continue
+		key, value = parsed.group(1).lower(), parsed.group(2).strip()
+		if value.startswith("[") and value.endswith("]"):
+			fields[key] = [
+				item.strip().strip("'\"") for item in value[1:-1].split(",") if item.strip()
+			]
+		else:
+			fields[key] = value.strip("'\"")
+	return fields, content[match.end() :]
+
+
+def _as_list(value: str | list[str] | None) -> list[str]:
+	if value is None:
+		return []
+	if isinstance(value, list):
+		return value
+	return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def doc_metadata(
+	doc: str, front_matter: dict[str, str | list[str]], has_variables: bool
+) -> DocMetadata:
+	"""Derive a doc's metadata: front matter first, then path and content heuristics."""
+
+	path = PurePosixPath(doc)
+	group = str(front_matter.get("group") or "").strip().lower()
+	if not group:
+		if has_variables or path.suffix.lower() in _QUESTIONNAIRE_SUFFIXES:
+			group = DOC_GROUP_QUESTIONNAIRE
+		elif any("faq" in part.lower() for part in path.parts):
+			group = DOC_GROUP_FAQ
+		else:
+			group = DOC_GROUP_PROTOCOL
+	form = str(front_matter.get("form") or "").strip()
+	if not form and group == DOC_GROUP_QUESTIONNAIRE:
+		form = path.stem
+	tags = tuple(sorted({tag.lower() for tag in _as_list(front_matter.get("tags"))}))
+	return DocMetadata(doc_group=group, form=form, tags=tags)
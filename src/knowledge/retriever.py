@@ -1,23 +1,99 @@
 """Knowledge retriever utilities."""
 
-from src.integrations.openai_client import OpenAIClient, cosine_similarity
+from collections import Counter
+
+import numpy as np
+
+from src.integrations.openai_client import OpenAIClient
 from src.knowledge.indexer import KnowledgeChunk
+from src.knowledge.metadata import ChunkFilter
+from src.knowledge.variables import VariableDictionary
 
 
 class KnowledgeRetriever:
-	"""Retrieves top-k relevant chunks by embedding similarity."""
+	"""Retrieves top-k relevant chunks by embedding similarity.
+
+	Embeddings are held as one row-normalized matrix, with chunk metadata in
+	parallel column arrays, so a filtered search masks rows before scoring.
+	"""
 
-	def __init__(self, chunks: list[KnowledgeChunk], openai_client: OpenAIClient) -> None:
+	def __init__(
+		self,
+		chunks: list[KnowledgeChunk],
+		openai_client: OpenAIClient,
+		variables: VariableDictionary | None = None,
+	) -> None:
+		"""Index ``chunks`` for search, with optional questionnaire variables."""
 		self.chunks = chunks
 		self.openai_client = openai_client
+		# Questionnaire variables from the same index build, for name lookups.
+		self.variables = variables or VariableDictionary()
+
+		lengths = Counter(len(chunk.embedding) for chunk in chunks if chunk.embedding)
+		self.dimensions = lengths.most_common(1)[0][0] if lengths else 0
+		matrix = np.zeros((len(chunks), self.dimensions), dtype=np.float32)
+		for row, chunk in enumerate(chunks):
+			# Vectors of another size (e.g. fallback embeddings) score zero, as before.
+			if len(chunk.embedding) == self.dimensions:
+				matrix[row] = chunk.embedding
+		norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+		self._matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+		self._doc_groups = np.array([chunk.doc_group for chunk in chunks], dtype=object)
+		self._forms = np.array([chunk.form for chunk in chunks], dtype=object)
+		self._section_depths = np.array([chunk.section_depth for chunk in chunks], dtype=np.int32)
+		self._tags = [frozenset(chunk.tags) for chunk in chunks]
+
+	@property
+	def doc_groups(self) -> set[str]:
+		"""Return the doc groups present in the index."""
+		return set(self._doc_groups.tolist())
+
+	@property
+	def forms(self) -> set[str]:
+		"""Return the non-empty form names present in the index."""
+		return {form for form in self._forms.tolist() if form}
+
+	def _mask(self, filters: ChunkFilter) -> np.ndarray:
+		mask = np.ones(len(self.chunks), dtype=bool)
+		if filters.doc_groups:
+			mask &= np.isin(self._doc_groups, list(filters.doc_groups))
+		if filters.forms:
+			mask &= np.isin(self._forms, list(filters.forms))
+		if filters.max_section_depth is not None:
+			mask &= self._section_depths <= filters.max_section_depth
+		if filters.tags:
+			mask &= np.fromiter(
+				(bool(tags & filters.tags) for tags in self._tags),
+				dtype=bool,
+				count=len(self._tags),
+			)
+		return mask
+
+	async def search(
+		self, question: str, top_k: int = 4, filters: ChunkFilter | None = None,
+	) -> list[KnowledgeChunk]:
+		"""Return top-k best matching chunks, optionally limited to ``filters``.
+
+		A filter that matches nothing is ignored rather than returning no context.
+		"""
 
-	async def search(self, question: str, top_k: int = 4) -> list[KnowledgeChunk]:
-		"""Return top-k best matching chunks."""
+		candidates = np.arange(len(self.chunks))
+		if filters is not None:
+			masked = np.flatnonzero(self._mask(filters))
+			if masked.size:
+				candidates = masked
+		if not candidates.size:
+			return []
 
 		query_embedding = await self.openai_client.embed_text_async(question)
-		scored = [
-			(cosine_similarity(query_embedding, chunk.embedding), chunk)
-			for chunk in self.chunks
-		]
-		scored.sort(key=lambda item: item[0], reverse=True)
-		return [chunk for _, chunk in scored[:top_k]]
+		scores: np.ndarray
+		if len(query_embedding) != self.dimensions:
+			scores = np.zeros(candidates.size, dtype=np.float32)
+		else:
+			query = np.asarray(query_embedding, dtype=np.float32)
+			norm = float(np.linalg.norm(query))
+			scores = (
+				self._matrix[candidates] @ (query / norm) if norm else np.zeros(candidates.size)
+			)
+		order = np.argsort(-scores, kind="stable")[:top_k]
+		return [self.chunks[index] for index in candidates[order]]
@@ -0,0 +1,278 @@
+"""Questionnaire variable dictionary with exact, prefix, and fuzzy name lookup."""
+
+import re
+from dataclasses import dataclass, field
+
+_VARIABLE_HEADING = re.compile(r"^#{1,6}\s+Variable:\s*`?([^`\s]+)`?\s*$")
+_HEADING = re.compile(r"^#{1,6}\s+")
+_FIELD = re.compile(r"^\*\*([A-Za-z][A-Za-z ]*):\*\*\s*(.*)$")
+_LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(.*)$")
+_RULE = re.compile(r"^\s*(?:-{3,}|\*{3,}|_{3,})\s*$")
+_IDENTIFIER = re.compile(r"`([^`\s]+)`|([A-Za-z][A-Za-z0-9_]*\*?)")
+
+# Words that may surround a variable name without turning the message into a
+# question the dictionary cannot answer on its own.
+_LOOKUP_WORDS = frozenset(
+	"""
+	a about all an and any are ask asked can check condition conditions constraint constraints
+	define definition describe details do does explain field for give how i in info is
+	it list logic me mean meaning means of on option options please q question relevance
+	relevant rule rules show shown skip tell the this to type validation values var
+	variable variables what whats s when which with
+	""".split()
+)
+
+
+@dataclass
+class QuestionnaireVariable:
+	"""One ``### Variable:`` block from a questionnaire export."""
+
+	name: str
+	source_doc: str
+	section: str = ""
+	question: str = ""
+	options: list[str] = field(default_factory=list)
+	value_type: str = ""
+	logic: str = ""
+	validation: str = ""
+
+
+@dataclass
+class VariableMatch:
+	"""Result of a variable lookup: how it matched and what it matched."""
+
+	kind: str  # exact | prefix | fuzzy
+	query: str
+	variables: list[QuestionnaireVariable]
+
+
+def _strip_code(text: str) -> str:
+	return text.strip().strip("`").strip()
+
+
+def parse_variables(content: str, source_doc: str) -> list[QuestionnaireVariable]:
+	"""Extract every variable block (question, options, logic, validation) from a doc."""
+
+	variables: list[QuestionnaireVariable] = []
+	current: QuestionnaireVariable | None = None
+	section = ""
+	in_options = False
+	for raw in content.splitlines():
+		line = raw.strip()
+		heading = _VARIABLE_HEADING.match(line)
+		if heading:
+			current = QuestionnaireVariable(
+				name=heading.group(1), source_doc=source_doc, section=section
+			)
+			variables.append(current)
+			in_options = False
+			continue
+		if _HEADING.match(line):
+			current = None
+			section = _HEADING.sub("", line).strip()
+			continue
+		if current is None:
+			continue
+		if _RULE.match(line):
+			current = None
+			continue
+
+		field_match = _FIELD.match(line.lstrip("> ").strip())
+		if field_match:
+			label, value = field_match.group(1).lower(), field_match.group(2).strip()
+			in_options = label == "options"
+			if label == "question":
+				current.question = value
+			elif label == "type":
+				current.value_type = value
+			elif label == "logic":
+				current.logic = _strip_code(re.sub(r"^show if\s+", "", value, flags=re.IGNORECASE))
+			elif label in {"validation", "constraint"}:
+				current.validation = _strip_code(value)
+			continue
+
+		item = _LIST_ITEM.match(raw)
+		if in_options and item:
+			current.options.append(item.group(1).replace("**", "").strip())
+		elif line and current.question and not current.options and not in_options:
+			current.question = f"{current.question} {line}"
+	return variables
+
+
+@dataclass
+class _TrieNode:
+	children: dict[str, "_TrieNode"] = field(default_factory=dict)
+	key: str | None = None
+
+
+class VariableTrie:
+	"""Case-insensitive trie over variable names."""
+
+	def __init__(self, names: list[str] | None = None) -> None:
+		"""Build the trie from ``names``."""
+		self.root = _TrieNode()
+		for name in names or []:
+			self.insert(name)
+
+	def insert(self, name: str) -> None:
+		"""Add ``name`` (lowercased) to the trie."""
+		node = self.root
+		for char in name.lower():
+			node = node.children.setdefault(char, _TrieNode())
+		node.key = name.lower()
+
+	def _walk(self, prefix: str) -> _TrieNode | None:
+		node: _TrieNode | None = self.root
+		for char in prefix:
+			node = node.children.get(char) if node is not None else None
+		return node
+
+	def with_prefix(self, prefix: str, limit: int = 25) -> list[str]:
+		"""Return up to ``limit`` keys starting with ``prefix``, shortest first."""
+
+		node = self._walk(prefix.lower())
+		if node is None:
+			return []
+		found: list[str] = []
+		frontier = [node]
+		# Breadth-first so "hh_q1" ranks ahead of "hh_q10".."hh_q19".
+		while frontier and len(found) < limit:
+			next_frontier: list[_TrieNode] = []
+			for current in frontier:
+				if current.key is not None:
+					found.append(current.key)
+				next_frontier.extend(current.children[char] for char in sorted(current.children))
+			frontier = next_frontier
+		return found[:limit]
+
+	def fuzzy(self, word: str, max_distance: int) -> list[tuple[int, str]]:
+		"""Return (edit distance, key) pairs within ``max_distance``, closest first.
+
+		Walks the trie carrying one Levenshtein row per node, pruning any branch
+		whose row minimum already exceeds the budget.
+		"""
+
+		word = word.lower()
+		results: list[tuple[int, str]] = []
+		first_row = list(range(len(word) + 1))
+		stack = [(child, char, first_row) for char, child in self.root.children.items()]
+		while stack:
+			node, char, previous = stack.pop()
+			row = [previous[0] + 1]
+			for column in range(1, len(word) + 1):
+				row.append(
+					min(
+						row[column - 1] + 1,
+						previous[column] + 1,
+						previous[column - 1] + (word[column - 1] != char),
+					)
+				)
+			if node.key is not None and row[-1] <= max_distance:
+				results.append((row[-1], node.key))
+			if min(row) <= max_distance:
+				stack.extend((child, next_char, row) for next_char, child in node.children.items())
+		return sorted(results)
+
+
+class VariableDictionary:
+	"""Variable blocks by name, answering name lookups without embeddings."""
+
+	def __init__(self, variables: list[QuestionnaireVariable] | None = None) -> None:
+		"""Index ``variables`` by lowercased name; the first block per name wins."""
+		self.by_name: dict[str, QuestionnaireVariable] = {}
+		for variable in variables or []:
+			self.by_name.setdefault(variable.name.lower(), variable)
+		self.trie = VariableTrie(list(self.by_name))
+
+	def __len__(self) -> int:
+		"""Return the number of distinct variable names."""
+		return len(self.by_name)
+
+	def get(self, name: str) -> QuestionnaireVariable | None:
+		"""Return the variable with exactly this name (case-insensitive)."""
+		return self.by_name.get(name.lower())
+
+	def lookup(self, query: str, *, prefix_limit: int = 10) -> VariableMatch | None:
+		"""Match a single name: exact, then ``prefix*`` or unique prefix, then fuzzy."""
+
+		wildcard = query.endswith("*")
+		name = query.rstrip("*").lower()
+		if not name:
+			return None
+		if not wildcard and name in self.by_name:
+			return VariableMatch("exact", query, [self.by_name[name]])
+
+		keys = self.trie.with_prefix(name, limit=prefix_limit + 1)
+		if keys and (wildcard or len(keys) == 1):
+			matches = [self.by_name[key] for key in keys[:prefix_limit]]
+			return VariableMatch("prefix", query, matches)
+		if wildcard or len(name) < 4:
+			return None
+
+		budget = 1 if len(name) <= 6 else 2
+		candidates = self.trie.fuzzy(name, budget)
+		if not candidates:
+			return None
+		best = candidates[0][0]
+		closest = [key for distance, key in candidates if distance == best]
+		if len(closest) != 1:
+			return None
+		return VariableMatch("fuzzy", query, [self.by_name[closest[0]]])
+
+	def match_question(self, question: str) -> VariableMatch | None:
+		"""Answer a message that is only a variable-name lookup, else return None.
+
+		Every word other than the one variable-like token must be a generic
+		lookup word ("what is the relevance of ..."), so real questions that
+		merely mention a variable still go through retrieval.
+		"""
+
+		if not self.by_name:
+			return None
+		candidates: list[tuple[str, bool]] = []
+		for quoted, bare in _IDENTIFIER.findall(question):
+			if quoted or bare.lower() not in _LOOKUP_WORDS:
+				candidates.append((quoted or bare, bool(quoted)))
+		if len(candidates) != 1:
+			return None
+		token, quoted = candidates[0]
+		# Plain words ("consent") stay with retrieval unless quoted as code.
+		looks_like_code = any(char.isdigit() or char == "_" for char in token)
+		if not (quoted or token.endswith("*") or looks_like_code):
+			return None
+		return self.lookup(token)
+
+
+def render_variable(variable: QuestionnaireVariable) -> str:
+	"""Format one variable as a Discord answer."""
+
+	lines = [f"**`{variable.name}`**" + (f" — {variable.question}" if variable.question else "")]
+	if variable.section:
+		lines.append(f"**Section:** {variable.section}")
+	if variable.options:
+		lines.append("**Options:**")
+		lines.extend(f"- {option}" for option in variable.options)
+	elif variable.value_type:
+		lines.append(f"**Type:** {variable.value_type}")
+	lines.append(
+		f"**Relevance:** `{variable.logic}`" if variable.logic else "**Relevance:** always shown"
+	)
+	if variable.validation:
+		lines.append(f"**Validation:** `{variable.validation}`")
+	return "\n".join(lines)
+
+
+def render_match(match: VariableMatch) -> str:
+	"""Format a lookup result: one variable card, or a list of prefix matches."""
+
+	if match.kind == "prefix" and len(match.variables) > 1:
+		lines = [f"Variables starting with `{match.query.rstrip('*')}`:"]
+		lines.extend(
+			f"- `{variable.name}`" + (f" — {variable.question}" if variable.question else "")
+			for variable in match.variables
+		)
+		return "\n".join(lines)
+	card = render_variable(match.variables[0])
+	if match.kind == "exact":
+		return card
+	return f"No variable named `{match.query}`; closest match:\n\n{card}"
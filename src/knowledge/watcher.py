@@ -0,0 +1,194 @@
+"""Knowledge base watcher: inotify on Linux, cheap polling everywhere else."""
+
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from src.config import settings
+from src.knowledge.extractors import is_supported
+from src.utils.logger import get_logger
+
+log = get_logger("knowledge_watcher")
+
+# Called with changed doc paths (relative to the KB root), or None for "rescan everything".
+ChangeHandler = Callable[[set[str] | None], Awaitable[None]]
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = (
+	_IN_CLOSE_WRITE
+	| _IN_MOVED_FROM
+	| _IN_MOVED_TO
+	| _IN_CREATE
+	| _IN_DELETE
+	| _IN_DELETE_SELF
+	| _IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+	"""Minimal recursive inotify binding over libc via ctypes."""
+
+	def __init__(self) -> None:
+		libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+		self._add_watch = libc.inotify_add_watch
+		self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+		self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+		if self.fd < 0:
+			raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+		self.dirs: dict[int, Path] = {}
+
+	def watch_tree(self, root: Path) -> None:
+		for directory in [root, *(path for path in root.rglob("*") if path.is_dir())]:
+			wd = self._add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+			if wd >= 0:
+				self.dirs[wd] = directory
+
+	def read_events(self) -> list[tuple[Path, str, int]]:
+		"""Return (directory, name, mask) for every queued event."""
+		try:
+			data = os.read(self.fd, 64 * 1024)
+		except BlockingIOError:
+			return []
+		events: list[tuple[Path, str, int]] = []
+		offset = 0
+		while offset + _EVENT_HEADER.size <= len(data):
+			wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+			start = offset + _EVENT_HEADER.size
+			name = os.fsdecode(data[start : start + length].rstrip(b"\0"))
+			offset = start + length
+			directory = self.dirs.get(wd)
+			if directory is not None or mask & _IN_Q_OVERFLOW:
+				events.append((directory or Path(), name, mask))
+		return events
+
+	def close(self) -> None:
+		os.close(self.fd)
+
+
+class KnowledgeBaseWatcher:
+	"""Feeds changed KB docs to a handler, debounced.
+
+	With inotify, only the touched source docs (any extractable type) are
+	reported. Directory moves, queue overflows, and the polling fallback report
+	``None`` so the handler runs its stat-cached full scan instead.
+	"""
+
+	def __init__(
+		self,
+		base_path: Path,
+		handler: ChangeHandler,
+		*,
+		debounce_seconds: float | None = None,
+		poll_seconds: float | None = None,
+		use_inotify: bool | None = None,
+	) -> None:
+		"""Initialize with the KB root, change handler, and timing."""
+		self.base_path = base_path
+		self.handler = handler
+		self.debounce_seconds = (
+			debounce_seconds
+			if debounce_seconds is not None
+			else settings.knowledge_watch_debounce_seconds
+		)
+		self.poll_seconds = (
+			poll_seconds if poll_seconds is not None else settings.knowledge_poll_interval_seconds
+		)
+		self.use_inotify = sys.platform.startswith("linux") if use_inotify is None else use_inotify
+		self.backend = ""
+		self._inotify: _Inotify | None = None
+		self._pending: set[str] = set()
+		self._full_scan = False
+		self._timer: asyncio.TimerHandle | None = None
+		self._poll_task: asyncio.Task[None] | None = None
+		self._flush_lock = asyncio.Lock()
+		self._flushes: set[asyncio.Task[None]] = set()
+
+	def start(self) -> None:
+		"""Start watching; falls back to polling if inotify is unavailable."""
+
+		if self.use_inotify:
+			try:
+				self._inotify = _Inotify()
+				self._inotify.watch_tree(self.base_path)
+				asyncio.get_running_loop().add_reader(self._inotify.fd, self._on_readable)
+				self.backend = "inotify"
+			except (OSError, AttributeError) as error:
+				log.warning("knowledge.watch.inotify_unavailable", error=str(error))
+				self._inotify = None
+		if self._inotify is None:
+			self.backend = "polling"
+			self._poll_task = asyncio.create_task(self._poll(), name="kb-poll")
+		log.info("knowledge.watch.started", backend=self.backend, path=str(self.base_path))
+
+	async def stop(self) -> None:
+		"""Stop watching and cancel pending work."""
+
+		if self._timer is not None:
+			self._timer.cancel()
+		if self._inotify is not None:
+			asyncio.get_running_loop().remove_reader(self._inotify.fd)
+			self._inotify.close()
+			self._inotify = None
+		tasks = [task for task in (self._poll_task, *self._flushes) if task is not None]
+		for task in tasks:
+			task.cancel()
+		await asyncio.gather(*tasks, return_exceptions=True)
+
+	def _on_readable(self) -> None:
+		assert self._inotify is not None
+		for directory, name, mask in self._inotify.read_events():
+			if mask & _IN_Q_OVERFLOW or mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+				self._full_scan = True
+			elif mask & _IN_ISDIR:
+				if mask & (_IN_CREATE | _IN_MOVED_TO):
+					self._inotify.watch_tree(directory / name)
+				self._full_scan = True
+			elif is_supported(directory / name):
+				path = directory / name
+				self._pending.add(path.relative_to(self.base_path).as_posix())
+		if self._pending or self._full_scan:
+			self._arm()
+
+	def _arm(self) -> None:
+		"""Restart the debounce timer so a burst of saves triggers one update."""
+
+		if self._timer is not None:
+			self._timer.cancel()
+		loop = asyncio.get_running_loop()
+		self._timer = loop.call_later(self.debounce_seconds, self._spawn_flush)
+
+	def _spawn_flush(self) -> None:
+		task = asyncio.create_task(self._flush())
+		self._flushes.add(task)
+		task.add_done_callback(self._flushes.discard)
+
+	async def _flush(self) -> None:
+		async with self._flush_lock:
+			docs, full = self._pending, self._full_scan
+			self._pending, self._full_scan = set(), False
+			if not docs and not full:
+				return
+			try:
+				await self.handler(None if full else docs)
+			except Exception as error:
+				log.warning("knowledge.watch.handler_failed", error=str(error))
+
+	async def _poll(self) -> None:
+		while True:
+			await asyncio.sleep(self.poll_seconds)
+			self._full_scan = True
+			await self._flush()
@@ -0,0 +1,143 @@
+"""XLSForm (survey/choices sheets) to questionnaire markdown, plus a stdlib XLSX reader."""
+
+import io
+import re
+import zipfile
+from xml.etree import ElementTree
+
+_NS = {
+	"main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+	"rel": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+	"pkg": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+_CELL_REF = re.compile(r"([A-Z]+)")
+
+# Metadata fields that never appear on screen.
+_SKIPPED_TYPES = frozenset(
+	"start end today deviceid subscriberid simserial phonenumber username caseid audit".split()
+)
+
+
+def is_xlsform_header(header: list[str]) -> bool:
+	"""Return True for a survey sheet header (has ``type`` and ``name`` columns)."""
+	columns = {cell.strip().lower() for cell in header}
+	return {"type", "name"} <= columns
+
+
+def _column(reference: str) -> int:
+	letters = _CELL_REF.match(reference)
+	index = 0
+	for char in letters.group(1) if letters else "A":
+		index = index * 26 + ord(char) - ord("A") + 1
+	return index - 1
+
+
+def xlsx_rows(data: bytes) -> dict[str, list[list[str]]]:
+	"""Read every sheet of an .xlsx workbook as rows of strings, keyed by sheet name."""
+
+	with zipfile.ZipFile(io.BytesIO(data)) as archive:
+		names = set(archive.namelist())
+		shared: list[str] = []
+		if "xl/sharedStrings.xml" in names:
+			root = ElementTree.fromstring(archive.read("xl/sharedStrings.xml"))
+			for item in root.iterfind("main:si", _NS):
+				shared.append("".join(node.text or "" for node in item.iter(f"{{{_NS['main']}}}t")))
+
+		targets: dict[str, str] = {}
+		if "xl/_rels/workbook.xml.rels" in names:
+			rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+			for rel in rels.iterfind("pkg:Relationship", _NS):
+				target = rel.get("Target", "").lstrip("/")
+				targets[rel.get("Id", "")] = target if target.startswith("xl/") else f"xl/{target}"
+
+		sheets: dict[str, list[list[str]]] = {}
+		workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+		for sheet in workbook.iterfind("main:sheets/main:sheet", _NS):
+			target = targets.get(sheet.get(f"{{{_NS['rel']}}}id", ""), "")
+			if target not in names:
+				continue
+			rows: list[list[str]] = []
+			for _, element in ElementTree.iterparse(io.BytesIO(archive.read(target))):
+				if element.tag != f"{{{_NS['main']}}}row":
+					continue
+				row: list[str] = []
+				for cell in element.iterfind("main:c", _NS):
+					kind = cell.get("t", "")
+					if kind == "inlineStr":
+						texts = cell.iter(f"{{{_NS['main']}}}t")
+						value = "".join(node.text or "" for node in texts)
+					else:
+						raw = cell.findtext("main:v", default="", namespaces=_NS)
+						value = shared[int(raw)] if kind == "s" and raw else raw
+					position = _column(cell.get("r", ""))
+					row.extend([""] * (position - len(row)))
+					row.append(value)
+				rows.append(row)
+				element.clear()
+			sheets[sheet.get("name", "").strip().lower()] = rows
+	return sheets
+
+
+def _records(rows: list[list[str]]) -> list[dict[str, str]]:
+	if not rows:
+		return []
+	header = [cell.strip().lower() for cell in rows[0]]
+	return [
+		{
+			column: (row[index] if index < len(row) else "").strip()
+			for index, column in enumerate(header)
+		}
+		for row in rows[1:]
+	]
+
+
+def _label(record: dict[str, str]) -> str:
+	"""Return the default label, else the first language-specific one."""
+	if record.get("label"):
+		return record["label"]
+	for column, value in record.items():
+		if column.startswith("label") and value:
+			return value
+	return ""
+
+
+def xlsform_to_markdown(survey: list[list[str]], choices: list[list[str]], *, title: str) -> str:
+	"""Render survey rows as ``### Variable:`` blocks under group headings."""
+
+	options: dict[str, list[str]] = {}
+	for record in _records(choices):
+		if record.get("list_name") and record.get("name"):
+			options.setdefault(record["list_name"], []).append(
+				f"- **{record['name']}**: {_label(record)}"
+			)
+
+	lines = [f"# {title}", ""]
+	for record in _records(survey):
+		kind = record.get("type", "")
+		name = record.get("name", "")
+		parts = kind.split()
+		base = parts[0].lower() if parts else ""
+		lowered = kind.lower()
+		opens_group = lowered.startswith(("begin group", "begin repeat"))
+		if base in {"begin_group", "begin_repeat"} or opens_group:
+			lines.extend([f"## {_label(record) or name}", ""])
+			continue
+		if not name or base in _SKIPPED_TYPES or lowered.startswith(("end group", "end repeat")):
+			continue
+
+		lines.append(f"### Variable: `{name}`")
+		lines.append(f"**Question:** {_label(record)}")
+		is_select = base in {"select_one", "select_multiple"}
+		list_name = parts[1] if is_select and len(parts) > 1 else ""
+		if list_name and options.get(list_name):
+			lines.extend(["", "**Options:**", *options[list_name]])
+		else:
+			detail = f" ({record['calculation']})" if record.get("calculation") else ""
+			lines.extend(["", f"**Type:** {kind}{detail}"])
+		relevance = record.get("relevance") or record.get("relevant")
+		if relevance:
+			lines.extend(["", f"> **Logic:** Show if `{relevance}`"])
+		if record.get("constraint"):
+			lines.extend(["", f"> **Validation:** `{record['constraint']}`"])
+		lines.extend(["", "---", ""])
+	return "\n".join(lines)
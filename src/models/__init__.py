@@ -1,6 +1,8 @@
 """Shared model exports."""
 
 from src.models.announcement import AnnouncementRecord
+from src.models.background_job import BackgroundJobRecord
+from src.models.background_job import JobStatus
 from src.models.case import CaseRecord
 from src.models.escalation import EscalationRecord
 from src.models.escalation import EscalationStatus
@@ -15,5 +17,7 @@ __all__ = [
 	"InteractionRecord",
 	"EscalationRecord",
 	"AnnouncementRecord",
+	"BackgroundJobRecord",
+	"JobStatus",
 	"FormVersionRecord",
 ]
@@ -0,0 +1,38 @@
+"""Background job domain models."""
+
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class JobStatus(str, Enum):
+	"""Lifecycle states for background automation jobs."""
+
+	QUEUED = "queued"
+	RUNNING = "running"
+	SUCCEEDED = "succeeded"
+	FAILED = "failed"
+	CANCELLED = "cancelled"
+
+
+class BackgroundJobRecord(BaseModel):
+	"""A long-running automation job tracked in the database."""
+
+	job_id: str
+	name: str
+	requester: str
+	status: JobStatus = JobStatus.QUEUED
+	progress: list[str] = Field(default_factory=list)
+	summary: str | None = None
+	details: list[str] = Field(default_factory=list)
+	channel_id: int | None = None
+	message_id: int | None = None
+	created_at: datetime | None = None
+	started_at: datetime | None = None
+	finished_at: datetime | None = None
+
+	@property
+	def finished(self) -> bool:
+		"""Return True once the job can no longer change state."""
+		return self.status in {JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED}
@@ -1,14 +1,24 @@
 """Announcement generation and logging logic."""
 
+from datetime import datetime, timezone
+
 from src.db.repositories.announcement_repo import AnnouncementRepository
+from src.db.repositories.form_version_repo import FormVersionRepository
 from src.models.announcement import AnnouncementRecord
+from src.models.form_version import FormVersionRecord
 
 
 class AnnouncementService:
 	"""Creates and tracks announcements."""
 
-	def __init__(self, repository: AnnouncementRepository) -> None:
+	def __init__(
+		self,
+		repository: AnnouncementRepository,
+		form_versions: FormVersionRepository | None = None,
+	) -> None:
+		"""Initialize with announcement and form-version storage."""
 		self.repository = repository
+		self.form_versions = form_versions or FormVersionRepository()
 		self.templates: dict[str, str] = {
 			"morning_briefing": "Good morning team. Today's target is {target} completions.",
 			"evening_summary": "Evening summary: {summary}",
@@ -29,3 +39,34 @@ class AnnouncementService:
 		await self.repository.create(
 			AnnouncementRecord(type=type_name, channel=channel, content=content)
 		)
+
+	async def pending_form_updates(self, versions: dict[str, str]) -> list[FormVersionRecord]:
+		"""Record the versions just read; return those not announced yet.
+
+		A form seen for the first time is stored as the baseline without an
+		announcement. A changed version (or one whose announcement never went
+		out) is returned until ``mark_form_update_announced`` is called.
+		"""
+
+		known = await self.form_versions.all()
+		now = datetime.now(timezone.utc)
+		pending: list[FormVersionRecord] = []
+		for form_id, version in versions.items():
+			previous = known.get(form_id)
+			if previous is None:
+				baseline = FormVersionRecord(
+					form_id=form_id, version=version, detected_at=now, announced=True
+				)
+				await self.form_versions.save(baseline)
+			elif previous.version != version:
+				record = FormVersionRecord(form_id=form_id, version=version, detected_at=now)
+				await self.form_versions.save(record)
+				pending.append(record)
+			elif not previous.announced:
+				pending.append(previous)
+		return pending
+
+	async def mark_form_update_announced(self, record: FormVersionRecord) -> None:
+		"""Persist that the update in ``record`` has been posted."""
+
+		await self.form_versions.save(record.model_copy(update={"announced": True}))
@@ -0,0 +1,71 @@
+"""In-memory indexes over the assignments sheet."""
+
+from bisect import bisect_left
+from collections.abc import Iterable
+
+
+def _key(value: object) -> str:
+	return str(value if value is not None else "").strip().lower()
+
+
+class AssignmentDirectory:
+	"""Case-insensitive lookups by case ID, team and FO over one sheet read.
+
+	Built once per assignments refresh. Exact lookups are dict hits; case ID
+	prefixes are answered from a sorted key list with bisect. Where the sheet
+	repeats a case or FO, the first row wins, as the linear scans did.
+	"""
+
+	def __init__(self, rows: list[dict[str, str]]) -> None:
+		"""Index ``rows`` in sheet order."""
+
+		self.rows = rows
+		self._by_case: dict[str, dict[str, str]] = {}
+		self._by_team: dict[str, list[dict[str, str]]] = {}
+		self._team_by_fo: dict[str, str] = {}
+		for row in rows:
+			case_key = _key(row.get("case_id"))
+			if case_key:
+				self._by_case.setdefault(case_key, row)
+			self._by_team.setdefault(_key(row.get("team")), []).append(row)
+			fo_key = _key(row.get("fo"))
+			if fo_key and "team" in row:
+				self._team_by_fo.setdefault(fo_key, row["team"])
+		self._case_keys = sorted(self._by_case)
+
+	def __len__(self) -> int:
+		"""Return the number of indexed rows."""
+		return len(self.rows)
+
+	def case(self, case_id: str) -> dict[str, str] | None:
+		"""Return the row for ``case_id``, if assigned."""
+
+		return self._by_case.get(_key(case_id))
+
+	def cases(self, case_ids: Iterable[str]) -> dict[str, dict[str, str] | None]:
+		"""Return the row (or None) for each of ``case_ids``, keyed as given."""
+
+		return {case_id: self.case(case_id) for case_id in case_ids}
+
+	def cases_with_prefix(self, prefix: str, limit: int = 10) -> list[dict[str, str]]:
+		"""Return up to ``limit`` rows whose case ID starts with ``prefix``, in ID order."""
+
+		prefix = _key(prefix)
+		if not prefix:
+			return []
+		matches: list[dict[str, str]] = []
+		for case_key in self._case_keys[bisect_left(self._case_keys, prefix) :]:
+			if not case_key.startswith(prefix) or len(matches) >= limit:
+				break
+			matches.append(self._by_case[case_key])
+		return matches
+
+	def team(self, team: str) -> list[dict[str, str]]:
+		"""Return the rows assigned to ``team``, in sheet order."""
+
+		return list(self._by_team.get(_key(team), []))
+
+	def team_for_fo(self, fo_name: str) -> str | None:
+		"""Return the team ``fo_name`` is assigned to."""
+
+		return self._team_by_fo.get(_key(fo_name))
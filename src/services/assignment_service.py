@@ -1,6 +1,9 @@
 """Assignment-related business logic."""
 
-from src.integrations.google_sheets import GoogleSheetsClient
+from collections.abc import Iterable
+
+from src.integrations.google_sheets import SOURCE_ASSIGNMENTS, GoogleSheetsClient
+from src.services.assignment_directory import AssignmentDirectory
 
 
 class AssignmentService:
@@ -8,27 +11,43 @@ class AssignmentService:
 
 	def __init__(self, sheets_client: GoogleSheetsClient) -> None:
 		self.sheets_client = sheets_client
+		self._directory = AssignmentDirectory([])
+
+	def staleness_note(self) -> str:
+		"""Return a reply footer when assignments came from an out-of-date copy."""
+
+		return self.sheets_client.staleness_note(SOURCE_ASSIGNMENTS)
+
+	async def directory(self) -> AssignmentDirectory:
+		"""Return the index over the current assignments, rebuilt only on refresh."""
+
+		rows = await self.sheets_client.read_assignments()
+		# The sheet cache hands back the same list until a refresh replaces it.
+		if rows is not self._directory.rows:
+			self._directory = AssignmentDirectory(rows)
+		return self._directory
 
 	async def team_assignments(self, team: str) -> list[dict[str, str]]:
 		"""Return assignment records for a team."""
 
-		rows = await self.sheets_client.read_assignments()
-		return [row for row in rows if row.get("team", "").lower() == team.lower()]
+		return (await self.directory()).team(team)
 
 	async def where_is_case(self, case_id: str) -> dict[str, str] | None:
 		"""Return assignment row for case, if available."""
 
-		rows = await self.sheets_client.read_assignments()
-		for row in rows:
-			if row.get("case_id", "").lower() == case_id.lower():
-				return row
-		return None
+		return (await self.directory()).case(case_id)
+
+	async def where_are_cases(self, case_ids: Iterable[str]) -> dict[str, dict[str, str] | None]:
+		"""Return the assignment row (or None) for each case ID."""
+
+		return (await self.directory()).cases(case_ids)
+
+	async def cases_with_prefix(self, prefix: str, limit: int = 10) -> list[dict[str, str]]:
+		"""Return assignment rows whose case ID starts with ``prefix``."""
+
+		return (await self.directory()).cases_with_prefix(prefix, limit)
 
 	async def team_for_fo(self, fo_name: str) -> str | None:
 		"""Return assigned team for given FO."""
 
-		rows = await self.sheets_client.read_assignments()
-		for row in rows:
-			if row.get("fo", "").lower() == fo_name.lower():
-				return row.get("team")
-		return None
+		return (await self.directory()).team_for_fo(fo_name)
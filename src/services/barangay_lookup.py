@@ -0,0 +1,138 @@
+"""Case-ID prefix trie resolving cases to barangay, municipality and province."""
+
+import json
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from src.utils.logger import get_logger
+
+log = get_logger("barangay_lookup")
+
+
+@dataclass(frozen=True)
+class Location:
+	"""PSGC-style place names for a case."""
+
+	barangay: str
+	municipality: str
+	province: str
+
+
+class _Node:
+	__slots__ = ("children", "location")
+
+	def __init__(self) -> None:
+		self.children: dict[str, _Node] = {}
+		self.location: Location | None = None
+
+
+def _normalize(case_id: str) -> str:
+	return case_id.strip().upper()
+
+
+class BarangayLookup:
+	"""Longest-prefix match from case IDs to locations.
+
+	Case IDs embed the barangay code (``H030832011`` belongs to ``H030832``).
+	A longer entry, down to a full case ID, overrides a shorter one, so the
+	odd case filed under a neighbouring barangay can be pinned individually.
+	"""
+
+	def __init__(self, mapping: dict[str, Location] | None = None) -> None:
+		"""Build the trie from ``mapping`` of case-ID prefix to location."""
+
+		self._root = _Node()
+		self._size = 0
+		for prefix, location in (mapping or {}).items():
+			self.insert(prefix, location)
+
+	def __len__(self) -> int:
+		"""Return the number of prefixes with a location."""
+		return self._size
+
+	def insert(self, prefix: str, location: Location) -> None:
+		"""Map every case ID starting with ``prefix`` to ``location``."""
+
+		node = self._root
+		for char in _normalize(prefix):
+			node = node.children.setdefault(char, _Node())
+		if node.location is None:
+			self._size += 1
+		node.location = location
+
+	def match(self, case_id: str) -> Location | None:
+		"""Return the location of the longest prefix of ``case_id``, if any."""
+
+		node = self._root
+		found = node.location
+		for char in _normalize(case_id):
+			child = node.children.get(char)
+			if child is None:
+				break
+			node = child
+			if node.location is not None:
+				found = node.location
+		return found
+
+	@classmethod
+	def load(cls, path: Path) -> "BarangayLookup":
+		"""Read a lookup written by ``scripts/export_brgy_lookup.py``; empty if missing."""
+
+		if not path.exists():
+			return cls()
+		raw = json.loads(path.read_text(encoding="utf-8"))
+		return cls(
+			{
+				prefix: Location(
+					barangay=str(entry.get("barangay", "")),
+					municipality=str(entry.get("municipality", "")),
+					province=str(entry.get("province", "")),
+				)
+				for prefix, entry in raw.items()
+			}
+		)
+
+
+def build_location_mapping(
+	rows: Iterable[dict[str, str]],
+	prefix_length: int = 7,
+) -> dict[str, dict[str, str]]:
+	"""Derive the prefix lookup from cases dataset rows.
+
+	Each barangay prefix (the ``brgy_prefix`` column, else the first
+	``prefix_length`` characters of the case ID) maps to the location most of
+	its cases carry. Cases that disagree with their prefix get an entry of
+	their own, which longest-prefix matching then prefers.
+	"""
+
+	cases: dict[str, list[tuple[str, Location]]] = defaultdict(list)
+	for row in rows:
+		case_id = _normalize(str(row.get("caseid") or row.get("id") or ""))
+		location = Location(
+			barangay=str(row.get("barangay", "")).strip(),
+			municipality=str(row.get("municipality", "")).strip(),
+			province=str(row.get("province", "")).strip(),
+		)
+		if not case_id or not any(asdict(location).values()):
+			continue
+		prefix = _normalize(str(row.get("brgy_prefix", "")))
+		if not prefix or not case_id.startswith(prefix):
+			prefix = case_id[:prefix_length]
+		cases[prefix].append((case_id, location))
+
+	mapping: dict[str, dict[str, str]] = {}
+	for prefix in sorted(cases):
+		counts = Counter(location for _, location in cases[prefix])
+		majority = counts.most_common(1)[0][0]
+		mapping[prefix] = asdict(majority)
+		exceptions = {
+			case_id: asdict(location)
+			for case_id, location in cases[prefix]
+			if location != majority and case_id != prefix
+		}
+		if exceptions:
+			log.warning("barangay_lookup.prefix_disagreement", prefix=prefix, cases=len(exceptions))
+			mapping.update(exceptions)
+	return mapping
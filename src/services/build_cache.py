@@ -0,0 +1,119 @@
+"""Input fingerprints for Stata DMS runs, so unchanged work can be skipped."""
+
+import asyncio
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from src.config import settings
+from src.utils.logger import get_logger
+
+log = get_logger("build_cache")
+
+FINGERPRINT_MODES = {"content", "stat"}
+
+
+@dataclass
+class CacheCheck:
+	"""Fingerprint for a step plus whether it matches the last successful run."""
+
+	step: str
+	fingerprint: str
+	up_to_date: bool
+	recorded_at: str = ""
+
+
+class DmsBuildCache:
+	"""Records fingerprints of successful DMS runs, make-style.
+
+	A step's fingerprint covers the master do-file and every ``.do`` file next to
+	it (master files usually ``do`` their siblings), plus each input CSV by
+	content hash or by size and mtime.
+	"""
+
+	def __init__(self, path: Path | None = None, mode: str | None = None) -> None:
+		"""Initialize with the fingerprint store and input hashing mode."""
+		self.path = path or Path(settings.dms_fingerprints_path)
+		self.mode = (mode or settings.dms_fingerprint_mode).strip().lower()
+		if self.mode not in FINGERPRINT_MODES:
+			raise ValueError(f"Unknown DMS fingerprint mode: {self.mode}")
+		self._lock = threading.Lock()
+
+	@staticmethod
+	def _hash_file(path: Path) -> str:
+		hasher = hashlib.sha256()
+		with path.open("rb") as handle:
+			for block in iter(lambda: handle.read(1024 * 1024), b""):
+				hasher.update(block)
+		return hasher.hexdigest()
+
+	def _input_signature(self, path: Path) -> str:
+		if not path.exists():
+			return "missing"
+		if self.mode == "stat":
+			stat = path.stat()
+			return f"{stat.st_size}:{stat.st_mtime_ns}"
+		return self._hash_file(path)
+
+	def fingerprint(self, do_file: Path, inputs: list[Path]) -> str:
+		"""Compute the combined fingerprint for a do-file and its input CSVs."""
+
+		sources = sorted(do_file.parent.rglob("*.do")) if do_file.parent.exists() else []
+		if do_file not in sources:
+			sources.append(do_file)
+		payload = {
+			"mode": self.mode,
+			"do_files": {
+				path.as_posix(): self._hash_file(path) if path.exists() else "missing"
+				for path in sources
+			},
+			"inputs": {path.as_posix(): self._input_signature(path) for path in inputs},
+		}
+		encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+		return hashlib.sha256(encoded).hexdigest()
+
+	def _load(self) -> dict[str, dict[str, str]]:
+		if not self.path.exists():
+			return {}
+		try:
+			data = json.loads(self.path.read_text(encoding="utf-8"))
+		except (OSError, json.JSONDecodeError):
+			return {}
+		return data if isinstance(data, dict) else {}
+
+	def _check(self, step: str, do_file: Path, inputs: list[Path]) -> CacheCheck:
+		fingerprint = self.fingerprint(do_file, inputs)
+		entry = self._load().get(step, {})
+		return CacheCheck(
+			step=step,
+			fingerprint=fingerprint,
+			up_to_date=entry.get("fingerprint") == fingerprint,
+			recorded_at=str(entry.get("recorded_at", "")),
+		)
+
+	async def check(self, step: str, do_file: Path, inputs: list[Path]) -> CacheCheck:
+		"""Fingerprint a step's inputs and compare with its last successful run."""
+
+		return await asyncio.to_thread(self._check, step, do_file, inputs)
+
+	def _record(self, check: CacheCheck) -> None:
+		# Parallel DMS steps record concurrently; serialize the read-modify-write.
+		with self._lock:
+			data = self._load()
+			data[check.step] = {
+				"fingerprint": check.fingerprint,
+				"recorded_at": datetime.now(UTC).isoformat(),
+			}
+			self.path.parent.mkdir(parents=True, exist_ok=True)
+			temp_path = self.path.with_suffix(".tmp")
+			temp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+			temp_path.replace(self.path)
+
+	async def record(self, check: CacheCheck) -> None:
+		"""Store the fingerprint of a successful run (computed before it started)."""
+
+		await asyncio.to_thread(self._record, check)
+		log.info("build_cache.recorded", step=check.step)
@@ -0,0 +1,55 @@
+"""Sorted in-memory index of known case IDs for prefix completion."""
+
+from bisect import bisect_left
+from collections.abc import Iterable
+
+
+class CaseIdIndex:
+	"""Case-insensitive prefix lookups over case IDs from the cases export.
+
+	Keys are kept in one sorted array, so a completion is a bisect plus a short
+	slice and stays well inside Discord's autocomplete deadline at tens of
+	thousands of cases. ``replace`` swaps both arrays in one assignment, so
+	readers never see a half-built index.
+	"""
+
+	def __init__(self, case_ids: Iterable[str] = ()) -> None:
+		"""Build the index from ``case_ids``."""
+
+		self._entries: tuple[list[str], list[str]] = ([], [])
+		self.replace(case_ids)
+
+	def __len__(self) -> int:
+		"""Return the number of distinct case IDs indexed."""
+		return len(self._entries[0])
+
+	def replace(self, case_ids: Iterable[str]) -> None:
+		"""Rebuild from ``case_ids``, dropping blanks and case-insensitive duplicates."""
+
+		by_key: dict[str, str] = {}
+		for case_id in case_ids:
+			cleaned = str(case_id).strip()
+			if cleaned:
+				by_key.setdefault(cleaned.lower(), cleaned)
+		keys = sorted(by_key)
+		self._entries = (keys, [by_key[key] for key in keys])
+
+	def complete(self, prefix: str, limit: int = 25) -> list[str]:
+		"""Return up to ``limit`` case IDs starting with ``prefix``, in sorted order."""
+
+		keys, case_ids = self._entries
+		prefix = prefix.strip().lower()
+		start = bisect_left(keys, prefix)
+		matches = []
+		for position in range(start, min(start + limit, len(keys))):
+			if not keys[position].startswith(prefix):
+				break
+			matches.append(case_ids[position])
+		return matches
+
+	def __contains__(self, case_id: object) -> bool:
+		"""Return True if ``case_id`` is known, ignoring case and surrounding spaces."""
+		keys, _ = self._entries
+		key = str(case_id).strip().lower()
+		position = bisect_left(keys, key)
+		return position < len(keys) and keys[position] == key
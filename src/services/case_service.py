@@ -1,5 +1,7 @@
 """Case management business logic."""
 
+import asyncio
+import csv
 import re
 from datetime import datetime, timezone
 from pathlib import Path
@@ -10,6 +12,8 @@ from src.config import settings
 from src.db.engine import engine
 from src.integrations.surveycto import SurveyCTOClient
 from src.models.case import CaseRecord
+from src.services.barangay_lookup import BarangayLookup
+from src.services.case_index import CaseIdIndex
 from src.services.escalation_service import EscalationService
 from src.utils.logger import get_logger
 
@@ -32,6 +36,10 @@ def _wants_status_change(text: str) -> bool:
 	return any(keyword in lower for keyword in keywords)
 
 
+def _row_case_id(row: dict[str, str]) -> str:
+	return str(row.get("caseid", row.get("id", ""))).strip()
+
+
 class CaseService:
 	"""Service layer for case operations."""
 
@@ -42,11 +50,70 @@ class CaseService:
 	) -> None:
 		self.survey_client = survey_client
 		self.escalation_service = escalation_service
+		self.case_ids = CaseIdIndex()
+		self.locations = BarangayLookup()
 
-	async def lookup_case(self, case_id: str) -> CaseRecord:
-		"""Return case record for the given case ID."""
+	def complete_case_ids(self, prefix: str, limit: int = 25) -> list[str]:
+		"""Return known case IDs starting with ``prefix`` (never hits SurveyCTO)."""
+
+		return self.case_ids.complete(prefix, limit)
+
+	async def load_case_index(self) -> int:
+		"""Seed the case ID index from the last cases export on disk."""
+
+		path = Path(settings.surveycto_cases_csv_path)
+		if not path.exists():
+			return 0
+
+		def _read() -> list[str]:
+			with path.open(encoding="utf-8-sig", errors="ignore", newline="") as handle:
+				return [_row_case_id(row) for row in csv.DictReader(handle)]
 
-		return await self.survey_client.get_case(case_id)
+		self.case_ids.replace(await asyncio.to_thread(_read))
+		log.info("case_index.loaded", cases=len(self.case_ids), path=str(path))
+		return len(self.case_ids)
+
+	async def refresh_case_index(self) -> None:
+		"""Re-download the cases export and rebuild the case ID index."""
+
+		try:
+			await self._fetch_cases_rows()
+		except Exception as error:
+			log.warning("case_index.refresh_failed", error=str(error))
+			return
+		log.info("case_index.refreshed", cases=len(self.case_ids))
+
+	async def _fetch_cases_rows(self) -> list[dict[str, str]]:
+		rows = await self.survey_client.fetch_cases_rows_with_fallback(
+			settings.surveycto_cases_source_id,
+			output_path=Path(settings.surveycto_cases_csv_path),
+		)
+		if rows:
+			self.case_ids.replace(_row_case_id(row) for row in rows)
+		return rows
+
+	async def load_locations(self) -> int:
+		"""Load the barangay prefix lookup exported from the cases dataset."""
+
+		path = Path(settings.brgy_lookup_path)
+		self.locations = await asyncio.to_thread(BarangayLookup.load, path)
+		log.info("case_locations.loaded", prefixes=len(self.locations), path=str(path))
+		return len(self.locations)
+
+	async def lookup_case(self, case_id: str) -> CaseRecord:
+		"""Return case record for the given case ID, with location resolved locally."""
+
+		case = await self.survey_client.get_case(case_id)
+		location = self.locations.match(case_id)
+		if location is None:
+			return case
+		return case.model_copy(
+			update={
+				"barangay": location.barangay or case.barangay,
+				"municipality": location.municipality or case.municipality,
+				"province": location.province or case.province,
+			}
+		)
 
 	async def case_status(
 		self,
@@ -92,18 +159,14 @@ class CaseService:
 		return f"{case.case_id} is currently {case.status}"
 
 	async def _resolve_status_from_cases_csv(self, case_id: str) -> tuple[str, str] | None:
-		rows = await self.survey_client.fetch_cases_rows_with_fallback(
-			settings.surveycto_cases_source_id,
-			output_path=Path(settings.surveycto_cases_csv_path),
-		)
+		rows = await self._fetch_cases_rows()
 		if not rows:
 			return None
 
 		needle = case_id.strip().lower()
 		matched_row: dict[str, str] | None = None
 		for row in rows:
-			row_case_id = str(row.get("caseid", row.get("id", ""))).strip().lower()
-			if row_case_id == needle:
+			if _row_case_id(row).lower() == needle:
 				matched_row = row
 				break
 		if matched_row is None:
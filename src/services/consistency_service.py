@@ -0,0 +1,215 @@
+"""Cross-form consistency checks over downloaded exports using streaming hash joins."""
+
+import asyncio
+import csv
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.config import settings
+from src.utils.logger import get_logger
+
+log = get_logger("consistency_service")
+
+_TRUTHY = frozenset({"1", "yes", "true", "y"})
+
+
+@dataclass
+class JoinSide:
+	"""One input of a hash join: export path, join key, and optional row filter."""
+
+	label: str
+	path: Path
+	key: str = "caseid"
+	where_column: str = ""
+	where_values: frozenset[str] = _TRUTHY
+
+
+@dataclass
+class JoinResult:
+	"""Key-level outcome of joining two exports."""
+
+	left_label: str
+	right_label: str
+	matched: int = 0
+	left_only: int = 0
+	right_only: int = 0
+	left_duplicates: int = 0
+	right_duplicates: int = 0
+	left_only_sample: list[str] = field(default_factory=list)
+	right_only_sample: list[str] = field(default_factory=list)
+	build_side: str = ""
+
+
+def _iter_keys(side: JoinSide) -> Iterator[str]:
+	"""Yield non-empty join keys row by row without holding the export in memory."""
+
+	with side.path.open("r", encoding="utf-8-sig", newline="") as handle:
+		reader = csv.reader(handle)
+		header = [name.strip().lower() for name in next(reader, [])]
+		try:
+			key_index = header.index(side.key.lower())
+		except ValueError as error:
+			raise KeyError(f"{side.label} export has no '{side.key}' column") from error
+		where_index = -1
+		if side.where_column:
+			try:
+				where_index = header.index(side.where_column.lower())
+			except ValueError as error:
+				raise KeyError(
+					f"{side.label} export has no '{side.where_column}' column"
+				) from error
+
+		for row in reader:
+			if key_index >= len(row):
+				continue
+			if where_index >= 0:
+				flag = row[where_index].strip().lower() if where_index < len(row) else ""
+				if flag not in side.where_values:
+					continue
+			key = row[key_index].strip()
+			if key:
+				yield key
+
+
+def stream_hash_join(left: JoinSide, right: JoinSide, sample_limit: int = 10) -> JoinResult:
+	"""Join two exports on their keys, building the hash table over the smaller file.
+
+	Only the build side's distinct keys (plus probe keys seen, for duplicate
+	detection) are kept in memory; rows themselves are streamed.
+	"""
+
+	left_is_build = left.path.stat().st_size <= right.path.stat().st_size
+	build, probe = (left, right) if left_is_build else (right, left)
+
+	build_counts: dict[str, int] = {}
+	for key in _iter_keys(build):
+		build_counts[key] = build_counts.get(key, 0) + 1
+
+	matched_keys: set[str] = set()
+	probe_seen: set[str] = set()
+	probe_duplicates = 0
+	probe_only = 0
+	probe_only_sample: list[str] = []
+	for key in _iter_keys(probe):
+		if key in probe_seen:
+			probe_duplicates += 1
+			continue
+		probe_seen.add(key)
+		if key in build_counts:
+			matched_keys.add(key)
+		else:
+			probe_only += 1
+			if len(probe_only_sample) < sample_limit:
+				probe_only_sample.append(key)
+
+	build_only_keys = [key for key in build_counts if key not in matched_keys]
+	build_duplicates = sum(count - 1 for count in build_counts.values() if count > 1)
+	build_only_sample = sorted(build_only_keys)[:sample_limit]
+
+	result = JoinResult(left_label=left.label, right_label=right.label, build_side=build.label)
+	result.matched = len(matched_keys)
+	if left_is_build:
+		result.left_only, result.left_only_sample = len(build_only_keys), build_only_sample
+		result.right_only, result.right_only_sample = probe_only, sorted(probe_only_sample)
+		result.left_duplicates, result.right_duplicates = build_duplicates, probe_duplicates
+	else:
+		result.right_only, result.right_only_sample = len(build_only_keys), build_only_sample
+		result.left_only, result.left_only_sample = probe_only, sorted(probe_only_sample)
+		result.right_duplicates, result.left_duplicates = build_duplicates, probe_duplicates
+	return result
+
+
+@dataclass
+class ConsistencyReport:
+	"""Summary lines for the cross-form consistency stage."""
+
+	lines: list[str] = field(default_factory=list)
+	issues: int = 0
+
+	@property
+	def ok(self) -> bool:
+		"""Return True when no orphans or duplicates were found."""
+		return self.issues == 0
+
+
+def _sample(keys: list[str]) -> str:
+	return f" (e.g. {', '.join(keys)})" if keys else ""
+
+
+class ConsistencyService:
+	"""Checks that household, business, Phase A and cases exports agree on caseid."""
+
+	def __init__(
+		self,
+		household_csv: Path | None = None,
+		business_csv: Path | None = None,
+		phase_a_csv: Path | None = None,
+		cases_csv: Path | None = None,
+	) -> None:
+		"""Initialize export paths, defaulting to configured download locations."""
+		self.household_csv = household_csv or Path(settings.surveycto_household_csv_path)
+		self.business_csv = business_csv or Path(settings.surveycto_business_csv_path)
+		self.phase_a_csv = phase_a_csv or Path(settings.surveycto_phase_a_csv_path)
+		self.cases_csv = cases_csv or Path(settings.surveycto_cases_csv_path)
+
+	def _check(self, report: ConsistencyReport) -> None:
+		hh = JoinSide("household", self.household_csv)
+		biz = JoinSide("business", self.business_csv)
+
+		if hh.path.exists() and biz.path.exists():
+			linked = stream_hash_join(hh, biz)
+			report.issues += linked.right_only + linked.left_duplicates
+			report.lines.append(
+				f"HH↔Business: {linked.matched} linked cases; "
+				f"{linked.right_only} business caseids without HH submission"
+				f"{_sample(linked.right_only_sample)}; "
+				f"{linked.left_duplicates} duplicate HH caseids"
+			)
+
+			flag_column = settings.consistency_hh_business_flag_column.strip()
+			if flag_column:
+				flagged = JoinSide("household", hh.path, where_column=flag_column)
+				try:
+					expected = stream_hash_join(flagged, biz)
+				except KeyError as error:
+					report.lines.append(f"HH business-activity check skipped: {error}")
+				else:
+					report.issues += expected.left_only
+					report.lines.append(
+						f"HH with business activity: {expected.left_only} missing "
+						f"business submission{_sample(expected.left_only_sample)}"
+					)
+			else:
+				report.lines.append(
+					"HH business-activity check disabled: set "
+					"CONSISTENCY_HH_BUSINESS_FLAG_COLUMN to the household export's flag column."
+				)
+		else:
+			report.lines.append("HH↔Business check skipped: export(s) not downloaded yet.")
+
+		phase_a = JoinSide("phase_a", self.phase_a_csv)
+		cases = JoinSide("cases", self.cases_csv)
+		if phase_a.path.exists() and cases.path.exists():
+			revisits = stream_hash_join(phase_a, cases)
+			report.issues += revisits.left_only + revisits.left_duplicates
+			report.lines.append(
+				f"Phase A↔Cases: {revisits.left_only} revisits with unknown caseid"
+				f"{_sample(revisits.left_only_sample)}; "
+				f"{revisits.left_duplicates} duplicate revisit caseids"
+			)
+		else:
+			report.lines.append("Phase A↔Cases check skipped: export(s) not downloaded yet.")
+
+	async def run(self) -> ConsistencyReport:
+		"""Run all cross-form checks off the event loop."""
+
+		report = ConsistencyReport()
+		try:
+			await asyncio.to_thread(self._check, report)
+		except Exception as error:
+			log.error("consistency.failed", error=str(error))
+			report.lines.append(f"Consistency check failed: {error}")
+			report.issues += 1
+		log.info("consistency.finished", issues=report.issues)
+		return report
@@ -0,0 +1,220 @@
+"""Vectorized post-download data-quality checks driven by a declarative rules file."""
+
+import asyncio
+import csv
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.config import settings
+from src.utils.logger import get_logger
+
+log = get_logger("data_quality")
+
+SUPPORTED_CHECKS = {"duplicate", "blank", "duration_outlier", "speeding"}
+_NUMBER = re.compile(r"-?(?:\d+\.?\d*|\.\d+)", re.ASCII)
+
+
+@dataclass
+class DataQualityReport:
+	"""Compact findings for one downloaded export."""
+
+	form_key: str
+	rows: int = 0
+	findings: list[str] = field(default_factory=list)
+	seconds: float = 0.0
+
+	@property
+	def ok(self) -> bool:
+		"""Return True when no rule produced a finding."""
+		return not self.findings
+
+	def lines(self, limit: int = 8) -> list[str]:
+		"""Render job detail lines, capped for Discord."""
+		header = (
+			f"dq {self.form_key}: {self.rows} rows, "
+			f"{len(self.findings)} finding(s) in {self.seconds:.2f}s"
+		)
+		shown = [f"dq {self.form_key}: {item}" for item in self.findings[:limit]]
+		if len(self.findings) > limit:
+			shown.append(f"dq {self.form_key}: ... {len(self.findings) - limit} more")
+		return [header, *shown]
+
+
+def _sample(values: np.ndarray, limit: int = 5) -> str:
+	items = [str(value) for value in values[:limit]]
+	more = f" +{len(values) - limit}" if len(values) > limit else ""
+	return ", ".join(items) + more
+
+
+def _to_float(values: np.ndarray) -> np.ndarray:
+	"""Parse a string column to floats, with NaN for blanks and junk."""
+
+	stripped = np.char.strip(values.astype(str))
+	uniques, inverse = np.unique(stripped, return_inverse=True)
+	numeric = np.fromiter(
+		(_NUMBER.fullmatch(value) is not None for value in uniques), dtype=bool, count=len(uniques)
+	)
+	parsed = np.full(uniques.shape, np.nan, dtype=float)
+	parsed[numeric] = uniques[numeric].astype(float)
+	return parsed[inverse].reshape(stripped.shape)
+
+
+class DataQualityService:
+	"""Runs fast array-based checks on a freshly downloaded CSV."""
+
+	def __init__(self, rules_path: Path | None = None) -> None:
+		"""Initialize with the JSON rules file location."""
+		self.rules_path = rules_path or Path(settings.data_quality_rules_path)
+
+	def load_rules(self) -> dict[str, list[dict[str, Any]]]:
+		"""Read per-form rule lists; unknown check types are rejected."""
+
+		if not self.rules_path.exists():
+			return {}
+		payload = json.loads(self.rules_path.read_text(encoding="utf-8"))
+		if not isinstance(payload, dict):
+			raise ValueError(f"Data quality rules must be a JSON object: {self.rules_path}")
+		rules: dict[str, list[dict[str, Any]]] = {}
+		for form_key, items in payload.items():
+			if not isinstance(items, list):
+				continue
+			for item in items:
+				check = item.get("check") if isinstance(item, dict) else None
+				if check not in SUPPORTED_CHECKS:
+					raise ValueError(f"Unsupported data quality check for {form_key}: {check}")
+			rules[str(form_key)] = items
+		return rules
+
+	@staticmethod
+	def _rule_columns(rule: dict[str, Any]) -> list[str]:
+		columns = list(rule.get("columns", []))
+		for key in ("column", "by"):
+			if rule.get(key):
+				columns.append(str(rule[key]))
+		return columns
+
+	@staticmethod
+	def _load_columns(csv_path: Path, wanted: set[str]) -> tuple[int, dict[str, np.ndarray]]:
+		"""Stream the CSV once and keep only the columns the rules need."""
+
+		with csv_path.open("r", encoding="utf-8-sig", newline="") as handle:
+			reader = csv.reader(handle)
+			header = [name.strip() for name in next(reader, [])]
+			by_lower = {name.lower(): index for index, name in enumerate(header)}
+			positions = {
+				name: by_lower[name.lower()] for name in wanted if name.lower() in by_lower
+			}
+			buffers: dict[str, list[str]] = {name: [] for name in positions}
+			rows = 0
+			for row in reader:
+				rows += 1
+				width = len(row)
+				for name, index in positions.items():
+					buffers[name].append(row[index] if index < width else "")
+		return rows, {name: np.array(values, dtype=str) for name, values in buffers.items()}
+
+	def _apply(self, rule: dict[str, Any], columns: dict[str, np.ndarray]) -> list[str]:
+		check = rule["check"]
+		missing = [name for name in self._rule_columns(rule) if name not in columns]
+		if missing:
+			return [f"{check} skipped: missing column(s) {', '.join(missing)}"]
+
+		if check == "duplicate":
+			name = str(rule["column"])
+			values = np.char.strip(columns[name])
+			values = values[values != ""]
+			unique, counts = np.unique(values, return_counts=True)
+			dupes = unique[counts > 1]
+			if dupes.size:
+				extra = int(counts[counts > 1].sum() - dupes.size)
+				return [
+					f"{dupes.size} duplicated {name} value(s), "
+					f"{extra} extra row(s): {_sample(dupes)}"
+				]
+			return []
+
+		if check == "blank":
+			findings: list[str] = []
+			for name in rule.get("columns", []):
+				blank = np.char.str_len(np.char.strip(columns[name])) == 0
+				count = int(blank.sum())
+				if count:
+					findings.append(f"{count} blank required `{name}`")
+			return findings
+
+		durations = _to_float(columns[str(rule["column"])])
+		valid = ~np.isnan(durations)
+
+		if check == "duration_outlier":
+			values = durations[valid]
+			if values.size < 5:
+				return []
+			median = float(np.median(values))
+			mad = float(np.median(np.abs(values - median)))
+			if mad == 0:
+				return []
+			robust_z = 0.6745 * (durations - median) / mad
+			threshold = float(rule.get("z", 3.5))
+			outliers = valid & (np.abs(robust_z) > threshold)
+			count = int(outliers.sum())
+			if count:
+				return [
+					f"{count} interview duration outlier(s) in `{rule['column']}` "
+					f"(|robust z|>{threshold:g}, median {median / 60:.0f} min)"
+				]
+			return []
+
+		# speeding: share of each enumerator's interviews under a minimum duration
+		groups = np.char.strip(columns[str(rule["by"])])
+		keep = valid & (groups != "")
+		if not keep.any():
+			return []
+		labels, inverse = np.unique(groups[keep], return_inverse=True)
+		fast = durations[keep] < float(rule.get("min_seconds", 900))
+		totals = np.bincount(inverse)
+		fast_counts = np.bincount(inverse, weights=fast.astype(float))
+		share = fast_counts / totals
+		flagged = np.flatnonzero(
+			(share > float(rule.get("max_share", 0.2)))
+			& (totals >= int(rule.get("min_interviews", 3)))
+		)
+		if not flagged.size:
+			return []
+		order = flagged[np.argsort(-share[flagged])]
+		names = ", ".join(f"{labels[i]} ({share[i]:.0%} of {totals[i]})" for i in order[:5])
+		more = f" +{order.size - 5}" if order.size > 5 else ""
+		return [f"{order.size} enumerator(s) speeding: {names}{more}"]
+
+	def _check(self, form_key: str, csv_path: Path) -> DataQualityReport:
+		started = time.perf_counter()
+		report = DataQualityReport(form_key=form_key)
+		rules = self.load_rules().get(form_key, [])
+		if not rules:
+			report.seconds = time.perf_counter() - started
+			return report
+
+		wanted = {name for rule in rules for name in self._rule_columns(rule)}
+		report.rows, columns = self._load_columns(csv_path, wanted)
+		for rule in rules:
+			report.findings.extend(self._apply(rule, columns))
+		report.seconds = time.perf_counter() - started
+		return report
+
+	async def check_csv(self, form_key: str, csv_path: Path) -> DataQualityReport:
+		"""Run the configured rules for a form against a CSV export."""
+
+		report = await asyncio.to_thread(self._check, form_key, csv_path)
+		log.info(
+			"data_quality.checked",
+			form=form_key,
+			rows=report.rows,
+			findings=len(report.findings),
+			seconds=round(report.seconds, 3),
+		)
+		return report
@@ -0,0 +1,154 @@
+"""Small dependency-DAG executor for multi-step automation jobs."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+from src.utils.logger import get_logger
+
+log = get_logger("job_dag")
+
+NodeAction = Callable[[], Awaitable[list[str]]]
+ProgressCallback = Callable[[str], Awaitable[None]]
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_TIMEOUT = "timeout"
+STATUS_SKIPPED = "skipped"
+STATUS_UP_TO_DATE = "up_to_date"
+
+
+class NodeUpToDate(Exception):
+	"""Raised by a node action that found its outputs already current."""
+
+
+@dataclass
+class DagNode:
+	"""One step of a job: an async action plus the steps it waits for."""
+
+	name: str
+	action: NodeAction
+	depends_on: tuple[str, ...] = ()
+	timeout_seconds: float | None = None
+
+
+@dataclass
+class NodeResult:
+	"""Outcome and timing for one executed (or skipped) node."""
+
+	name: str
+	status: str
+	details: list[str] = field(default_factory=list)
+	started_at: str = ""
+	duration_seconds: float = 0.0
+
+	@property
+	def ok(self) -> bool:
+		"""Return True when the node ran to completion or had nothing to do."""
+		return self.status in {STATUS_OK, STATUS_UP_TO_DATE}
+
+
+def validate_dag(nodes: list[DagNode]) -> None:
+	"""Reject duplicate names, unknown dependencies, and cycles."""
+
+	names = [node.name for node in nodes]
+	if len(names) != len(set(names)):
+		raise ValueError("DAG node names must be unique.")
+	known = set(names)
+	remaining = {node.name: set(node.depends_on) for node in nodes}
+	for node in nodes:
+		unknown = set(node.depends_on) - known
+		if unknown:
+			raise ValueError(f"Node '{node.name}' depends on unknown node(s): {sorted(unknown)}")
+
+	while remaining:
+		ready = [name for name, deps in remaining.items() if not deps]
+		if not ready:
+			raise ValueError(f"DAG has a cycle among: {sorted(remaining)}")
+		for name in ready:
+			remaining.pop(name)
+		for deps in remaining.values():
+			deps.difference_update(ready)
+
+
+class DagExecutor:
+	"""Runs DAG nodes as soon as their dependencies succeed, with bounded parallelism."""
+
+	def __init__(self, max_parallel: int = 2) -> None:
+		"""Initialize the concurrency limit."""
+		self.max_parallel = max(max_parallel, 1)
+
+	async def run(
+		self, nodes: list[DagNode], progress: ProgressCallback | None = None,
+	) -> list[NodeResult]:
+		"""Execute all nodes and return results in declaration order.
+
+		A node whose dependency did not succeed is marked skipped instead of run,
+		so independent branches still finish when another branch fails.
+		``progress`` receives a one-line note whenever a node starts or ends.
+		"""
+
+		validate_dag(nodes)
+		semaphore = asyncio.Semaphore(self.max_parallel)
+		tasks: dict[str, asyncio.Task[NodeResult]] = {}
+
+		async def _run_node(node: DagNode) -> NodeResult:
+			if node.depends_on:
+				upstream = await asyncio.gather(*(tasks[name] for name in node.depends_on))
+				failed = [result.name for result in upstream if not result.ok]
+				if failed:
+					if progress:
+						await progress(f"[{node.name}] skipped")
+					return NodeResult(
+						name=node.name,
+						status=STATUS_SKIPPED,
+						details=[f"skipped: upstream {', '.join(failed)} did not succeed"],
+					)
+
+			async with semaphore:
+				started_at = datetime.now(UTC).isoformat()
+				started = time.perf_counter()
+				log.info("job_dag.node_started", node=node.name)
+				if progress:
+					await progress(f"[{node.name}] running")
+				try:
+					details = await asyncio.wait_for(node.action(), timeout=node.timeout_seconds)
+					status = STATUS_OK
+				except NodeUpToDate as reason:
+					details = [str(reason)]
+					status = STATUS_UP_TO_DATE
+				except TimeoutError:
+					details = [f"timed out after {node.timeout_seconds:g}s"]
+					status = STATUS_TIMEOUT
+				except Exception as error:
+					details = [str(error)]
+					status = STATUS_FAILED
+				duration = time.perf_counter() - started
+				log.info(
+					"job_dag.node_finished",
+					node=node.name,
+					status=status,
+					seconds=round(duration, 3),
+				)
+				if progress:
+					await progress(f"[{node.name}] {status} ({duration:.1f}s)")
+				return NodeResult(
+					name=node.name,
+					status=status,
+					details=details,
+					started_at=started_at,
+					duration_seconds=round(duration, 3),
+				)
+
+		for node in nodes:
+			tasks[node.name] = asyncio.create_task(_run_node(node), name=f"dag:{node.name}")
+		try:
+			await asyncio.gather(*tasks.values())
+		except asyncio.CancelledError:
+			for task in tasks.values():
+				task.cancel()
+			await asyncio.gather(*tasks.values(), return_exceptions=True)
+			raise
+		return [tasks[node.name].result() for node in nodes]
@@ -0,0 +1,185 @@
+"""Background runner for long automation jobs with IDs, progress, and cancellation."""
+
+import asyncio
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+
+from src.config import settings
+from src.db.repositories.job_repo import BackgroundJobRepository
+from src.models.background_job import BackgroundJobRecord, JobStatus
+from src.services.job_dag import ProgressCallback
+from src.services.remote_automation_service import AutomationRunResult
+from src.utils.logger import get_logger
+
+log = get_logger("job_runner")
+
+JobFactory = Callable[[ProgressCallback], Awaitable[AutomationRunResult]]
+# A listener returns the ID of the status message it posted or edited, if any.
+JobListener = Callable[[BackgroundJobRecord], Awaitable[int | None]]
+
+_PROGRESS_LINES = 12
+_STATUS_EMOJI = {
+	JobStatus.QUEUED: "⏳",
+	JobStatus.RUNNING: "🔄",
+	JobStatus.SUCCEEDED: "✅",
+	JobStatus.FAILED: "❌",
+	JobStatus.CANCELLED: "🛑",
+}
+
+
+def render_job(record: BackgroundJobRecord, limit: int = 1900) -> str:
+	"""Render a job as one Discord message: header, then progress or result."""
+
+	elapsed = ""
+	if record.started_at:
+		end = record.finished_at or datetime.now(UTC)
+		elapsed = f", {(end - record.started_at).total_seconds():.0f}s"
+	header = (
+		f"{_STATUS_EMOJI[record.status]} Job `{record.job_id}` **{record.name}** — "
+		f"{record.status.value}{elapsed}"
+	)
+	if record.finished:
+		body = [record.summary or "", *(f"- {item}" for item in record.details)]
+	else:
+		body = [f"- {item}" for item in record.progress[-8:]]
+	text = "\n".join(line for line in [header, *body] if line)
+	return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+class JobRunner:
+	"""Runs submitted jobs on a bounded worker pool and persists their state.
+
+	Jobs beyond ``max_workers`` wait in the queued state. Progress notes are
+	saved on every update; listeners (e.g. a Discord message editor) are
+	throttled to one call per ``edit_interval_seconds`` except for state changes.
+	"""
+
+	def __init__(
+		self,
+		repository: BackgroundJobRepository,
+		max_workers: int | None = None,
+		edit_interval_seconds: float | None = None,
+	) -> None:
+		"""Initialize the worker pool and job store."""
+		self.repository = repository
+		workers = max_workers if max_workers is not None else settings.job_runner_max_workers
+		self._semaphore = asyncio.Semaphore(max(workers, 1))
+		self.edit_interval_seconds = (
+			edit_interval_seconds
+			if edit_interval_seconds is not None
+			else settings.job_progress_edit_seconds
+		)
+		self._tasks: dict[str, asyncio.Task[None]] = {}
+		self._records: dict[str, BackgroundJobRecord] = {}
+		self._listeners: dict[str, JobListener] = {}
+		self._last_published: dict[str, float] = {}
+
+	async def submit(
+		self,
+		name: str,
+		requester: str,
+		factory: JobFactory,
+		*,
+		channel_id: int | None = None,
+		listener: JobListener | None = None,
+	) -> BackgroundJobRecord:
+		"""Queue a job and return its record immediately."""
+
+		record = BackgroundJobRecord(
+			job_id=uuid.uuid4().hex[:8],
+			name=name,
+			requester=requester,
+			channel_id=channel_id,
+			created_at=datetime.now(UTC),
+		)
+		self._records[record.job_id] = record
+		if listener:
+			self._listeners[record.job_id] = listener
+		await self._publish(record, force=True)
+		self._tasks[record.job_id] = asyncio.create_task(
+			self._execute(record, factory), name=f"job:{record.job_id}"
+		)
+		log.info("job_runner.submitted", job_id=record.job_id, name=name, requester=requester)
+		return record
+
+	async def _execute(self, record: BackgroundJobRecord, factory: JobFactory) -> None:
+		async def _progress(note: str) -> None:
+			record.progress = [*record.progress, note][-_PROGRESS_LINES:]
+			await self._publish(record)
+
+		try:
+			async with self._semaphore:
+				record.status = JobStatus.RUNNING
+				record.started_at = datetime.now(UTC)
+				await self._publish(record, force=True)
+				result = await factory(_progress)
+			record.status = JobStatus.SUCCEEDED if result.ok else JobStatus.FAILED
+			record.summary = result.summary
+			record.details = result.details
+		except asyncio.CancelledError:
+			record.status = JobStatus.CANCELLED
+			record.summary = "🛑 Cancelled before completion."
+		except Exception as error:
+			log.exception("job_runner.crashed", job_id=record.job_id)
+			record.status = JobStatus.FAILED
+			record.summary = f"❌ Job crashed: {error}"
+		record.finished_at = datetime.now(UTC)
+		await self._publish(record, force=True)
+		log.info("job_runner.finished", job_id=record.job_id, status=record.status.value)
+		self._tasks.pop(record.job_id, None)
+		self._records.pop(record.job_id, None)
+		self._listeners.pop(record.job_id, None)
+		self._last_published.pop(record.job_id, None)
+
+	async def _publish(self, record: BackgroundJobRecord, *, force: bool = False) -> None:
+		"""Persist the record and notify its listener, throttling progress-only updates."""
+
+		await self.repository.save(record)
+		listener = self._listeners.get(record.job_id)
+		if listener is None:
+			return
+		now = time.monotonic()
+		last = self._last_published.get(record.job_id)
+		if not force and last is not None and now - last < self.edit_interval_seconds:
+			return
+		self._last_published[record.job_id] = now
+		try:
+			message_id = await listener(record.model_copy(deep=True))
+		except Exception as error:
+			log.warning("job_runner.listener_failed", job_id=record.job_id, error=str(error))
+			return
+		if message_id is not None and message_id != record.message_id:
+			record.message_id = message_id
+			await self.repository.save(record)
+
+	def cancel(self, job_id: str) -> bool:
+		"""Cancel a queued or running job; returns False if it is not active."""
+
+		task = self._tasks.get(job_id)
+		if task is None or task.done():
+			return False
+		task.cancel()
+		log.info("job_runner.cancel_requested", job_id=job_id)
+		return True
+
+	async def get(self, job_id: str) -> BackgroundJobRecord | None:
+		"""Return a job's current state, live if active, else from the job table."""
+
+		live = self._records.get(job_id)
+		if live is not None:
+			return live.model_copy(deep=True)
+		return await self.repository.get(job_id)
+
+	async def recent(self, limit: int = 10) -> list[BackgroundJobRecord]:
+		"""Return recent jobs from the job table, newest first."""
+
+		return await self.repository.recent(limit)
+
+	async def wait(self, job_id: str) -> None:
+		"""Wait for an active job to finish (used by shutdown and tests)."""
+
+		task = self._tasks.get(job_id)
+		if task is not None:
+			await asyncio.gather(task, return_exceptions=True)
@@ -40,7 +40,8 @@ class ProgressExceptionsService:
 
 	async def build_nightly_report(self) -> ProgressExceptionReport:
 		"""Compute under-target, missing, and drop anomalies."""
-		rows = await self.sheets_client.read_productivity()
+		# The nightly report must not run on a copy cached hours ago.
+		rows = await self.sheets_client.read_productivity(fresh=True)
 		current = self._normalize_rows(rows)
 		previous = await self._latest_snapshot()
 
@@ -1,6 +1,6 @@
 """Progress and productivity business logic."""
 
-from src.integrations.google_sheets import GoogleSheetsClient
+from src.integrations.google_sheets import SOURCE_PRODUCTIVITY, GoogleSheetsClient
 
 
 class ProgressService:
@@ -16,6 +16,11 @@ class ProgressService:
 			return 0.0
 		return (completed / total) * 100.0
 
+	def staleness_note(self) -> str:
+		"""Return a reply footer when productivity came from an out-of-date copy."""
+
+		return self.sheets_client.staleness_note(SOURCE_PRODUCTIVITY)
+
 	async def overall_progress(self) -> dict[str, float]:
 		"""Compute overall completion metrics from sheet data."""
 
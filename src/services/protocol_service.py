@@ -6,15 +6,30 @@ from src.config import settings
 from src.db.repositories.interaction_repo import InteractionRepository
 from src.integrations.openai_client import OpenAIClient
 from src.knowledge.confidence import assess_confidence
+from src.knowledge.metadata import (
+	DOC_GROUP_FAQ,
+	DOC_GROUP_PROTOCOL,
+	DOC_GROUP_QUESTIONNAIRE,
+	ChunkFilter,
+)
 from src.knowledge.prompt_builder import build_prompt
 from src.knowledge.retriever import KnowledgeRetriever
+from src.knowledge.variables import VariableMatch, render_match
 from src.models.interaction import ConfidenceLevel, InteractionRecord
 from src.services.escalation_service import EscalationService
+from src.services.intent_classifier import Intent
 
 
 # Constants
 LOW_CONFIDENCE_ANSWER_PREVIEW_LENGTH = 1500
 
+# Doc groups searched per intent; intents not listed search every doc.
+_INTENT_DOC_GROUPS: dict[Intent, frozenset[str]] = {
+	Intent.PROTOCOL: frozenset({DOC_GROUP_PROTOCOL, DOC_GROUP_FAQ}),
+	Intent.SURVEYCTO_ISSUE: frozenset({DOC_GROUP_QUESTIONNAIRE}),
+}
+_WORD_PATTERN = re.compile(r"\b[A-Za-z][A-Za-z0-9_]*\b")
+
 
 def _escalation_mention() -> str:
 	"""Build the Discord mention string for the escalation target.
@@ -56,13 +71,30 @@ class ProtocolService:
 		self.interaction_repository = interaction_repository
 		self.escalation_service = escalation_service
 
+	def search_filter(self, question: str, intent: Intent | None) -> ChunkFilter | None:
+		"""Return the doc filter for an intent, widened if a variable is named."""
+
+		groups = _INTENT_DOC_GROUPS.get(intent) if intent is not None else None
+		if not groups:
+			return None
+		if any(self.retriever.variables.get(word) for word in _WORD_PATTERN.findall(question)):
+			groups = groups | {DOC_GROUP_QUESTIONNAIRE}
+		return ChunkFilter(doc_groups=groups)
+
 	async def answer_question(
-		self, question: str, user_id: str = "unknown", channel: str = "#protocol"
+		self,
+		question: str,
+		user_id: str = "unknown",
+		channel: str = "#protocol",
+		intent: Intent | None = None,
 	) -> tuple[str, ConfidenceLevel]:
 		"""Answer protocol question with full RAG pipeline.
 
+		Questions that only name a questionnaire variable ("relevance of
+		hh_q12?") are answered from the variable dictionary instead.
+
 		Pipeline:
-		1. Retrieve relevant chunks from knowledge base
+		1. Retrieve relevant chunks (scoped to the intent's doc groups)
 		2. Build prompt with system prompt, context, and question
 		3. Call LLM to generate answer
 		4. Assess confidence level
@@ -71,10 +103,17 @@ class ProtocolService:
 		7. Return answer and confidence
 		"""
 
+		if settings.variable_lookup_enabled:
+			match = self.retriever.variables.match_question(question)
+			if match is not None:
+				return await self._answer_from_variables(question, match, user_id, channel)
+
 		mention = _escalation_mention()
 
 		# Step 1: Retrieve relevant chunks
-		matches = await self.retriever.search(question, top_k=4)
+		matches = await self.retriever.search(
+			question, top_k=4, filters=self.search_filter(question, intent)
+		)
 
 		# Step 2: Build prompt
 		messages = build_prompt(question, matches)
@@ -131,4 +170,25 @@ class ProtocolService:
 			)
 		)
 
-		return answer, confidence
\ No newline at end of file
+		return answer, confidence
+
+	async def _answer_from_variables(
+		self, question: str, match: VariableMatch, user_id: str, channel: str
+	) -> tuple[str, ConfidenceLevel]:
+		"""Answer a variable lookup without embeddings or LLM calls."""
+
+		answer = render_match(match)
+		# A near-miss name is probably right but worth a second look.
+		confidence = ConfidenceLevel.MEDIUM if match.kind == "fuzzy" else ConfidenceLevel.HIGH
+		await self.interaction_repository.create(
+			InteractionRecord(
+				question=question,
+				answer=answer,
+				confidence=confidence,
+				source_docs=sorted({variable.source_doc for variable in match.variables}),
+				escalated=False,
+				channel=channel,
+				user_id=user_id,
+			)
+		)
+		return answer, confidence
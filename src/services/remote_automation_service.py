@@ -3,13 +3,30 @@
 import asyncio
 import csv
 import json
+import os
+import shutil
 import tempfile
-from dataclasses import dataclass
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 
 from src.config import settings
 from src.integrations.surveycto import SurveyCTOClient
+from src.services.build_cache import DmsBuildCache
+from src.services.consistency_service import ConsistencyService
+from src.services.data_quality_service import DataQualityService
+from src.services.job_dag import (
+	STATUS_UP_TO_DATE,
+	DagExecutor,
+	DagNode,
+	NodeUpToDate,
+	ProgressCallback,
+)
+from src.services.stata_output import StataOutputMonitor
+from src.services.submission_warehouse import SubmissionWarehouse
+from src.utils.json_stream import iter_json_array
 from src.utils.logger import get_logger
 
 log = get_logger("remote_automation")
@@ -34,9 +51,20 @@ class RemoteAutomationService:
 	FORM_BIZ = "business"
 	FORM_PHASE_A = "phase_a"
 
-	def __init__(self, survey_client: SurveyCTOClient) -> None:
-		"""Initialize with SurveyCTO client and log location."""
+	def __init__(
+		self,
+		survey_client: SurveyCTOClient,
+		warehouse: SubmissionWarehouse | None = None,
+		consistency: ConsistencyService | None = None,
+		data_quality: DataQualityService | None = None,
+		build_cache: DmsBuildCache | None = None,
+	) -> None:
+		"""Initialize with SurveyCTO client, post-download stages, and log location."""
 		self.survey_client = survey_client
+		self.warehouse = warehouse or SubmissionWarehouse()
+		self.consistency = consistency or ConsistencyService()
+		self.data_quality = data_quality or DataQualityService()
+		self.build_cache = build_cache or DmsBuildCache()
 		self.log_path = Path(settings.remote_jobs_log_path)
 
 	def allowed_jobs(self) -> dict[str, str]:
@@ -64,23 +92,66 @@ class RemoteAutomationService:
 			return settings.surveycto_form_phase_a_id, csv.parent, csv
 		raise ValueError(f"Unknown form key: {form_key}")
 
-	async def download_form(self, form_key: str, requester: str) -> AutomationRunResult:
+	def _do_file_for(self, form_key: str) -> Path:
+		"""Return the Stata master do-file for a form key."""
+		if form_key == self.FORM_HH:
+			return Path(settings.stata_household_master_do_path)
+		if form_key == self.FORM_BIZ:
+			return Path(settings.stata_business_master_do_path)
+		raise ValueError(f"No Stata DMS configured for form key: {form_key}")
+
+	async def _download_stage(self, form_key: str) -> list[str]:
+		"""Download one form, then load and quality-check the fresh CSV."""
+		form_id, output_folder, csv_path = self._form_config(form_key)
+		output_folder.mkdir(parents=True, exist_ok=True)
+		detail = await self._run_sctoapi_download(
+			form_id=form_id,
+			output_folder=output_folder,
+			csv_output_path=csv_path,
+		)
+		details = [detail, await self._ingest_download(form_key, csv_path)]
+		details.extend(await self._quality_stage(form_key, csv_path))
+		return details
+
+	async def _dms_stage(
+		self,
+		form_key: str,
+		*,
+		force: bool = False,
+		progress: ProgressCallback | None = None,
+	) -> list[str]:
+		"""Run one form's DMS unless its do-files and input CSV are unchanged.
+
+		Raises NodeUpToDate when the last successful run had the same fingerprint.
+		The fingerprint is taken before Stata starts and recorded only on success.
+		"""
+		do_file = self._do_file_for(form_key)
+		_, _, csv_path = self._form_config(form_key)
+		check = await self.build_cache.check(f"dms_{form_key}", do_file, [csv_path])
+		if check.up_to_date and not force:
+			log.info("run_dms.up_to_date", form=form_key)
+			raise NodeUpToDate(
+				f"up to date: {do_file.name} and inputs unchanged since {check.recorded_at}"
+			)
+		detail = await self._run_stata_do_file(do_file, progress=progress)
+		await self.build_cache.record(check)
+		return [detail]
+
+	async def download_form(
+		self, form_key: str, requester: str, *, progress: ProgressCallback | None = None,
+	) -> AutomationRunResult:
 		"""Download a single SurveyCTO form CSV (no Stata)."""
 		try:
-			form_id, output_folder, csv_path = self._form_config(form_key)
-			output_folder.mkdir(parents=True, exist_ok=True)
-			detail = await self._run_sctoapi_download(
-				form_id=form_id,
-				output_folder=output_folder,
-				csv_output_path=csv_path,
-			)
+			if progress:
+				await progress(f"downloading {form_key} via sctoapi")
+			details = await self._download_stage(form_key)
 			result = AutomationRunResult(
 				ok=True,
 				summary=f"✅ Downloaded **{form_key}** form CSV.",
-				details=[detail],
+				details=details,
 			)
 			await self._append_log(
-				job_name=f"download_{form_key}", requester=requester, ok=True, details=[detail],
+				job_name=f"download_{form_key}", requester=requester, ok=True, details=details,
 			)
 			return result
 		except Exception as error:
@@ -91,27 +162,44 @@ class RemoteAutomationService:
 			)
 			return AutomationRunResult(ok=False, summary=msg, details=[str(error)])
 
-	async def run_single_dms(self, form_key: str, requester: str) -> AutomationRunResult:
+	async def run_single_dms(
+		self,
+		form_key: str,
+		requester: str,
+		*,
+		force: bool = False,
+		progress: ProgressCallback | None = None,
+	) -> AutomationRunResult:
 		"""Run only the Stata DMS do-file for one form (no download)."""
 		try:
-			if form_key == self.FORM_HH:
-				do_file = Path(settings.stata_household_master_do_path)
-			elif form_key == self.FORM_BIZ:
-				do_file = Path(settings.stata_business_master_do_path)
-			else:
+			try:
+				do_file = self._do_file_for(form_key)
+			except ValueError as error:
+				return AutomationRunResult(ok=False, summary=f"❌ {error}", details=[])
+			if progress:
+				await progress(f"running {do_file.name}")
+			try:
+				details = await self._dms_stage(form_key, force=force, progress=progress)
+			except NodeUpToDate as reason:
+				details = [str(reason)]
+				await self._append_log(
+					job_name=f"run_dms_{form_key}", requester=requester, ok=True, details=details,
+				)
 				return AutomationRunResult(
-					ok=False,
-					summary=f"❌ No Stata DMS configured for form key: {form_key}",
-					details=[],
+					ok=True,
+					summary=(
+						f"⏭️ Skipped **{form_key}** Stata DMS (`{do_file.name}`): up to date. "
+						"Use force to re-run."
+					),
+					details=details,
 				)
-			detail = await self._run_stata_do_file(do_file)
 			result = AutomationRunResult(
 				ok=True,
 				summary=f"✅ Ran **{form_key}** Stata DMS (`{do_file.name}`).",
-				details=[detail],
+				details=details,
 			)
 			await self._append_log(
-				job_name=f"run_dms_{form_key}", requester=requester, ok=True, details=[detail],
+				job_name=f"run_dms_{form_key}", requester=requester, ok=True, details=details,
 			)
 			return result
 		except Exception as error:
@@ -122,59 +210,125 @@ class RemoteAutomationService:
 			)
 			return AutomationRunResult(ok=False, summary=msg, details=[str(error)])
 
-	async def run_job(self, *, job_name: str, requester: str) -> AutomationRunResult:
-		"""Execute one of the predefined jobs."""
+	async def check_consistency(self, requester: str) -> AutomationRunResult:
+		"""Cross-check already-downloaded exports for orphan and duplicate caseids."""
+		report = await self.consistency.run()
+		summary = (
+			"✅ Cross-form consistency: no orphans or duplicates."
+			if report.ok
+			else f"⚠️ Cross-form consistency: {report.issues} issue(s) found."
+		)
+		await self._append_log(
+			job_name="check_consistency", requester=requester, ok=report.ok, details=report.lines,
+		)
+		return AutomationRunResult(ok=report.ok, summary=summary, details=report.lines)
+
+	def _daily_dms_dag(
+		self, *, force: bool = False, progress: ProgressCallback | None = None,
+	) -> list[DagNode]:
+		"""Describe the daily job: two independent download → DMS branches."""
+		timeout = float(settings.automation_node_timeout_seconds) or None
+
+		async def _consistency() -> list[str]:
+			report = await self.consistency.run()
+			return report.lines
+
+		return [
+			DagNode("download_hh", lambda: self._download_stage(self.FORM_HH), (), timeout),
+			DagNode("download_biz", lambda: self._download_stage(self.FORM_BIZ), (), timeout),
+			DagNode("consistency", _consistency, ("download_hh", "download_biz"), timeout),
+			DagNode(
+				"dms_hh",
+				lambda: self._dms_stage(self.FORM_HH, force=force, progress=progress),
+				("download_hh",),
+				timeout,
+			),
+			DagNode(
+				"dms_biz",
+				lambda: self._dms_stage(self.FORM_BIZ, force=force, progress=progress),
+				("download_biz",),
+				timeout,
+			),
+		]
+
+	async def run_job(
+		self,
+		*,
+		job_name: str,
+		requester: str,
+		force: bool = False,
+		progress: ProgressCallback | None = None,
+	) -> AutomationRunResult:
+		"""Execute one of the predefined jobs; ``force`` re-runs up-to-date DMS steps."""
 		if job_name != self.DAILY_DMS_JOB:
 			return AutomationRunResult(ok=False, summary="Unknown or disallowed job.", details=[])
 
-		details: list[str] = []
+		started = time.perf_counter()
 		try:
-			hh_path = Path(settings.surveycto_household_csv_path)
-			biz_path = Path(settings.surveycto_business_csv_path)
-			hh_output_folder = hh_path.parent
-			biz_output_folder = biz_path.parent
-			hh_output_folder.mkdir(parents=True, exist_ok=True)
-			biz_output_folder.mkdir(parents=True, exist_ok=True)
-
-			hh_download = await self._run_sctoapi_download(
-				form_id=settings.surveycto_form_household_id,
-				output_folder=hh_output_folder,
-				csv_output_path=hh_path,
-			)
-			details.append(hh_download)
-
-			biz_download = await self._run_sctoapi_download(
-				form_id=settings.surveycto_form_business_id,
-				output_folder=biz_output_folder,
-				csv_output_path=biz_path,
+			executor = DagExecutor(max_parallel=settings.automation_max_parallel)
+			results = await executor.run(
+				self._daily_dms_dag(force=force, progress=progress),
+				progress=progress,
 			)
-			details.append(biz_download)
-
-			hh_do = Path(settings.stata_household_master_do_path)
-			biz_do = Path(settings.stata_business_master_do_path)
-
-			hh_run = await self._run_stata_do_file(hh_do)
-			details.append(hh_run)
-			biz_run = await self._run_stata_do_file(biz_do)
-			details.append(biz_run)
-
-			result = AutomationRunResult(
-				ok=True,
-				summary="✅ Job completed: SurveyCTO sctoapi download + Stata pipelines finished.",
-				details=details,
-			)
-			await self._append_log(job_name=job_name, requester=requester, ok=True, details=details)
-			return result
 		except Exception as error:
 			message = f"❌ Job failed: {error}"
 			log.error("remote_job.failed", job=job_name, error=str(error))
 			await self._append_log(
-				job_name=job_name,
-				requester=requester,
-				ok=False,
-				details=details + [str(error)],
+				job_name=job_name, requester=requester, ok=False, details=[str(error)],
+			)
+			return AutomationRunResult(ok=False, summary=message, details=[])
+
+		elapsed = time.perf_counter() - started
+		details: list[str] = []
+		for result in results:
+			details.append(f"[{result.name}] {result.status} ({result.duration_seconds:.1f}s)")
+			details.extend(f"[{result.name}] {detail}" for detail in result.details)
+		not_ok = [result.name for result in results if not result.ok]
+		up_to_date = [result.name for result in results if result.status == STATUS_UP_TO_DATE]
+		ok = not not_ok
+		if ok:
+			summary = (
+				"✅ Job completed: SurveyCTO sctoapi download + Stata pipelines finished "
+				f"in {elapsed:.0f}s."
 			)
-			return AutomationRunResult(ok=False, summary=message, details=details)
+		elif len(not_ok) == len(results):
+			summary = f"❌ Job failed: no step succeeded ({elapsed:.0f}s)."
+		else:
+			summary = (
+				f"⚠️ Job partially completed in {elapsed:.0f}s: "
+				f"{len(results) - len(not_ok)}/{len(results)} steps ok; "
+				f"not ok: {', '.join(not_ok)}."
+			)
+		if up_to_date:
+			summary += f"\n⏭️ Skipped as up to date: {', '.join(up_to_date)}."
+		if not ok:
+			log.error("remote_job.partial_failure", job=job_name, failed=not_ok)
+		await self._append_log(
+			job_name=job_name,
+			requester=requester,
+			ok=ok,
+			details=details,
+			nodes=[asdict(result) for result in results],
+		)
+		return AutomationRunResult(ok=ok, summary=summary, details=details)
+
+	async def _ingest_download(self, form_key: str, csv_path: Path) -> str:
+		"""Load a fresh export into the submission warehouse without failing the job."""
+		try:
+			stats = await self.warehouse.ingest_csv(form_key, csv_path)
+		except Exception as error:
+			log.warning("warehouse_ingest.failed", form=form_key, error=str(error))
+			return f"warehouse_ingest_skipped form={form_key}: {error}"
+		return stats.detail()
+
+	async def _quality_stage(self, form_key: str, csv_path: Path) -> list[str]:
+		"""Run vectorized data-quality rules on a fresh export without failing the job."""
+		try:
+			report = await self.data_quality.check_csv(form_key, csv_path)
+		except Exception as error:
+			log.warning("data_quality.failed", form=form_key, error=str(error))
+			return [f"dq {form_key}: skipped ({error})"]
+		return report.lines()
 
 	async def _run_sctoapi_download(
 		self,
@@ -194,7 +348,8 @@ class RemoteAutomationService:
 		started_at = datetime.now(UTC)
 		stata_script = self._build_sctoapi_script(form_id=form_id, output_folder=output_folder)
 		result = await self._run_stata_script(stata_script, label=f"sctoapi_{form_id}")
-		csv_message = self._ensure_csv_output(
+		csv_message = await asyncio.to_thread(
+			self._ensure_csv_output,
 			form_id=form_id,
 			output_folder=output_folder,
 			csv_output_path=csv_output_path,
@@ -227,8 +382,7 @@ class RemoteAutomationService:
 
 		if fresh_csv is not None:
 			if fresh_csv.resolve() != csv_output_path.resolve():
-				csv_output_path.parent.mkdir(parents=True, exist_ok=True)
-				csv_output_path.write_bytes(fresh_csv.read_bytes())
+				self._promote_csv(fresh_csv, csv_output_path)
 			return f"csv_ready path={csv_output_path}"
 
 		json_path = output_folder / f"{form_id}.json"
@@ -237,58 +391,67 @@ class RemoteAutomationService:
 				f"sctoapi output missing CSV and JSON for form '{form_id}' in {output_folder}"
 			)
 
-		rows = self._rows_from_scto_json(json_path)
-		self._write_rows_csv(rows, csv_output_path)
-		return f"csv_built_from_json path={csv_output_path} rows={len(rows)}"
+		rows = self._convert_scto_json_to_csv(json_path, csv_output_path)
+		return f"csv_built_from_json path={csv_output_path} rows={rows}"
+
+	@staticmethod
+	def _promote_csv(source: Path, destination: Path) -> None:
+		"""Publish the fresh export at the DMS path without reading it into Python.
+
+		``copyfile`` uses the OS fast path (sendfile / CopyFile2), and the rename
+		makes the swap atomic for readers. The sctoapi file is kept rather than
+		moved or hard-linked, so the next download cannot rewrite the published
+		copy in place.
+		"""
+		destination.parent.mkdir(parents=True, exist_ok=True)
+		temp_path = destination.with_name(f"{destination.name}.tmp")
+		shutil.copyfile(source, temp_path)
+		os.replace(temp_path, destination)
+
+	@staticmethod
+	def _normalize_scto_row(item: dict[str, object]) -> dict[str, str]:
+		normalized: dict[str, str] = {}
+		for key, value in item.items():
+			if isinstance(value, (dict, list)):
+				normalized[str(key)] = json.dumps(value, ensure_ascii=False)
+			else:
+				normalized[str(key)] = "" if value is None else str(value)
+		return normalized
+
+	def _iter_scto_json_rows(self, json_path: Path) -> Iterator[dict[str, str]]:
+		"""Stream submission rows from a list payload or its ``data`` / ``items`` array."""
+		for item in iter_json_array(json_path, keys=("data", "items")):
+			if isinstance(item, dict):
+				yield self._normalize_scto_row(item)
+
+	def _convert_scto_json_to_csv(self, json_path: Path, csv_path: Path) -> int:
+		"""Convert sctoapi JSON to CSV in two streaming passes; returns the row count.
 
-	def _rows_from_scto_json(self, json_path: Path) -> list[dict[str, str]]:
+		The first pass only collects the column union (in first-seen order), so
+		memory stays at one submission plus the header regardless of file size.
+		"""
+		csv_path.parent.mkdir(parents=True, exist_ok=True)
+		temp_path = csv_path.with_name(f"{csv_path.name}.tmp")
 		try:
-			payload = json.loads(json_path.read_text(encoding="utf-8"))
+			fieldnames = list(
+				dict.fromkeys(key for row in self._iter_scto_json_rows(json_path) for key in row)
+			)
+			rows = 0
+			with temp_path.open("w", encoding="utf-8-sig", newline="") as handle:
+				if fieldnames:
+					writer = csv.DictWriter(handle, fieldnames=fieldnames, restval="")
+					writer.writeheader()
+					for row in self._iter_scto_json_rows(json_path):
+						writer.writerow(row)
+						rows += 1
 		except Exception as error:
-			raise RuntimeError(f"Failed parsing sctoapi JSON output: {json_path}") from error
-
-		if isinstance(payload, list):
-			raw_rows = payload
-		elif isinstance(payload, dict):
-			candidate = payload.get("data")
-			if not isinstance(candidate, list):
-				candidate = payload.get("items")
-			raw_rows = candidate if isinstance(candidate, list) else []
-		else:
-			raw_rows = []
-
-		rows: list[dict[str, str]] = []
-		for item in raw_rows:
-			if not isinstance(item, dict):
-				continue
-			normalized: dict[str, str] = {}
-			for key, value in item.items():
-				if isinstance(value, (dict, list)):
-					normalized[str(key)] = json.dumps(value, ensure_ascii=False)
-				else:
-					normalized[str(key)] = "" if value is None else str(value)
-			rows.append(normalized)
+			temp_path.unlink(missing_ok=True)
+			if isinstance(error, ValueError):
+				raise RuntimeError(f"Failed parsing sctoapi JSON output: {json_path}") from error
+			raise
+		os.replace(temp_path, csv_path)
 		return rows
 
-	def _write_rows_csv(self, rows: list[dict[str, str]], csv_path: Path) -> None:
-		csv_path.parent.mkdir(parents=True, exist_ok=True)
-		fieldnames: list[str] = []
-		seen: set[str] = set()
-		for row in rows:
-			for key in row:
-				if key not in seen:
-					seen.add(key)
-					fieldnames.append(key)
-
-		with csv_path.open("w", encoding="utf-8-sig", newline="") as handle:
-			if not fieldnames:
-				handle.write("")
-				return
-			writer = csv.DictWriter(handle, fieldnames=fieldnames)
-			writer.writeheader()
-			for row in rows:
-				writer.writerow({name: row.get(name, "") for name in fieldnames})
-
 	def _build_sctoapi_script(self, *, form_id: str, output_folder: Path) -> str:
 		def _stata_escape(value: str) -> str:
 			return value.replace('"', '""')
@@ -333,7 +496,9 @@ class RemoteAutomationService:
 			except Exception:
 				pass
 
-	async def _run_stata_do_file(self, do_file: Path) -> str:
+	async def _run_stata_do_file(
+		self, do_file: Path, *, progress: ProgressCallback | None = None,
+	) -> str:
 		if not do_file.exists():
 			raise FileNotFoundError(f"Stata do-file not found: {do_file}")
 
@@ -345,28 +510,61 @@ class RemoteAutomationService:
 			stdout=asyncio.subprocess.PIPE,
 			stderr=asyncio.subprocess.PIPE,
 		)
+		monitor = StataOutputMonitor(do_file.stem)
+
+		async def _pump(stream: asyncio.StreamReader, name: str) -> None:
+			while chunk := await stream.read(65536):
+				monitor.feed(name, chunk)
+
+		async def _live_tail() -> None:
+			interval = settings.stata_live_tail_seconds
+			if progress is None or interval <= 0:
+				return
+			while True:
+				await asyncio.sleep(interval)
+				line = monitor.take_live_line()
+				if line:
+					await progress(f"{do_file.name} ▸ {line[:150]}")
+
+		timeout = max(settings.stata_run_timeout_seconds, 60)
+		tail_task = asyncio.create_task(_live_tail())
 		try:
-			stdout_bytes, stderr_bytes = await asyncio.wait_for(
-				proc.communicate(),
-				timeout=max(settings.stata_run_timeout_seconds, 60),
+			await asyncio.wait_for(
+				asyncio.gather(
+					_pump(proc.stdout, "stdout"),  # type: ignore[arg-type]
+					_pump(proc.stderr, "stderr"),  # type: ignore[arg-type]
+					proc.wait(),
+				),
+				timeout=timeout,
 			)
 		except TimeoutError as error:
 			proc.kill()
 			await proc.wait()
 			raise TimeoutError(
-				f"Stata timed out for {do_file.name} after {settings.stata_run_timeout_seconds}s"
+				f"Stata timed out for {do_file.name} after {timeout}s; "
+				f"last output: {' | '.join(monitor.last_lines(3))[:300]}"
 			) from error
+		except asyncio.CancelledError:
+			proc.kill()
+			await proc.wait()
+			raise
+		finally:
+			tail_task.cancel()
+			monitor.close()
 
-		stdout_text = stdout_bytes.decode("utf-8", errors="ignore").strip()
-		stderr_text = stderr_bytes.decode("utf-8", errors="ignore").strip()
-		if proc.returncode != 0:
+		tail = " | ".join(monitor.last_lines(5))
+		if proc.returncode != 0 or monitor.fatal_error:
+			reason = monitor.fatal_error or f"code {proc.returncode}"
 			raise RuntimeError(
-				f"Stata failed for {do_file.name} (code {proc.returncode}). "
-				f"stderr: {stderr_text[:500]}"
+				f"Stata failed for {do_file.name} ({reason}). "
+				f"Last output: {tail[:500]}; full log: {monitor.log_path}"
 			)
 
-		preview = stdout_text[:300] if stdout_text else "ok"
-		return f"Ran {do_file.name}: {preview}"
+		captured = f", {len(monitor.errors)} captured r() error(s)" if monitor.errors else ""
+		return (
+			f"Ran {do_file.name}: {monitor.line_count} lines{captured}; "
+			f"log {monitor.log_path.name}; tail: {tail[:200] or 'ok'}"
+		)
 
 	async def _append_log(
 		self,
@@ -375,14 +573,17 @@ class RemoteAutomationService:
 		requester: str,
 		ok: bool,
 		details: list[str],
+		nodes: list[dict[str, object]] | None = None,
 	) -> None:
-		event = {
+		event: dict[str, object] = {
 			"timestamp": datetime.now(UTC).isoformat(),
 			"job_name": job_name,
 			"requester": requester,
 			"ok": ok,
 			"details": details,
 		}
+		if nodes is not None:
+			event["nodes"] = nodes
 		self.log_path.parent.mkdir(parents=True, exist_ok=True)
 
 		def _write() -> None:
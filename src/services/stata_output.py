@@ -0,0 +1,120 @@
+"""Bounded, line-by-line handling of Stata batch output."""
+
+import codecs
+import re
+from collections import deque
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TextIO
+
+from src.config import settings
+
+# Stata prints a return code on its own line after an error, e.g. ``r(111);``
+ERROR_PATTERN = re.compile(r"^\s*r\((\d+)\);\s*$")
+_TRAILER_LINES = {"", ".", "end of do-file"}
+_MAX_LINE_CHARS = 65536
+
+
+class StataOutputMonitor:
+	"""Keeps the last N lines, spots ``r(###);`` errors, and spools everything to disk.
+
+	Captured errors (``capture noisily``) are counted but only an error with no
+	further output after it, i.e. the one that ended the do-file, is fatal.
+	"""
+
+	def __init__(
+		self,
+		label: str,
+		*,
+		log_dir: Path | None = None,
+		tail_lines: int | None = None,
+		keep_files: int | None = None,
+	) -> None:
+		"""Open the spool file for this run and prune old ones."""
+		self.label = label
+		self.tail: deque[str] = deque(maxlen=max(tail_lines or settings.stata_tail_lines, 10))
+		self.errors: list[str] = []
+		self.line_count = 0
+		self._pending_error: str | None = None
+		self._partial: dict[str, str] = {}
+		self._decoders: dict[str, codecs.IncrementalDecoder] = {}
+		self._unpushed = False
+
+		directory = log_dir or Path(settings.stata_log_dir)
+		directory.mkdir(parents=True, exist_ok=True)
+		stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%f")
+		self.log_path = directory / f"{label}_{stamp}.log"
+		self._spool: TextIO | None = self.log_path.open("w", encoding="utf-8")
+		keep = keep_files if keep_files is not None else settings.stata_log_keep_files
+		self._prune(directory, max(keep, 1) - 1)
+
+	def _prune(self, directory: Path, keep_others: int) -> None:
+		logs = sorted(
+			(path for path in directory.glob("*.log") if path != self.log_path),
+			key=lambda path: (path.stat().st_mtime_ns, path.name),
+			reverse=True,
+		)
+		for stale in logs[keep_others:]:
+			stale.unlink(missing_ok=True)
+
+	def feed(self, stream: str, chunk: bytes) -> None:
+		"""Consume a raw chunk from stdout or stderr, emitting complete lines."""
+
+		decoder = self._decoders.setdefault(
+			stream, codecs.getincrementaldecoder("utf-8")(errors="replace")
+		)
+		text = self._partial.get(stream, "") + decoder.decode(chunk)
+		*lines, rest = text.split("\n")
+		if len(rest) > _MAX_LINE_CHARS:
+			lines.append(rest)
+			rest = ""
+		self._partial[stream] = rest
+		for line in lines:
+			self._line(stream, line.rstrip("\r")[:_MAX_LINE_CHARS])
+
+	def _line(self, stream: str, line: str) -> None:
+		self.line_count += 1
+		shown = f"[stderr] {line}" if stream == "stderr" else line
+		if self._spool is not None:
+			self._spool.write(shown + "\n")
+		self.tail.append(shown)
+		self._unpushed = True
+
+		match = ERROR_PATTERN.match(line)
+		if match:
+			previous = next((item for item in reversed(list(self.tail)[:-1]) if item.strip()), "")
+			error = f"r({match.group(1)}) after: {previous.strip()[:200]}"
+			self.errors.append(error)
+			self._pending_error = error
+		elif line.strip() not in _TRAILER_LINES:
+			self._pending_error = None
+
+	def close(self) -> None:
+		"""Flush partial lines and close the spool file."""
+
+		for stream, rest in list(self._partial.items()):
+			if rest:
+				self._line(stream, rest.rstrip("\r"))
+		self._partial.clear()
+		if self._spool is not None:
+			self._spool.close()
+			self._spool = None
+
+	@property
+	def fatal_error(self) -> str | None:
+		"""Return the error that ended the run, if output stopped at one."""
+		return self._pending_error
+
+	def take_live_line(self) -> str | None:
+		"""Return the newest non-blank line if output arrived since the last call."""
+
+		if not self._unpushed:
+			return None
+		self._unpushed = False
+		return next((item.strip() for item in reversed(self.tail) if item.strip()), None)
+
+	def last_lines(self, count: int = 5) -> list[str]:
+		"""Return the last few non-blank lines of output."""
+
+		lines = [item for item in self.tail if item.strip()]
+		return lines[-count:]
@@ -0,0 +1,332 @@
+"""Local SQLite warehouse for downloaded SurveyCTO form exports."""
+
+import asyncio
+import csv
+import re
+import sqlite3
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from src.config import settings
+from src.utils.logger import get_logger
+
+log = get_logger("submission_warehouse")
+
+# Columns indexed on every form table when present in the export header.
+INDEXED_COLUMNS = ("KEY", "caseid", "enumerator", "submissiondate", "team")
+
+# Normalized ISO-8601 submission timestamp added to every table.
+SUBMITTED_AT_COLUMN = "_submitted_at"
+
+_SUBMISSION_DATE_FORMATS = (
+	"%b %d, %Y %I:%M:%S %p",
+	"%Y-%m-%dT%H:%M:%S",
+	"%Y-%m-%d %H:%M:%S",
+	"%Y-%m-%d",
+)
+
+
+def _quote(identifier: str) -> str:
+	return '"' + identifier.replace('"', '""') + '"'
+
+
+def _normalize_submission_date(value: str) -> str:
+	"""Convert SurveyCTO submission dates into sortable ISO strings."""
+
+	cleaned = value.strip()
+	if not cleaned:
+		return ""
+	for fmt in _SUBMISSION_DATE_FORMATS:
+		try:
+			return datetime.strptime(cleaned, fmt).isoformat()
+		except ValueError:
+			continue
+	return ""
+
+
+@dataclass
+class IngestStats:
+	"""Outcome of loading one export into the warehouse."""
+
+	form_key: str
+	table: str
+	rows: int
+	columns: int
+	indexed: list[str]
+	seconds: float
+
+	def detail(self) -> str:
+		"""Render a one-line job detail."""
+		return (
+			f"warehouse_loaded form={self.form_key} rows={self.rows} "
+			f"columns={self.columns} indexed={','.join(self.indexed) or '-'} "
+			f"in {self.seconds:.2f}s"
+		)
+
+
+class SubmissionWarehouse:
+	"""Bulk-loads form CSV exports into per-form SQLite tables for fast queries."""
+
+	def __init__(self, db_path: Path | None = None, batch_size: int = 5000) -> None:
+		"""Initialize with database location and insert batch size."""
+		self.db_path = db_path or Path(settings.submission_warehouse_path)
+		self.batch_size = max(batch_size, 1)
+		# Each ingest holds one long write transaction, so concurrent loads of
+		# the same file would time out on the SQLite write lock.
+		self._ingest_lock = asyncio.Lock()
+
+	@staticmethod
+	def table_name(form_key: str) -> str:
+		"""Return the SQLite table name used for a form key."""
+		return "form_" + re.sub(r"[^a-zA-Z0-9_]+", "_", form_key.strip().lower())
+
+	def _connect(self) -> sqlite3.Connection:
+		self.db_path.parent.mkdir(parents=True, exist_ok=True)
+		conn = sqlite3.connect(self.db_path)
+		conn.execute("PRAGMA journal_mode=WAL")
+		conn.execute("PRAGMA synchronous=NORMAL")
+		return conn
+
+	@staticmethod
+	def _unique_headers(raw_headers: list[str]) -> list[str]:
+		headers: list[str] = []
+		seen: set[str] = set()
+		for index, value in enumerate(raw_headers):
+			name = value.strip() or f"column_{index + 1}"
+			candidate = name
+			suffix = 2
+			while candidate.lower() in seen or candidate == SUBMITTED_AT_COLUMN:
+				candidate = f"{name}_{suffix}"
+				suffix += 1
+			seen.add(candidate.lower())
+			headers.append(candidate)
+		return headers
+
+	def _ingest(self, form_key: str, csv_path: Path) -> IngestStats:
+		started = time.perf_counter()
+		table = self.table_name(form_key)
+		staging = f"{table}__staging"
+
+		with csv_path.open("r", encoding="utf-8-sig", newline="") as handle:
+			reader = csv.reader(handle)
+			raw_headers = next(reader, [])
+			if not raw_headers:
+				raise ValueError(f"CSV export has no header row: {csv_path}")
+			headers = self._unique_headers(raw_headers)
+			by_lower = {name.lower(): name for name in headers}
+			date_column = by_lower.get("submissiondate")
+			date_index = headers.index(date_column) if date_column else -1
+			width = len(headers)
+
+			def _rows() -> Iterator[list[str]]:
+				for row in reader:
+					if len(row) < width:
+						row = row + [""] * (width - len(row))
+					elif len(row) > width:
+						row = row[:width]
+					stamp = _normalize_submission_date(row[date_index]) if date_index >= 0 else ""
+					yield [*row, stamp]
+
+			columns = [*headers, SUBMITTED_AT_COLUMN]
+			column_sql = ", ".join(f"{_quote(name)} TEXT" for name in columns)
+			placeholders = ", ".join("?" for _ in columns)
+			insert_sql = f"INSERT INTO {_quote(staging)} VALUES ({placeholders})"
+
+			conn = self._connect()
+			try:
+				with conn:
+					conn.execute(f"DROP TABLE IF EXISTS {_quote(staging)}")
+					conn.execute(f"CREATE TABLE {_quote(staging)} ({column_sql})")
+					total = 0
+					batch: list[list[str]] = []
+					for row in _rows():
+						batch.append(row)
+						if len(batch) >= self.batch_size:
+							conn.executemany(insert_sql, batch)
+							total += len(batch)
+							batch = []
+					if batch:
+						conn.executemany(insert_sql, batch)
+						total += len(batch)
+
+					conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+					conn.execute(f"ALTER TABLE {_quote(staging)} RENAME TO {_quote(table)}")
+
+					indexed: list[str] = []
+					for wanted in (*INDEXED_COLUMNS, SUBMITTED_AT_COLUMN):
+						actual = by_lower.get(wanted.lower()) or (
+							wanted if wanted == SUBMITTED_AT_COLUMN else None
+						)
+						if actual is None:
+							continue
+						index_name = f"ix_{table}_{re.sub(r'[^a-zA-Z0-9_]+', '_', actual.lower())}"
+						conn.execute(
+							f"CREATE INDEX {_quote(index_name)} "
+							f"ON {_quote(table)} ({_quote(actual)})"
+						)
+						indexed.append(actual)
+				conn.execute("ANALYZE")
+			finally:
+				conn.close()
+
+		return IngestStats(
+			form_key=form_key,
+			table=table,
+			rows=total,
+			columns=len(headers),
+			indexed=indexed,
+			seconds=time.perf_counter() - started,
+		)
+
+	async def ingest_csv(self, form_key: str, csv_path: Path) -> IngestStats:
+		"""Replace the form table with the contents of a fresh CSV export.
+
+		Ingests are serialized; a second export waits for the first to commit.
+		"""
+
+		async with self._ingest_lock:
+			stats = await asyncio.to_thread(self._ingest, form_key, csv_path)
+		log.info(
+			"submission_warehouse.ingested",
+			form=form_key,
+			rows=stats.rows,
+			columns=stats.columns,
+			seconds=round(stats.seconds, 3),
+		)
+		return stats
+
+	# ------------------------------------------------------------------
+	# Query API
+	# ------------------------------------------------------------------
+
+	def _columns(self, conn: sqlite3.Connection, table: str) -> dict[str, str]:
+		rows = conn.execute(f"PRAGMA table_info({_quote(table)})").fetchall()
+		return {str(row[1]).lower(): str(row[1]) for row in rows}
+
+	def _resolve_column(self, conn: sqlite3.Connection, table: str, column: str) -> str:
+		columns = self._columns(conn, table)
+		if not columns:
+			raise LookupError(f"No warehouse data loaded for table {table}")
+		actual = columns.get(column.lower())
+		if actual is None:
+			raise KeyError(f"Column '{column}' not found in {table}")
+		return actual
+
+	def _query(self, sql: str, params: tuple[object, ...]) -> list[tuple[Any, ...]]:
+		conn = self._connect()
+		try:
+			return conn.execute(sql, params).fetchall()
+		finally:
+			conn.close()
+
+	def has_form(self, form_key: str) -> bool:
+		"""Return True when a table exists for the form key."""
+
+		if not self.db_path.exists():
+			return False
+		rows = self._query(
+			"SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+			(self.table_name(form_key),),
+		)
+		return bool(rows)
+
+	async def row_count(self, form_key: str, since: datetime | None = None) -> int:
+		"""Count submissions for a form, optionally since a timestamp."""
+
+		table = self.table_name(form_key)
+
+		def _count() -> int:
+			if since is None:
+				sql = f"SELECT COUNT(*) FROM {_quote(table)}"
+				rows = self._query(sql, ())
+			else:
+				sql = (
+					f"SELECT COUNT(*) FROM {_quote(table)} "
+					f"WHERE {_quote(SUBMITTED_AT_COLUMN)} >= ?"
+				)
+				rows = self._query(sql, (since.replace(tzinfo=None).isoformat(),))
+			return int(rows[0][0]) if rows else 0
+
+		return await asyncio.to_thread(_count)
+
+	async def counts_by(
+		self,
+		form_key: str,
+		column: str,
+		since: datetime | None = None,
+	) -> list[tuple[str, int]]:
+		"""Return submission counts grouped by a column, largest first."""
+
+		table = self.table_name(form_key)
+
+		def _counts() -> list[tuple[str, int]]:
+			conn = self._connect()
+			try:
+				actual = _quote(self._resolve_column(conn, table, column))
+				sql = f"SELECT {actual}, COUNT(*) FROM {_quote(table)}"
+				params: tuple[object, ...] = ()
+				if since is not None:
+					sql += f" WHERE {_quote(SUBMITTED_AT_COLUMN)} >= ?"
+					params = (since.replace(tzinfo=None).isoformat(),)
+				sql += f" GROUP BY {actual} ORDER BY COUNT(*) DESC, {actual}"
+				rows = conn.execute(sql, params).fetchall()
+			finally:
+				conn.close()
+			return [(str(value or ""), int(count)) for value, count in rows]
+
+		return await asyncio.to_thread(_counts)
+
+	async def find_rows(self, form_key: str, column: str, value: str) -> list[dict[str, str]]:
+		"""Return rows whose indexed column equals a value."""
+
+		table = self.table_name(form_key)
+
+		def _find() -> list[dict[str, str]]:
+			conn = self._connect()
+			try:
+				actual = self._resolve_column(conn, table, column)
+				cursor = conn.execute(
+					f"SELECT * FROM {_quote(table)} WHERE {_quote(actual)} = ?",
+					(value,),
+				)
+				names = [item[0] for item in cursor.description]
+				return [
+					{name: str(cell or "") for name, cell in zip(names, row, strict=True)}
+					for row in cursor.fetchall()
+				]
+			finally:
+				conn.close()
+
+		return await asyncio.to_thread(_find)
+
+	async def missing_from(
+		self,
+		form_key: str,
+		other_form_key: str,
+		on: str = "caseid",
+	) -> list[str]:
+		"""Return distinct join keys in one form that have no row in another form."""
+
+		table = self.table_name(form_key)
+		other = self.table_name(other_form_key)
+
+		def _missing() -> list[str]:
+			conn = self._connect()
+			try:
+				left = _quote(self._resolve_column(conn, table, on))
+				right = _quote(self._resolve_column(conn, other, on))
+				rows = conn.execute(
+					f"SELECT DISTINCT a.{left} FROM {_quote(table)} AS a "
+					f"WHERE a.{left} <> '' AND NOT EXISTS ("
+					f"SELECT 1 FROM {_quote(other)} AS b WHERE b.{right} = a.{left}"
+					f") ORDER BY a.{left}"
+				).fetchall()
+			finally:
+				conn.close()
+			return [str(row[0]) for row in rows]
+
+		return await asyncio.to_thread(_missing)
@@ -4,12 +4,41 @@ import re
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from src.config import settings
+from src.integrations.xlsform_logic import render_upstream_chain
+from src.integrations.xlsform_vectors import VariableCandidate, XLSFormVectorStore
+from src.knowledge.metadata import DOC_GROUP_QUESTIONNAIRE, ChunkFilter
+
 if TYPE_CHECKING:
 	from src.integrations.google_sheets import GoogleSheetsClient
 	from src.integrations.openai_client import OpenAIClient
+	from src.knowledge.retriever import KnowledgeRetriever
 
 
 _VARIABLE_PATTERN = re.compile(r"\b[a-zA-Z][a-zA-Z0-9_]{2,}\b")
+_CONTROLS_PATTERNS = (
+	re.compile(
+		r"\bwhat\s+(?:controls|drives|determines|affects|triggers)\s+"
+		r"(?:the\s+)?(?:question\s+|variable\s+)?[`$\{]*([A-Za-z][A-Za-z0-9_]*)",
+		re.IGNORECASE,
+	),
+	re.compile(
+		r"\bwhat\s+(?:does|do)\s+[`$\{]*([A-Za-z][A-Za-z0-9_]*)[`\}]*\s+depends?\s+on\b",
+		re.IGNORECASE,
+	),
+)
+
+# Snapshot key (``settings.surveycto_form_sheet_ids``) and SurveyCTO form ID
+# setting for each ``detect_form_name`` label.
+_FORM_KEYS = {
+	"HH Survey": ("hh_survey", "surveycto_form_household_id"),
+	"ICM Business": ("icm_business", "surveycto_form_business_id"),
+	"Phase A Revisit": ("phase_a_revisit", "surveycto_form_phase_a_id"),
+}
+
+
+def _form_token(name: str) -> str:
+	return re.sub(r"[^a-z0-9]+", "", name.lower())
 
 
 @dataclass
@@ -50,10 +79,17 @@ class SurveyCTODiagnosis:
 class SurveyCTOIssueService:
 	"""Generates suggestions/explanations for SurveyCTO form issues."""
 
-	def __init__(self, sheets_client: "GoogleSheetsClient", openai_client: "OpenAIClient") -> None:
+	def __init__(
+		self,
+		sheets_client: "GoogleSheetsClient",
+		openai_client: "OpenAIClient",
+		retriever: "KnowledgeRetriever | None" = None,
+	) -> None:
 		"""Initialize dependencies."""
 		self.sheets_client = sheets_client
 		self.openai_client = openai_client
+		self.retriever = retriever
+		self.question_index = XLSFormVectorStore(openai_client)
 
 	def extract_variable_hints(self, issue_text: str) -> list[str]:
 		"""Extract candidate variable names from issue text."""
@@ -119,6 +155,76 @@ class SurveyCTOIssueService:
 			"skip logic issue so we can patch it."
 		)
 
+	@staticmethod
+	def metadata_forms(form_name: str, indexed_forms: set[str]) -> frozenset[str]:
+		"""Map a ``detect_form_name`` label to the form names chunks carry in the index.
+
+		Questionnaire docs are tagged with their file stem (usually the SurveyCTO
+		form ID) or a front-matter ``form``, so the label, snapshot key and form
+		ID are all tried, ignoring case, punctuation and version suffixes.
+		"""
+
+		form_key, form_id_setting = _FORM_KEYS.get(form_name, ("", ""))
+		form_id = str(getattr(settings, form_id_setting, "")) if form_id_setting else ""
+		candidates = {_form_token(name) for name in (form_name, form_key, form_id)}
+		candidates.discard("")
+		return frozenset(
+			indexed
+			for indexed in indexed_forms
+			if any(_form_token(indexed).startswith(candidate) for candidate in candidates)
+		)
+
+	async def questionnaire_context(self, issue_text: str, form_name: str) -> str:
+		"""Return questionnaire/XLSForm chunks relevant to the issue (KB only)."""
+
+		if self.retriever is None:
+			return ""
+		filters = ChunkFilter(
+			doc_groups=frozenset({DOC_GROUP_QUESTIONNAIRE}),
+			forms=self.metadata_forms(form_name, self.retriever.forms),
+		)
+		matches = await self.retriever.search(issue_text, top_k=3, filters=filters)
+		return "\n\n".join(chunk.text for chunk in matches)
+
+	async def dependency_chain(self, variable_hints: list[str]) -> tuple[str, str, str] | None:
+		"""Return (variable, form, upstream logic chain) for the first hint a form defines."""
+
+		snapshots = await self.sheets_client.current_form_snapshots()
+		for hint in variable_hints:
+			for form_key, snapshot in snapshots.items():
+				if hint in snapshot.graph:
+					return hint, form_key, render_upstream_chain(snapshot.graph, hint, form_key)
+		return None
+
+	async def candidate_variables(self, issue_text: str, top_k: int = 5) -> list[VariableCandidate]:
+		"""Locate variables whose question text matches a described symptom."""
+
+		snapshots = await self.sheets_client.current_form_snapshots()
+		if not snapshots:
+			return []
+		candidates = await self.question_index.candidates(snapshots, issue_text, top_k)
+		return [
+			candidate
+			for candidate in candidates
+			if candidate.score >= settings.xlsform_semantic_min_score
+		]
+
+	async def answer_controls_question(self, question: str) -> str | None:
+		"""Answer "what controls X?" from the form dependency graphs, without the LLM.
+
+		Returns None unless the question has that shape and X is a form variable.
+		"""
+
+		names = [
+			match.group(1)
+			for pattern in _CONTROLS_PATTERNS
+			if (match := pattern.search(question)) is not None
+		]
+		if not names:
+			return None
+		chain = await self.dependency_chain(names)
+		return chain[2] if chain is not None else None
+
 	async def diagnose(self, issue_text: str) -> SurveyCTODiagnosis:
 		"""Return structured diagnosis aligned to SurveyCTO troubleshooting guide."""
 		variable_hints = self.extract_variable_hints(issue_text)
@@ -126,18 +232,37 @@ class SurveyCTOIssueService:
 		issue_type = self.detect_issue_type(issue_text)
 		form_name = self.detect_form_name(issue_text)
 		workaround = self.workaround_for(issue_type)
+		logic_context = ""
+		chain = await self.dependency_chain(variable_hints)
+		if chain is None:
+			# No variable named (or none a form defines): match the symptom to questions.
+			candidates = await self.candidate_variables(issue_text)
+			if candidates:
+				variable_hints = list(
+					dict.fromkeys([candidate.name for candidate in candidates] + variable_hints)
+				)
+				chain = await self.dependency_chain(variable_hints)
+		if chain is not None:
+			variable_name, form_key, logic_context = chain
+			if form_name == "Unknown":
+				form_name = form_key
 		form_context = await self.sheets_client.surveycto_issue_context(issue_text, variable_hints)
+		kb_context = await self.questionnaire_context(issue_text, form_name)
 
 		system_prompt = (
 			"You are diagnosing SurveyCTO form issues for field users. "
 			"Follow this method: identify variable, identify issue type, "
 			"inspect relevance/constraint/calculation, "
+			"follow the upstream logic chain when one is given, "
 			"then explain plain-English behavior. "
 			"Return EXACTLY 2 lines:\n"
 			"DIAGNOSIS: <short explanation>\n"
 			"SUGGESTED_FIX: <what to change in xlsform logic>"
 		)
-		context = form_context or "No matching rows found in configured form sheets."
+		parts = (logic_context, form_context, kb_context)
+		context = "\n\n".join(part for part in parts if part) or (
+			"No matching rows found in configured form sheets."
+		)
 		answer = await self.openai_client.chat_with_system_prompt(
 			system_prompt=system_prompt,
 			user_message=issue_text,
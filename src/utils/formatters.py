@@ -18,15 +18,16 @@ def format_case_embed_text(case: CaseRecord) -> str:
 	)
 
 
-def format_progress_text(values: dict[str, float], label: str) -> str:
-	"""Format progress metric map for Discord replies."""
+def format_progress_text(values: dict[str, float], label: str, note: str = "") -> str:
+	"""Format progress metric map for Discord replies, with an optional footer note."""
 
-	return (
+	text = (
 		f"{label}\n"
 		f"Completed: {values.get('completed', 0):.1f}\n"
 		f"Target: {values.get('target', 0):.1f}\n"
 		f"Rate: {values.get('rate', 0):.1f}%"
 	)
+	return f"{text}\n{note}" if note else text
 
 
 def format_escalation_text(escalation_id: int) -> str:
@@ -0,0 +1,101 @@
+"""Incremental reader for large JSON arrays, one element in memory at a time."""
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+_CHUNK_CHARS = 1024 * 1024
+_WHITESPACE = " \t\r\n"
+
+
+class _Buffer:
+	"""Sliding text window over a file, refilled on demand."""
+
+	def __init__(self, handle: Any) -> None:
+		self.handle = handle
+		self.text = ""
+		self.pos = 0
+		self.eof = False
+
+	def fill(self) -> bool:
+		"""Append the next chunk, dropping consumed text; False at end of file."""
+		if self.eof:
+			return False
+		chunk = self.handle.read(_CHUNK_CHARS)
+		if not chunk:
+			self.eof = True
+			return False
+		self.text = self.text[self.pos :] + chunk
+		self.pos = 0
+		return True
+
+	def peek(self) -> str:
+		"""Return the next non-whitespace character without consuming it ('' at EOF)."""
+		while True:
+			while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+				self.pos += 1
+			if self.pos < len(self.text):
+				return self.text[self.pos]
+			if not self.fill():
+				return ""
+
+	def expect(self, char: str) -> None:
+		if self.peek() != char:
+			raise ValueError(f"Expected {char!r} at offset {self.pos}")
+		self.pos += 1
+
+	def value(self, decoder: json.JSONDecoder) -> Any:
+		"""Decode one complete JSON value, reading more input if it is cut off."""
+		self.peek()
+		while True:
+			try:
+				item, end = decoder.raw_decode(self.text, self.pos)
+			except json.JSONDecodeError:
+				if self.fill():
+					continue
+				raise
+			# A number or literal at the very end of the window may continue in the next chunk.
+			if end == len(self.text) and not self.eof and self.fill():
+				continue
+			self.pos = end
+			return item
+
+
+def iter_json_array(path: Path, keys: tuple[str, ...] = ()) -> Iterator[Any]:
+	"""Yield elements of a top-level JSON array, or of the first array under ``keys``.
+
+	Other top-level members of an object payload are decoded and discarded one
+	at a time, so memory stays bounded by the largest single element.
+	"""
+
+	decoder = json.JSONDecoder()
+	with path.open("r", encoding="utf-8-sig") as handle:
+		buffer = _Buffer(handle)
+		first = buffer.peek()
+		if first == "{":
+			buffer.expect("{")
+			while True:
+				if buffer.peek() == "}":
+					return
+				key = buffer.value(decoder)
+				buffer.expect(":")
+				if key in keys and buffer.peek() == "[":
+					break
+				buffer.value(decoder)
+				if buffer.peek() == ",":
+					buffer.expect(",")
+		elif first != "[":
+			buffer.value(decoder)
+			return
+
+		buffer.expect("[")
+		if buffer.peek() == "]":
+			return
+		while True:
+			yield buffer.value(decoder)
+			if buffer.peek() == ",":
+				buffer.expect(",")
+				continue
+			buffer.expect("]")
+			return
@@ -0,0 +1,30 @@
+"""Tests for diff-only form version announcements."""
+
+import uuid
+
+import pytest
+
+from src.db.engine import init_db
+from src.db.repositories.announcement_repo import AnnouncementRepository
+from src.services.announcement_service import AnnouncementService
+
+
+@pytest.mark.asyncio
+async def test_only_changed_form_versions_are_pending() -> None:
+	"""First sight is a silent baseline; a change stays pending until announced."""
+	await init_db()
+	service = AnnouncementService(AnnouncementRepository())
+	form = f"HH Survey {uuid.uuid4().hex[:8]}"
+
+	assert await service.pending_form_updates({form: "2501"}) == []
+	assert await service.pending_form_updates({form: "2501"}) == []
+
+	pending = await service.pending_form_updates({form: "2502"})
+	assert [(record.form_id, record.version) for record in pending] == [(form, "2502")]
+	# Not yet posted (e.g. the bot restarted mid-run): still pending next time.
+	assert [record.version for record in await service.pending_form_updates({form: "2502"})] == [
+		"2502"
+	]
+
+	await service.mark_form_update_announced(pending[0])
+	assert await service.pending_form_updates({form: "2502"}) == []
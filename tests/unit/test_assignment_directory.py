@@ -0,0 +1,65 @@
+"""Tests for the indexed assignment directory."""
+
+import pytest
+
+from src.services.assignment_directory import AssignmentDirectory
+from src.services.assignment_service import AssignmentService
+
+_ROWS = [
+	{"case_id": "H019412021", "team": "team_a", "fo": "FO-1"},
+	{"case_id": "H019412035", "team": "Team_B", "fo": "FO-2"},
+	{"case_id": 1020, "team": "team_a", "fo": "FO-1"},
+	{"case_id": "h019412021", "team": "team_c", "fo": "FO-3"},
+	{"case_id": "H020000001", "team": "team_b", "fo": "fo-2"},
+]
+
+
+def test_lookups_are_case_insensitive_and_keep_first_row() -> None:
+	"""Exact and batch lookups match the old linear scans, first row winning."""
+	directory = AssignmentDirectory(_ROWS)
+
+	assert directory.case("h019412021 ")["team"] == "team_a"
+	assert directory.case("1020")["fo"] == "FO-1"
+	assert directory.cases(["H019412035", "missing"]) == {
+		"H019412035": _ROWS[1],
+		"missing": None,
+	}
+	assert directory.team("TEAM_B") == [_ROWS[1], _ROWS[4]]
+	assert directory.team_for_fo("fo-2") == "Team_B"
+	assert directory.team_for_fo("FO-9") is None
+
+
+def test_prefix_lookup_walks_sorted_case_ids() -> None:
+	"""Prefix matches come back in case ID order and stop at the limit."""
+	directory = AssignmentDirectory(_ROWS)
+
+	assert [row["case_id"] for row in directory.cases_with_prefix("h0194")] == [
+		"H019412021",
+		"H019412035",
+	]
+	assert len(directory.cases_with_prefix("h0", limit=1)) == 1
+	assert directory.cases_with_prefix("") == []
+	assert directory.cases_with_prefix("z") == []
+
+
+class _Sheets:
+	def __init__(self) -> None:
+		self.rows = list(_ROWS)
+
+	async def read_assignments(self) -> list[dict[str, str]]:
+		return self.rows
+
+
+@pytest.mark.asyncio
+async def test_directory_rebuilt_only_when_the_rows_change() -> None:
+	"""Repeated lookups against one cached read reuse the same index."""
+	sheets = _Sheets()
+	service = AssignmentService(sheets)  # type: ignore[arg-type]
+
+	first = await service.directory()
+	assert await service.where_is_case("H020000001") == _ROWS[4]
+	assert await service.directory() is first
+
+	sheets.rows = _ROWS[:1]
+	assert await service.where_is_case("H020000001") is None
+	assert await service.directory() is not first
@@ -0,0 +1,60 @@
+"""Tests for the case-ID barangay prefix lookup."""
+
+import json
+
+import pytest
+
+from src.config import settings
+from src.models.case import CaseRecord
+from src.services.barangay_lookup import BarangayLookup, Location, build_location_mapping
+from src.services.case_service import CaseService
+
+_GUINACAS = Location(barangay="Guinacas", municipality="Pototan", province="Iloilo")
+_PATAG = Location(barangay="Patag", municipality="Barotac Nuevo", province="Iloilo")
+
+
+def test_longest_prefix_wins() -> None:
+	"""A full case ID entry overrides its barangay prefix; unknown prefixes miss."""
+	lookup = BarangayLookup({"H030832": _GUINACAS, "h030832099": _PATAG})
+
+	assert len(lookup) == 2
+	assert lookup.match("H030832011") == _GUINACAS
+	assert lookup.match(" h030832099 ") == _PATAG
+	assert lookup.match("H0308") is None
+	assert lookup.match("H019412021") is None
+
+
+def test_mapping_uses_majority_location_and_pins_exceptions() -> None:
+	"""Cases that disagree with their barangay prefix get their own entry."""
+	guinacas = {"barangay": "Guinacas", "municipality": "Pototan", "province": "Iloilo"}
+	patag = {"barangay": "Patag", "municipality": "Barotac Nuevo", "province": "Iloilo"}
+	rows = [
+		{"caseid": "H030832011", "brgy_prefix": "H030832", **guinacas},
+		{"caseid": "H030832012", "brgy_prefix": "", **guinacas},
+		{"caseid": "H030832099", "brgy_prefix": "H030832", **patag},
+		{"caseid": "H099999001", "barangay": "", "municipality": "", "province": ""},
+	]
+
+	mapping = build_location_mapping(rows)
+
+	assert mapping == {"H030832": guinacas, "H030832099": patag}
+
+
+class _Survey:
+	async def get_case(self, case_id: str) -> CaseRecord:
+		return CaseRecord(case_id=case_id, status="open", barangay="Bula", municipality="Mambusao")
+
+
+@pytest.mark.asyncio
+async def test_lookup_case_fills_location_from_exported_lookup(tmp_path, monkeypatch) -> None:
+	"""Case lookups take place names from the local lookup, not the API fallback."""
+	path = tmp_path / "brgy_lookup.json"
+	entry = {"barangay": "Guinacas", "municipality": "Pototan", "province": "Iloilo"}
+	path.write_text(json.dumps({"H030832": entry}), encoding="utf-8")
+	monkeypatch.setattr(settings, "brgy_lookup_path", str(path))
+	service = CaseService(_Survey())  # type: ignore[arg-type]
+
+	assert await service.load_locations() == 1
+	case = await service.lookup_case("H030832011")
+	assert (case.barangay, case.municipality, case.province) == ("Guinacas", "Pototan", "Iloilo")
+	assert (await service.lookup_case("H019412021")).barangay == "Bula"
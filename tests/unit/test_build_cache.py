@@ -0,0 +1,34 @@
+"""Tests for DMS input fingerprints."""
+
+from pathlib import Path
+
+import pytest
+
+from src.services.build_cache import DmsBuildCache
+
+
+@pytest.mark.asyncio
+async def test_fingerprint_tracks_do_files_and_inputs(tmp_path: Path) -> None:
+	"""Edits to a sibling do-file or an input CSV invalidate the recorded run."""
+	master = tmp_path / "dms" / "master.do"
+	helper = tmp_path / "dms" / "cleaning.do"
+	master.parent.mkdir()
+	master.write_text("do cleaning.do\n", encoding="utf-8")
+	helper.write_text("drop if missing(caseid)\n", encoding="utf-8")
+	data = tmp_path / "hh.csv"
+	data.write_text("caseid\nH1\n", encoding="utf-8")
+	cache = DmsBuildCache(tmp_path / "fingerprints.json", mode="content")
+
+	check = await cache.check("dms_household", master, [data])
+	assert not check.up_to_date
+	await cache.record(check)
+	assert (await cache.check("dms_household", master, [data])).up_to_date
+
+	helper.write_text("drop if missing(caseid)\nisid caseid\n", encoding="utf-8")
+	assert not (await cache.check("dms_household", master, [data])).up_to_date
+
+
+def test_unknown_mode_is_rejected(tmp_path: Path) -> None:
+	"""Only content and stat fingerprint modes are supported."""
+	with pytest.raises(ValueError, match="fingerprint mode"):
+		DmsBuildCache(tmp_path / "fingerprints.json", mode="mtime")
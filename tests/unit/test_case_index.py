@@ -0,0 +1,53 @@
+"""Tests for case ID prefix completion."""
+
+import time
+
+import pytest
+
+from src.config import settings
+from src.services.case_index import CaseIdIndex
+from src.services.case_service import CaseService
+
+
+def test_complete_is_case_insensitive_sorted_and_bounded() -> None:
+	"""Prefixes match regardless of case; duplicates and blanks are dropped."""
+	index = CaseIdIndex(["H030832011", "h019412021", "H019412021", " ", "H019412035"])
+
+	assert len(index) == 3
+	assert index.complete("h0194") == ["h019412021", "H019412035"]
+	assert index.complete("H", limit=2) == ["h019412021", "H019412035"]
+	assert index.complete("X") == []
+	assert "H030832011" in index and "H03" not in index
+
+
+def test_complete_stays_fast_at_field_scale() -> None:
+	"""Fifty thousand cases still answer well inside the 3s autocomplete deadline."""
+	index = CaseIdIndex(f"H{number:09d}" for number in range(50_000))
+
+	started = time.perf_counter()
+	for number in range(1_000):
+		assert len(index.complete(f"H0000{number % 50:02d}")) == 25
+	assert time.perf_counter() - started < 1.0
+
+
+class _Survey:
+	def __init__(self) -> None:
+		self.rows = [{"caseid": "H019412021", "users": "team_a"}, {"id": "H030832011"}]
+
+	async def fetch_cases_rows_with_fallback(self, source_id: str, output_path=None) -> list:
+		return self.rows
+
+
+@pytest.mark.asyncio
+async def test_index_seeded_from_disk_and_refreshed_from_export(tmp_path, monkeypatch) -> None:
+	"""Startup reads the last export on disk; refreshes replace it."""
+	export = tmp_path / "cases.csv"
+	export.write_text("\ufeffcaseid,users\nH000000001,team_b\n", encoding="utf-8")
+	monkeypatch.setattr(settings, "surveycto_cases_csv_path", str(export))
+	service = CaseService(_Survey())  # type: ignore[arg-type]
+
+	assert await service.load_case_index() == 1
+	assert service.complete_case_ids("h0") == ["H000000001"]
+
+	await service.refresh_case_index()
+	assert service.complete_case_ids("H0") == ["H019412021", "H030832011"]
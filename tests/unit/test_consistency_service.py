@@ -0,0 +1,78 @@
+"""Tests for cross-form consistency hash joins."""
+
+from pathlib import Path
+
+import pytest
+
+from src.config import settings
+from src.services.consistency_service import ConsistencyService, JoinSide, stream_hash_join
+
+
+def _csv(path: Path, text: str) -> Path:
+	path.write_text(text, encoding="utf-8-sig")
+	return path
+
+
+def test_stream_hash_join_reports_orphans_and_duplicates(tmp_path: Path) -> None:
+	"""Orphans and duplicates should be attributed to the correct side."""
+	hh = _csv(tmp_path / "hh.csv", "KEY,caseid\n1,H1\n2,H2\n3,H2\n4,H3\n5,H4\n6,H5\n")
+	biz = _csv(tmp_path / "biz.csv", "KEY,caseid\n9,H1\n10,H9\n")
+
+	result = stream_hash_join(JoinSide("household", hh), JoinSide("business", biz))
+
+	assert result.build_side == "business"
+	assert result.matched == 1
+	assert result.left_only == 4
+	assert result.right_only == 1
+	assert result.right_only_sample == ["H9"]
+	assert result.left_duplicates == 1
+	assert result.right_duplicates == 0
+
+
+def test_stream_hash_join_applies_row_filter(tmp_path: Path) -> None:
+	"""Only flagged rows should participate when a filter column is set."""
+	hh = _csv(tmp_path / "hh.csv", "caseid,icm_form_status\nH1,1\nH2,0\nH3,1\n")
+	biz = _csv(tmp_path / "biz.csv", "caseid\nH1\n")
+
+	result = stream_hash_join(
+		JoinSide("household", hh, where_column="icm_form_status"),
+		JoinSide("business", biz),
+	)
+
+	assert result.left_only == 1
+	assert result.left_only_sample == ["H3"]
+
+
+@pytest.mark.asyncio
+async def test_consistency_service_flags_invalid_revisits(tmp_path: Path) -> None:
+	"""Phase A revisits must map to known cases."""
+	service = ConsistencyService(
+		household_csv=tmp_path / "missing_hh.csv",
+		business_csv=tmp_path / "missing_biz.csv",
+		phase_a_csv=_csv(tmp_path / "pa.csv", "caseid\nH1\nH7\n"),
+		cases_csv=_csv(tmp_path / "cases.csv", "id,caseid\nH1,H1\nH2,H2\n"),
+	)
+
+	report = await service.run()
+
+	assert not report.ok
+	assert any("1 revisits with unknown caseid" in line for line in report.lines)
+	assert any("skipped" in line for line in report.lines)
+
+
+@pytest.mark.asyncio
+async def test_business_activity_check_disabled_without_flag_column(
+	tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+	"""With no flag column configured the check must say it is disabled."""
+	monkeypatch.setattr(settings, "consistency_hh_business_flag_column", "")
+	service = ConsistencyService(
+		household_csv=_csv(tmp_path / "hh.csv", "caseid\nH1\n"),
+		business_csv=_csv(tmp_path / "biz.csv", "caseid\nH1\n"),
+		phase_a_csv=tmp_path / "missing_pa.csv",
+		cases_csv=tmp_path / "missing_cases.csv",
+	)
+
+	report = await service.run()
+
+	assert any("business-activity check disabled" in line for line in report.lines)
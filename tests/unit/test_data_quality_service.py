@@ -0,0 +1,91 @@
+"""Tests for vectorized data-quality checks."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.services.data_quality_service import DataQualityService, _to_float
+
+
+def _rules(tmp_path: Path, rules: dict[str, list[dict[str, object]]]) -> Path:
+	path = tmp_path / "rules.json"
+	path.write_text(json.dumps(rules), encoding="utf-8")
+	return path
+
+
+@pytest.mark.asyncio
+async def test_check_csv_reports_duplicates_blanks_and_speeding(tmp_path: Path) -> None:
+	"""Configured rules should each produce a compact finding."""
+	csv_path = tmp_path / "hh.csv"
+	lines = ["KEY,caseid,enumerator,duration"]
+	lines += [f"uuid:{i},H{i},FO-1,{300 + i}" for i in range(4)]
+	lines += [f"uuid:{10 + i},H{10 + i},FO-2,{2400 + i * 60}" for i in range(6)]
+	lines += ["uuid:1,,FO-2,99999"]
+	csv_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+	service = DataQualityService(
+		_rules(
+			tmp_path,
+			{
+				"household": [
+					{"check": "duplicate", "column": "KEY"},
+					{"check": "blank", "columns": ["caseid"]},
+					{"check": "duration_outlier", "column": "duration", "z": 3.5},
+					{
+						"check": "speeding",
+						"column": "duration",
+						"by": "enumerator",
+						"min_seconds": 1200,
+					},
+				]
+			},
+		)
+	)
+
+	report = await service.check_csv("household", csv_path)
+
+	assert report.rows == 11
+	text = "\n".join(report.findings)
+	assert "1 duplicated KEY value(s)" in text
+	assert "1 blank required `caseid`" in text
+	assert "duration outlier" in text
+	assert "FO-1 (100% of 4)" in text
+	assert "FO-2" not in text.split("speeding:")[1]
+
+
+@pytest.mark.asyncio
+async def test_missing_columns_and_unknown_forms(tmp_path: Path) -> None:
+	"""Missing columns are reported as skipped; forms without rules are clean."""
+	csv_path = tmp_path / "biz.csv"
+	csv_path.write_text("KEY\nuuid:1\n", encoding="utf-8")
+	service = DataQualityService(
+		_rules(tmp_path, {"business": [{"check": "blank", "columns": ["caseid"]}]})
+	)
+
+	report = await service.check_csv("business", csv_path)
+	assert report.findings == ["blank skipped: missing column(s) caseid"]
+	assert (await service.check_csv("phase_a", csv_path)).ok
+
+
+def test_load_rules_rejects_unknown_check(tmp_path: Path) -> None:
+	"""Typos in the rules file should fail loudly."""
+	service = DataQualityService(_rules(tmp_path, {"household": [{"check": "nope"}]}))
+	with pytest.raises(ValueError, match="Unsupported"):
+		service.load_rules()
+
+
+def test_repo_rules_file_is_valid() -> None:
+	"""The shipped rules file should parse with supported checks only."""
+	rules = DataQualityService(Path("config/data_quality_rules.json")).load_rules()
+	assert {"household", "business"} <= set(rules)
+
+
+def test_to_float_treats_malformed_numbers_as_missing() -> None:
+	"""Cells that only look numeric must become NaN instead of failing the parse."""
+	values = np.array(["12", " -3.5 ", ".5", "--5", "½", "1.2.3", "", "abc", "7-"])
+
+	parsed = _to_float(values)
+
+	assert parsed[:3].tolist() == [12.0, -3.5, 0.5]
+	assert np.isnan(parsed[3:]).all()
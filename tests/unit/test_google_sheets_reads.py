@@ -0,0 +1,127 @@
+"""Tests for batched, concurrent SurveyCTO form sheet reads."""
+
+import gspread
+import pytest
+import requests
+
+from src.config import settings
+from src.integrations.google_sheets import GoogleSheetsClient
+
+_SHEETS = {
+	"sheet-hh": {
+		"settings": [["form_title", "version"], ["HH Survey", "2501"]],
+		"survey": [["type", "name", "label:English"], ["integer", "hh_size", "Size"], [], ["", ""]],
+		"choices": [["list_name", "name", "label"], ["yesno", "1", "Yes"]],
+		"translations": [["never", "read"]],
+	},
+	"sheet-icm": {"Settings": [["form_id", "version"], ["icm", "7"]]},
+}
+
+
+class _Worksheet:
+	def __init__(self, title: str) -> None:
+		self.title = title
+
+
+class _Spreadsheet:
+	def __init__(self, sheet_id: str) -> None:
+		self.sheet_id = sheet_id
+
+	def worksheets(self) -> list[_Worksheet]:
+		return [_Worksheet(title) for title in _SHEETS[self.sheet_id]]
+
+
+class _Response:
+	def __init__(self, payload: dict) -> None:
+		self.payload = payload
+
+	def json(self) -> dict:
+		return self.payload
+
+
+class _Http:
+	def __init__(self) -> None:
+		self.calls: list[tuple[str, list[str]]] = []
+		self.modified = {"sheet-hh": "2026-01-01T00:00:00Z", "sheet-icm": "2026-01-01T00:00:00Z"}
+
+	def request(self, method: str, url: str, params: dict) -> _Response:
+		assert params["fields"] == "modifiedTime"
+		return _Response({"modifiedTime": self.modified[url.rsplit("/", 1)[-1]]})
+
+	def values_batch_get(self, sheet_id: str, ranges: list[str]) -> dict:
+		self.calls.append((sheet_id, ranges))
+		tabs = _SHEETS[sheet_id]
+		value_ranges = []
+		for value_range in ranges:
+			title, _, cells = value_range.partition("!")
+			title = title.strip("'")
+			if title not in tabs:
+				response = requests.Response()
+				response.status_code = 400
+				response._content = b'{"error": {"code": 400, "message": "Unable to parse range"}}'
+				raise gspread.exceptions.APIError(response)
+			values = tabs[title]
+			value_ranges.append({"range": value_range, "values": values[:2] if cells else values})
+		return {"valueRanges": value_ranges}
+
+
+class _Client:
+	def __init__(self) -> None:
+		self.http_client = _Http()
+
+	def open_by_key(self, sheet_id: str) -> _Spreadsheet:
+		return _Spreadsheet(sheet_id)
+
+
+@pytest.fixture
+def client(monkeypatch) -> GoogleSheetsClient:
+	"""A credentialed client reading the fake HH and ICM form sheets."""
+	monkeypatch.setattr(settings, "google_form_hh_survey_sheet_id", "sheet-hh")
+	monkeypatch.setattr(settings, "google_form_icm_business_sheet_id", "sheet-icm")
+	monkeypatch.setattr(settings, "google_form_phase_a_revisit_sheet_id", "")
+	sheets = GoogleSheetsClient()
+	sheets.has_credentials = True
+	sheets.client = _Client()  # type: ignore[assignment]
+	return sheets
+
+
+@pytest.mark.asyncio
+async def test_versions_read_only_settings_rows_one_call_per_sheet(client) -> None:
+	"""Each spreadsheet costs one batchGet of its Settings header and first row."""
+	versions = await client.read_form_versions_from_settings()
+
+	assert versions == {"HH Survey": "2501", "icm": "7"}
+	calls = client.client.http_client.calls
+	assert ("sheet-hh", ["'settings'!1:2"]) in calls
+	# The ICM sheet titles its tab "Settings": one failed batch, then the real title.
+	assert [ranges for sheet_id, ranges in calls if sheet_id == "sheet-icm"] == [
+		["'settings'!1:2"],
+		["'Settings'!1:2"],
+	]
+
+
+@pytest.mark.asyncio
+async def test_form_tabs_read_survey_and_choices_in_one_batch(client) -> None:
+	"""Only the tabs triage uses are read, as records without blank rows."""
+	tabs = await client.read_form_sheet_tabs("sheet-hh")
+
+	assert tabs == {
+		"survey": [{"type": "integer", "name": "hh_size", "label:English": "Size"}],
+		"choices": [{"list_name": "yesno", "name": "1", "label": "Yes"}],
+	}
+	assert client.client.http_client.calls == [("sheet-hh", ["'survey'", "'choices'"])]
+
+
+@pytest.mark.asyncio
+async def test_settings_reread_only_after_drive_reports_a_change(client) -> None:
+	"""An unchanged modifiedTime skips the Settings read entirely."""
+	http = client.client.http_client
+	await client.read_form_versions_from_settings()
+	first_reads = len(http.calls)
+
+	assert await client.read_form_version("sheet-hh") == "2501"
+	assert len(http.calls) == first_reads
+
+	http.modified["sheet-hh"] = "2026-01-02T00:00:00Z"
+	await client.read_form_versions_from_settings()
+	assert http.calls[first_reads:] == [("sheet-hh", ["'settings'!1:2"])]
@@ -0,0 +1,80 @@
+"""Tests for the automation DAG executor."""
+
+import asyncio
+
+import pytest
+
+from src.services.job_dag import DagExecutor, DagNode, validate_dag
+
+
+def _step(log: list[str], name: str, delay: float = 0.0, fail: bool = False):
+	async def _action() -> list[str]:
+		log.append(f"start:{name}")
+		await asyncio.sleep(delay)
+		if fail:
+			raise RuntimeError(f"{name} broke")
+		log.append(f"end:{name}")
+		return [f"{name} done"]
+
+	return _action
+
+
+@pytest.mark.asyncio
+async def test_independent_branches_run_in_parallel() -> None:
+	"""Both downloads should start before either finishes."""
+	log: list[str] = []
+	nodes = [
+		DagNode("download_hh", _step(log, "download_hh", 0.05)),
+		DagNode("download_biz", _step(log, "download_biz", 0.05)),
+		DagNode("dms_hh", _step(log, "dms_hh"), ("download_hh",)),
+		DagNode("dms_biz", _step(log, "dms_biz"), ("download_biz",)),
+	]
+
+	results = await DagExecutor(max_parallel=2).run(nodes)
+
+	assert [result.status for result in results] == ["ok"] * 4
+	assert log[:2] == ["start:download_hh", "start:download_biz"]
+	assert log.index("end:download_hh") < log.index("start:dms_hh")
+
+
+@pytest.mark.asyncio
+async def test_failed_branch_skips_dependents_only() -> None:
+	"""A failure skips its dependents while the other branch completes."""
+	log: list[str] = []
+	nodes = [
+		DagNode("download_hh", _step(log, "download_hh", fail=True)),
+		DagNode("download_biz", _step(log, "download_biz")),
+		DagNode("dms_hh", _step(log, "dms_hh"), ("download_hh",)),
+		DagNode("dms_biz", _step(log, "dms_biz"), ("download_biz",)),
+	]
+
+	results = {result.name: result for result in await DagExecutor().run(nodes)}
+
+	assert results["download_hh"].status == "failed"
+	assert results["download_hh"].details == ["download_hh broke"]
+	assert results["dms_hh"].status == "skipped"
+	assert results["dms_biz"].status == "ok"
+
+
+@pytest.mark.asyncio
+async def test_node_timeout_and_bounded_parallelism() -> None:
+	"""Per-node timeouts apply, and max_parallel=1 serializes execution."""
+	log: list[str] = []
+	nodes = [
+		DagNode("slow", _step(log, "slow", 1.0), timeout_seconds=0.05),
+		DagNode("fast", _step(log, "fast")),
+	]
+
+	results = await DagExecutor(max_parallel=1).run(nodes)
+
+	assert results[0].status == "timeout"
+	assert log == ["start:slow", "start:fast", "end:fast"]
+
+
+def test_validate_dag_rejects_cycles_and_unknown_deps() -> None:
+	"""Invalid graphs should be rejected before anything runs."""
+	noop = _step([], "noop")
+	with pytest.raises(ValueError, match="cycle"):
+		validate_dag([DagNode("a", noop, ("b",)), DagNode("b", noop, ("a",))])
+	with pytest.raises(ValueError, match="unknown"):
+		validate_dag([DagNode("a", noop, ("missing",))])
@@ -0,0 +1,67 @@
+"""Tests for the background job runner."""
+
+import asyncio
+
+import pytest
+
+from src.db.engine import init_db
+from src.db.repositories.job_repo import BackgroundJobRepository
+from src.models.background_job import BackgroundJobRecord, JobStatus
+from src.services.job_runner import JobRunner, render_job
+from src.services.remote_automation_service import AutomationRunResult
+
+
+@pytest.mark.asyncio
+async def test_job_runner_persists_progress_and_result() -> None:
+	"""Submit returns at once; progress and the final result reach the job table."""
+	await init_db()
+	runner = JobRunner(BackgroundJobRepository(), max_workers=1, edit_interval_seconds=0)
+	seen: list[BackgroundJobRecord] = []
+
+	async def listener(record: BackgroundJobRecord) -> int:
+		seen.append(record)
+		return 4242
+
+	async def job(progress):
+		await progress("[download_hh] running")
+		return AutomationRunResult(ok=True, summary="done", details=["[dms_hh] ok"])
+
+	record = await runner.submit("scto_dms_daily", "tester", job, listener=listener)
+	assert record.status == JobStatus.QUEUED
+	await runner.wait(record.job_id)
+
+	stored = await runner.get(record.job_id)
+	assert stored is not None
+	assert stored.status == JobStatus.SUCCEEDED
+	assert stored.progress == ["[download_hh] running"]
+	assert stored.details == ["[dms_hh] ok"]
+	assert stored.message_id == 4242
+	assert [item.status for item in seen][-1] == JobStatus.SUCCEEDED
+	assert "succeeded" in render_job(stored)
+
+
+@pytest.mark.asyncio
+async def test_job_runner_queues_beyond_pool_and_cancels() -> None:
+	"""A second job waits for the single worker and can be cancelled while queued."""
+	await init_db()
+	runner = JobRunner(BackgroundJobRepository(), max_workers=1, edit_interval_seconds=0)
+	release = asyncio.Event()
+
+	async def slow(progress):
+		await release.wait()
+		return AutomationRunResult(ok=True, summary="done", details=[])
+
+	first = await runner.submit("first", "tester", slow)
+	second = await runner.submit("second", "tester", slow)
+	await asyncio.sleep(0)
+
+	assert (await runner.get(first.job_id)).status == JobStatus.RUNNING
+	assert (await runner.get(second.job_id)).status == JobStatus.QUEUED
+	assert runner.cancel(second.job_id)
+	await runner.wait(second.job_id)
+	release.set()
+	await runner.wait(first.job_id)
+
+	assert (await runner.get(second.job_id)).status == JobStatus.CANCELLED
+	assert (await runner.get(first.job_id)).status == JobStatus.SUCCEEDED
+	assert not runner.cancel(first.job_id)
@@ -0,0 +1,166 @@
+"""Tests for multi-format knowledge base extraction."""
+
+import io
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import pytest
+
+from src.config import settings
+from src.knowledge.extractors import extract
+from src.knowledge.indexer import KnowledgeIndexer
+from src.knowledge.variables import parse_variables
+
+_PRINTABLE = """<html><head><title>ICM Follow-up</title><style>td { color: red }</style></head>
+<body><table><tr><td>
+<table class="table table-condensed">
+<thead><tr><th>Field</th><th>Question</th><th>Answer</th></tr></thead>
+<tbody>
+<tr><td colspan="3">Survey &gt; Section B: Household</td></tr>
+<tr>
+<td>hh_q12 (required)</td>
+<td>Does anyone own a <b>tablet</b>?
+<p class="hint">Include borrowed tablets.</p>
+<p class="relevance">Question relevant when: ${hh_q11} = 1</p></td>
+<td><table><tr><td>1</td><td>Yes</td></tr><tr><td>0</td><td>No</td></tr></table></td>
+</tr>
+<tr>
+<td>hh_age</td>
+<td>Age of the head<p class="constraint">Response constrained to: . &lt; 120</p></td>
+<td></td>
+</tr>
+</tbody></table>
+</td></tr></table></body></html>
+"""
+
+
+def _xlsx(sheets: dict[str, list[list[str]]]) -> bytes:
+	"""Build a minimal .xlsx with inline-string cells."""
+	main = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+	rel = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+	buffer = io.BytesIO()
+	with zipfile.ZipFile(buffer, "w") as archive:
+		entries = "".join(
+			f'<sheet name="{name}" sheetId="{index}" r:id="rId{index}"/>'
+			for index, name in enumerate(sheets, start=1)
+		)
+		archive.writestr(
+			"xl/workbook.xml",
+			f'<workbook xmlns="{main}" xmlns:r="{rel}"><sheets>{entries}</sheets></workbook>',
+		)
+		links = "".join(
+			f'<Relationship Id="rId{index}" Target="worksheets/sheet{index}.xml"/>'
+			for index in range(1, len(sheets) + 1)
+		)
+		archive.writestr(
+			"xl/_rels/workbook.xml.rels",
+			f'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">{links}</Relationships>',
+		)
+		for index, rows in enumerate(sheets.values(), start=1):
+			body = "".join(
+				"<row>"
+				+ "".join(
+					f'<c r="{chr(65 + column)}{number}" t="inlineStr">'
+					f"<is><t>{escape(value)}</t></is></c>"
+					for column, value in enumerate(row)
+					if value
+				)
+				+ "</row>"
+				for number, row in enumerate(rows, start=1)
+			)
+			archive.writestr(
+				f"xl/worksheets/sheet{index}.xml",
+				f'<worksheet xmlns="{main}"><sheetData>{body}</sheetData></worksheet>',
+			)
+	return buffer.getvalue()
+
+
+def test_html_printable_becomes_variable_blocks(tmp_path: Path) -> None:
+	"""The streaming converter keeps sections, options, relevance and constraints."""
+	path = tmp_path / "printable.html"
+	path.write_text(_PRINTABLE, encoding="utf-8")
+
+	markdown = extract(path)
+	variables = parse_variables(markdown, "printable.html")
+
+	assert markdown.startswith("# ICM Follow-up")
+	assert "color: red" not in markdown
+	assert [variable.name for variable in variables] == ["hh_q12", "hh_age"]
+	assert variables[0].section == "Section B: Household"
+	assert variables[0].question == "Does anyone own a **tablet** ? _Include borrowed tablets._"
+	assert variables[0].options == ["1: Yes", "0: No"]
+	assert variables[0].logic == "${hh_q11} = 1"
+	assert variables[1].validation == ". < 120"
+
+
+def test_xlsform_workbook_and_plain_csv(tmp_path: Path) -> None:
+	"""XLSForm sheets yield variables with choice labels; other CSVs become tables."""
+	workbook = tmp_path / "icm_form.xlsx"
+	workbook.write_bytes(
+		_xlsx(
+			{
+				"survey": [
+					["type", "name", "label", "relevance", "constraint"],
+					["start", "starttime", "", "", ""],
+					["begin group", "grp_hh", "Household", "", ""],
+					["select_one yesno", "owns_tablet", "Owns a tablet?", "${consent} = 1", ""],
+					["integer", "hh_size", "Household size", "", ". > 0"],
+					["end group", "", "", "", ""],
+				],
+				"choices": [
+					["list_name", "name", "label"],
+					["yesno", "1", "Yes"],
+					["yesno", "0", "No"],
+				],
+				"settings": [["form_title", "form_id"], ["ICM Follow-up", "icm"]],
+			}
+		)
+	)
+	variables = parse_variables(extract(workbook), "icm_form.xlsx")
+
+	assert [variable.name for variable in variables] == ["owns_tablet", "hh_size"]
+	assert variables[0].section == "Household"
+	assert variables[0].options == ["1: Yes", "0: No"]
+	assert variables[0].logic == "${consent} = 1"
+	assert variables[1].value_type == "integer" and variables[1].validation == ". > 0"
+
+	roster = tmp_path / "roster.csv"
+	roster.write_text("psu,barangay\n101,San Jose\n", encoding="utf-8")
+	assert extract(roster) == "# roster\n\n| psu | barangay |\n|---|---|\n| 101 | San Jose |\n"
+
+
+class _FakeEmbeddings:
+	async def embed_batch_async(self, texts: list[str]) -> list[list[float]]:
+		return [[1.0, 0.0] for _ in texts]
+
+
+@pytest.mark.asyncio
+async def test_index_extracts_in_pool_and_caches_by_content_hash(
+	monkeypatch, tmp_path: Path
+) -> None:
+	"""Mixed-format docs are extracted by worker processes once per content hash."""
+	kb = tmp_path / "kb"
+	kb.mkdir()
+	(kb / "printable.html").write_text(_PRINTABLE, encoding="utf-8")
+	(kb / "notes.txt").write_text("Charge tablets nightly.", encoding="utf-8")
+	(kb / "protocol.md").write_text("## Consent\nRead the script.\n", encoding="utf-8")
+	(kb / "photo.png").write_bytes(b"\x89PNG")
+	monkeypatch.setattr(settings, "knowledge_extract_workers", 2)
+	indexer = KnowledgeIndexer(kb, _FakeEmbeddings(), cache_path=tmp_path / "index.pkl")  # type: ignore[arg-type]
+
+	chunks, stats = await indexer.build_index()
+
+	assert stats.total_docs == 3
+	assert {chunk.source_doc for chunk in chunks} == {"notes.txt", "printable.html", "protocol.md"}
+	assert set(indexer.variables) == {"printable.html"}
+	assert len(list(indexer.extract_cache_dir.glob("*.md"))) == 2
+
+	def no_extract(path: Path) -> str:
+		raise AssertionError(f"{path} should come from the extraction cache")
+
+	monkeypatch.setattr("src.knowledge.extractors.extract", no_extract)
+	monkeypatch.setattr(settings, "knowledge_extract_workers", 1)
+	(kb / "protocol.md").unlink()
+	_, rebuilt = await indexer.build_index(force_rebuild=True)
+	assert rebuilt.embedded_chunks == len(chunks) - 1
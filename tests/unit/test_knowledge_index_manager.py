@@ -0,0 +1,65 @@
+"""Tests for coalesced knowledge index rebuilds and retriever hot swap."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from src.knowledge.index_manager import KnowledgeIndexManager
+
+
+class _FakeEmbeddings:
+	def __init__(self) -> None:
+		self.batches = 0
+
+	async def embed_batch_async(self, texts: list[str]) -> list[list[float]]:
+		self.batches += 1
+		await asyncio.sleep(0.01)
+		return [[float(len(text)), 1.0] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_rebuilds_coalesce_and_swap_retriever(tmp_path: Path) -> None:
+	"""Requests during a build share one follow-up build; listeners see each swap."""
+	kb = tmp_path / "kb"
+	kb.mkdir()
+	(kb / "protocol.md").write_text("## Consent\nRead the script.\n", encoding="utf-8")
+	client = _FakeEmbeddings()
+	manager = KnowledgeIndexManager(client, base_path=kb, cache_path=tmp_path / "index.pkl")  # type: ignore[arg-type]
+	swaps = []
+	manager.subscribe(swaps.append)
+
+	await manager.rebuild(reason="startup")
+	first = manager.retriever
+	(kb / "faq.md").write_text("## Tablets\nCharge nightly.\n", encoding="utf-8")
+
+	results = await asyncio.gather(*(manager.rebuild(reason="burst") for _ in range(4)))
+
+	# startup + one build for the first request + one follow-up covering the other three
+	assert len(swaps) == 3
+	assert client.batches == 2
+	assert manager.retriever is not first
+	assert {chunk.source_doc for chunk in manager.retriever.chunks} == {"faq.md", "protocol.md"}
+	assert all(stats.chunk_count == 2 for stats in results)
+
+
+@pytest.mark.asyncio
+async def test_apply_changes_reembeds_only_touched_docs(tmp_path: Path) -> None:
+	"""A watched edit re-embeds one doc and drops a deleted doc's chunks."""
+	kb = tmp_path / "kb"
+	kb.mkdir()
+	(kb / "protocol.md").write_text("## Consent\nRead the script.\n", encoding="utf-8")
+	(kb / "faq.md").write_text("## Tablets\nCharge nightly.\n", encoding="utf-8")
+	client = _FakeEmbeddings()
+	manager = KnowledgeIndexManager(client, base_path=kb, cache_path=tmp_path / "index.pkl")  # type: ignore[arg-type]
+	await manager.rebuild(reason="startup")
+
+	(kb / "protocol.md").write_text("## Consent\nRead the full script aloud.\n", encoding="utf-8")
+	(kb / "faq.md").unlink()
+	stats = await manager.apply_changes({"protocol.md", "faq.md"})
+
+	assert stats.changed_docs == 2
+	assert stats.embedded_chunks == 1
+	assert [chunk.source_doc for chunk in manager.retriever.chunks] == ["protocol.md"]
+	assert "aloud" in manager.retriever.chunks[0].text
+	assert set(manager.doc_hashes) == {"protocol.md"}
@@ -0,0 +1,45 @@
+"""Tests for knowledge base change detection."""
+
+import os
+import time
+from pathlib import Path
+
+from src.knowledge.indexer import KnowledgeIndexer
+
+
+def _write_old(path: Path, text: str) -> None:
+	"""Write a doc with an mtime outside the racy window."""
+	path.parent.mkdir(parents=True, exist_ok=True)
+	path.write_text(text, encoding="utf-8")
+	old = time.time() - 60
+	os.utime(path, (old, old))
+
+
+def test_scan_rehashes_only_stat_changed_docs(monkeypatch, tmp_path: Path) -> None:
+	"""Unchanged docs are served from the stat cache; edits and deletions are reported."""
+	kb = tmp_path / "kb"
+	_write_old(kb / "protocol.md", "## Consent\nRead the script.\n")
+	_write_old(kb / "faq" / "tablets.md", "## Charging\nCharge nightly.\n")
+	indexer = KnowledgeIndexer(kb, openai_client=None, cache_path=tmp_path / "index.pkl")  # type: ignore[arg-type]
+	known = indexer.current_doc_hashes()
+
+	hashed: list[str] = []
+	original = indexer._file_hash
+
+	def counting_hash(path: Path) -> str:
+		hashed.append(path.name)
+		return original(path)
+
+	monkeypatch.setattr(indexer, "_file_hash", counting_hash)
+	assert not indexer.scan_changes(known).changed
+	assert hashed == []
+
+	_write_old(kb / "protocol.md", "## Consent\nRead the full script aloud.\n")
+	(kb / "faq" / "tablets.md").unlink()
+	_write_old(kb / "new.md", "## Revisits\nUse Phase A.\n")
+	changes = indexer.scan_changes(known)
+
+	assert changes.modified == ["protocol.md"]
+	assert changes.deleted == ["faq/tablets.md"]
+	assert changes.added == ["new.md"]
+	assert sorted(hashed) == ["new.md", "protocol.md"]
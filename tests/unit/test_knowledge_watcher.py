@@ -0,0 +1,58 @@
+"""Tests for the knowledge base watcher."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.knowledge.watcher import KnowledgeBaseWatcher
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+async def test_inotify_reports_debounced_doc_paths(tmp_path: Path) -> None:
+	"""Several saves in a burst arrive as one batch of relative doc paths."""
+	(tmp_path / "faq").mkdir()
+	batches: list[set[str] | None] = []
+	watcher = KnowledgeBaseWatcher(
+		tmp_path,
+		lambda docs: _record(batches, docs),
+		debounce_seconds=0.05,
+	)
+	watcher.start()
+	try:
+		assert watcher.backend == "inotify"
+		(tmp_path / "protocol.md").write_text("## A\n", encoding="utf-8")
+		(tmp_path / "faq" / "tablets.md").write_text("## B\n", encoding="utf-8")
+		(tmp_path / "photo.png").write_text("ignored", encoding="utf-8")
+		for _ in range(50):
+			await asyncio.sleep(0.02)
+			if batches:
+				break
+	finally:
+		await watcher.stop()
+
+	assert batches == [{"protocol.md", "faq/tablets.md"}]
+
+
+@pytest.mark.asyncio
+async def test_polling_fallback_requests_full_scan(tmp_path: Path) -> None:
+	"""Without inotify, each poll asks the handler for a full (stat-cached) scan."""
+	batches: list[set[str] | None] = []
+	watcher = KnowledgeBaseWatcher(
+		tmp_path,
+		lambda docs: _record(batches, docs),
+		poll_seconds=0.01,
+		use_inotify=False,
+	)
+	watcher.start()
+	await asyncio.sleep(0.05)
+	await watcher.stop()
+
+	assert watcher.backend == "polling"
+	assert batches and all(batch is None for batch in batches)
+
+
+async def _record(batches: list[set[str] | None], docs: set[str] | None) -> None:
+	batches.append(docs)
@@ -0,0 +1,73 @@
+"""Tests for the structure-aware markdown chunker."""
+
+from src.knowledge.chunker import MarkdownChunker, estimate_tokens
+
+_VARIABLE_BLOCK = """## Section B: Household
+### Variable: `hh_size`
+**Question:** How many people usually live in this household?
+
+**Type:** Free Text / Input
+
+> **Logic:** Show if `consent == 1`
+
+> **Validation:** `. > 0 and . < 30`
+
+---
+
+### Variable: `hh_head`
+**Question:** Who is the household head?
+
+**Options:**
+- **1**: Respondent
+- **2**: Spouse
+
+---
+"""
+
+
+def test_variable_block_is_one_chunk_under_its_section() -> None:
+	"""Question, options, logic and validation stay together with the section path."""
+	chunks = MarkdownChunker(max_tokens=32).chunk(_VARIABLE_BLOCK)
+
+	assert len(chunks) == 2
+	path, text = chunks[0]
+	assert path == "Section B: Household > Variable: `hh_size`"
+	assert text.startswith("### Variable: `hh_size`")
+	assert "How many people" in text and "consent == 1" in text and ". > 0" in text
+	assert "Spouse" in chunks[1][1] and "hh_size" not in chunks[1][1]
+
+
+def test_oversized_table_repeats_header_rows() -> None:
+	"""Split tables keep their header in every chunk and never cut a row."""
+	rows = "\n".join(f"| PSU {index} | Barangay number {index} | assigned |" for index in range(40))
+	content = f"## Assignments\n| PSU | Barangay | Status |\n|---|---|---|\n{rows}\n"
+	chunks = MarkdownChunker(max_tokens=64).chunk(content)
+
+	assert len(chunks) > 1
+	for _, text in chunks:
+		lines = text.splitlines()
+		assert lines[:2] == ["| PSU | Barangay | Status |", "|---|---|---|"]
+		assert all(line.startswith("| PSU ") and line.endswith("|") for line in lines[2:])
+		assert estimate_tokens(text) <= 64
+
+
+def test_long_paragraph_splits_on_sentences_not_words() -> None:
+	"""Prose is cut at sentence boundaries and chunks never cross headings."""
+	sentences = " ".join(
+		f"Sentence number {index} explains the revisit rule." for index in range(30)
+	)
+	content = f"# Protocol\n## Revisits\n{sentences}\n## Consent\nRead the script aloud.\n"
+	chunks = MarkdownChunker(max_tokens=40).chunk(content)
+
+	revisit = [text for path, text in chunks if path == "Revisits"]
+	assert len(revisit) > 1
+	assert all(text.startswith("Sentence number") and text.endswith("rule.") for text in revisit)
+	assert chunks[-1] == ("Consent", "Read the script aloud.")
+
+
+def test_fenced_code_is_not_parsed_as_headings() -> None:
+	"""Lines inside a code fence are content, not structure."""
+	content = "## Stata\n```\n# not a heading\nuse data, clear\n```\n"
+	assert MarkdownChunker().chunk(content) == [
+		("Stata", "```\n# not a heading\nuse data, clear\n```")
+	]
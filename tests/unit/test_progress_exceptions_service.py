@@ -13,7 +13,8 @@ class _FakeSheets:
 	def __init__(self, rows: list[dict[str, str]]) -> None:
 		self._rows = rows
 
-	async def read_productivity(self) -> list[dict[str, str]]:
+	async def read_productivity(self, fresh: bool = False) -> list[dict[str, str]]:
+		assert fresh
 		return self._rows
 
 
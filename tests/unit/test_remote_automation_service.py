@@ -1,5 +1,7 @@
 from pathlib import Path
 
+from src.services.build_cache import DmsBuildCache
+from src.services.consistency_service import ConsistencyReport
 from src.services.remote_automation_service import RemoteAutomationService
 
 
@@ -68,3 +70,215 @@ def test_form_config_unknown():
 	service = RemoteAutomationService(survey_client=None)  # type: ignore[arg-type]
 	with pytest.raises(ValueError, match="Unknown form key"):
 		service._form_config("nonexistent")
+
+
+async def test_run_job_reports_partial_failure_and_logs_node_timings(monkeypatch, tmp_path):
+	"""A failed business download skips only the business DMS and is logged per node."""
+	import json
+
+	service = RemoteAutomationService(survey_client=None)  # type: ignore[arg-type]
+	service.log_path = tmp_path / "jobs.jsonl"
+	service.build_cache = DmsBuildCache(tmp_path / "fingerprints.json")
+
+	async def fake_download(form_key):
+		if form_key == RemoteAutomationService.FORM_BIZ:
+			raise RuntimeError("sctoapi failed")
+		return [f"downloaded {form_key}"]
+
+	async def fake_stata(do_file, progress=None):
+		return f"Ran {do_file.name}"
+
+	monkeypatch.setattr(service, "_download_stage", fake_download)
+	monkeypatch.setattr(service, "_run_stata_do_file", fake_stata)
+
+	result = await service.run_job(
+		job_name=RemoteAutomationService.DAILY_DMS_JOB, requester="tester",
+	)
+
+	assert result.ok is False
+	assert "partially completed" in result.summary
+	assert "dms_biz" in result.summary
+	event = json.loads(service.log_path.read_text(encoding="utf-8").strip())
+	statuses = {node["name"]: node["status"] for node in event["nodes"]}
+	assert statuses == {
+		"download_hh": "ok",
+		"download_biz": "failed",
+		"consistency": "skipped",
+		"dms_hh": "ok",
+		"dms_biz": "skipped",
+	}
+	assert all("duration_seconds" in node for node in event["nodes"])
+
+
+async def test_run_single_dms_skips_unchanged_inputs_unless_forced(monkeypatch, tmp_path):
+	"""A second DMS run with identical inputs is skipped; force and new data re-run it."""
+	do_file = tmp_path / "dms" / "hh_master.do"
+	do_file.parent.mkdir()
+	do_file.write_text("do cleaning.do\n", encoding="utf-8")
+	csv_path = tmp_path / "hh.csv"
+	csv_path.write_text("KEY,caseid\n1,H1\n", encoding="utf-8")
+	monkeypatch.setattr(
+		"src.services.remote_automation_service.settings.stata_household_master_do_path",
+		str(do_file),
+	)
+	monkeypatch.setattr(
+		"src.services.remote_automation_service.settings.surveycto_household_csv_path",
+		str(csv_path),
+	)
+	service = RemoteAutomationService(survey_client=None)  # type: ignore[arg-type]
+	service.log_path = tmp_path / "jobs.jsonl"
+	service.build_cache = DmsBuildCache(tmp_path / "fingerprints.json")
+	runs = []
+
+	async def fake_stata(path, progress=None):
+		runs.append(path.name)
+		return f"Ran {path.name}"
+
+	monkeypatch.setattr(service, "_run_stata_do_file", fake_stata)
+	form = RemoteAutomationService.FORM_HH
+
+	first = await service.run_single_dms(form, requester="tester")
+	second = await service.run_single_dms(form, requester="tester")
+	forced = await service.run_single_dms(form, requester="tester", force=True)
+	csv_path.write_text("KEY,caseid\n1,H1\n2,H2\n", encoding="utf-8")
+	changed = await service.run_single_dms(form, requester="tester")
+
+	assert first.ok and second.ok and forced.ok and changed.ok
+	assert "up to date" in second.summary
+	assert len(runs) == 3
+
+
+async def test_run_job_reports_up_to_date_steps(monkeypatch, tmp_path):
+	"""DMS steps whose inputs are unchanged are listed as skipped in the summary."""
+	service = RemoteAutomationService(survey_client=None)  # type: ignore[arg-type]
+	service.log_path = tmp_path / "jobs.jsonl"
+	service.build_cache = DmsBuildCache(tmp_path / "fingerprints.json")
+
+	async def fake_download(form_key):
+		return [f"downloaded {form_key}"]
+
+	async def fake_stata(do_file, progress=None):
+		return f"Ran {do_file.name}"
+
+	async def fake_consistency():
+		return ConsistencyReport()
+
+	monkeypatch.setattr(service, "_download_stage", fake_download)
+	monkeypatch.setattr(service, "_run_stata_do_file", fake_stata)
+	monkeypatch.setattr(service.consistency, "run", fake_consistency)
+
+	await service.run_job(job_name=RemoteAutomationService.DAILY_DMS_JOB, requester="tester")
+	result = await service.run_job(
+		job_name=RemoteAutomationService.DAILY_DMS_JOB, requester="tester",
+	)
+
+	assert result.ok is True
+	assert "Skipped as up to date: dms_hh, dms_biz" in result.summary
+
+
+async def test_run_stata_do_file_streams_output_and_reports_fatal_error(monkeypatch, tmp_path):
+	"""Output is spooled to disk and the error that ended the do-file is surfaced."""
+	import pytest
+
+	stata = tmp_path / "fake_stata.sh"
+	stata.write_text(
+		"#!/bin/sh\n"
+		"echo 'capture noisily which sctoapi'\n"
+		"echo 'r(111);'\n"
+		"i=0; while [ $i -lt 500 ]; do echo \"row $i\"; i=$((i+1)); done\n"
+		"echo 'variable caseid not found'\n"
+		"echo 'r(111);'\n"
+		"echo ''\n"
+		"echo 'end of do-file'\n",
+		encoding="utf-8",
+	)
+	stata.chmod(0o755)
+	do_file = tmp_path / "master.do"
+	do_file.write_text("use data\n", encoding="utf-8")
+	monkeypatch.setattr(
+		"src.services.remote_automation_service.settings.stata_executable", str(stata)
+	)
+	monkeypatch.setattr("src.services.stata_output.settings.stata_log_dir", str(tmp_path / "logs"))
+	monkeypatch.setattr("src.services.stata_output.settings.stata_tail_lines", 20)
+	service = RemoteAutomationService(survey_client=None)  # type: ignore[arg-type]
+
+	with pytest.raises(RuntimeError, match=r"r\(111\) after: variable caseid not found"):
+		await service._run_stata_do_file(do_file)
+
+	logs = list((tmp_path / "logs").glob("master_*.log"))
+	assert len(logs) == 1
+	assert "row 0" in logs[0].read_text(encoding="utf-8")
+
+
+def test_convert_scto_json_streams_rows_across_chunks(monkeypatch, tmp_path):
+	"""Rows split across read chunks keep the column union in first-seen order."""
+	import csv
+	import json
+
+	monkeypatch.setattr("src.utils.json_stream._CHUNK_CHARS", 16)
+	payload = {
+		"meta": {"count": 3},
+		"data": [
+			{"KEY": "uuid:1", "caseid": "H1", "amount": 12345},
+			{"KEY": "uuid:2", "roster": [{"name": "Ana"}], "note": None},
+			"not a row",
+			{"KEY": "uuid:3", "caseid": "H3"},
+		],
+	}
+	json_path = tmp_path / "form.json"
+	json_path.write_text(json.dumps(payload), encoding="utf-8")
+	csv_path = tmp_path / "out" / "form_WIDE.csv"
+	service = RemoteAutomationService(survey_client=None)  # type: ignore[arg-type]
+
+	rows = service._convert_scto_json_to_csv(json_path, csv_path)
+
+	with csv_path.open(encoding="utf-8-sig", newline="") as handle:
+		records = list(csv.DictReader(handle))
+	assert rows == 3
+	assert list(records[0]) == ["KEY", "caseid", "amount", "roster", "note"]
+	assert records[0]["amount"] == "12345"
+	assert json.loads(records[1]["roster"]) == [{"name": "Ana"}]
+	assert records[2]["caseid"] == "H3"
+
+
+def test_convert_scto_json_to_csv_removes_partial_output(tmp_path, monkeypatch):
+	"""A payload that fails mid-write leaves neither the CSV nor its temp file behind."""
+	import pytest
+
+	passes = []
+
+	def _rows(json_path):
+		passes.append(json_path)
+		yield {"KEY": "uuid:1"}
+		if len(passes) > 1:
+			raise ValueError("truncated JSON")
+
+	service = RemoteAutomationService(survey_client=None)  # type: ignore[arg-type]
+	monkeypatch.setattr(service, "_iter_scto_json_rows", _rows)
+	csv_path = tmp_path / "out" / "form_WIDE.csv"
+
+	with pytest.raises(RuntimeError, match="Failed parsing"):
+		service._convert_scto_json_to_csv(tmp_path / "form.json", csv_path)
+
+	assert list(csv_path.parent.iterdir()) == []
+
+
+def test_ensure_csv_output_promotes_fresh_export(tmp_path):
+	"""A fresh sctoapi CSV is copied to the configured path and the original kept."""
+	from datetime import UTC, datetime, timedelta
+
+	fresh = tmp_path / "form_WIDE.csv"
+	fresh.write_text("KEY\nuuid:1\n", encoding="utf-8")
+	target = tmp_path / "dms" / "household.csv"
+	service = RemoteAutomationService(survey_client=None)  # type: ignore[arg-type]
+
+	message = service._ensure_csv_output(
+		form_id="form",
+		output_folder=tmp_path,
+		csv_output_path=target,
+		started_at=datetime.now(UTC) - timedelta(minutes=1),
+	)
+
+	assert message == f"csv_ready path={target}"
+	assert target.read_text(encoding="utf-8") == "KEY\nuuid:1\n"
+	assert fresh.exists()
@@ -0,0 +1,145 @@
+"""Tests for chunk metadata and metadata-filtered retrieval."""
+
+from pathlib import Path
+
+import pytest
+
+from src.knowledge.indexer import KnowledgeChunk, KnowledgeIndexer
+from src.knowledge.metadata import ChunkFilter, split_front_matter
+from src.knowledge.retriever import KnowledgeRetriever
+from src.knowledge.variables import QuestionnaireVariable, VariableDictionary
+from src.services.intent_classifier import Intent
+from src.services.protocol_service import ProtocolService
+from src.services.surveycto_issue_service import SurveyCTOIssueService
+
+
+class _FixedQuery:
+	async def embed_text_async(self, text: str) -> list[float]:
+		return [1.0, 0.0]
+
+
+def _chunk(
+	chunk_id: str, group: str, embedding: list[float], tags: tuple[str, ...] = ()
+) -> KnowledgeChunk:
+	return KnowledgeChunk(
+		chunk_id=chunk_id,
+		source_doc=f"{chunk_id}.md",
+		section_path="root",
+		text=chunk_id,
+		embedding=embedding,
+		doc_group=group,
+		tags=tags,
+	)
+
+
+@pytest.mark.asyncio
+async def test_search_scores_only_chunks_matching_filters() -> None:
+	"""Filters mask rows before ranking; a filter matching nothing is ignored."""
+	retriever = KnowledgeRetriever(
+		[
+			_chunk("best_questionnaire", "questionnaire", [1.0, 0.0]),
+			_chunk("faq", "faq", [0.5, 0.5], tags=("tablets",)),
+			_chunk("protocol", "protocol", [0.9, 0.1]),
+			_chunk("fallback_embedding", "protocol", [1.0, 0.0, 0.0]),
+		],
+		_FixedQuery(),  # type: ignore[arg-type]
+	)
+
+	unfiltered = await retriever.search("q", top_k=2)
+	assert [chunk.chunk_id for chunk in unfiltered] == ["best_questionnaire", "protocol"]
+
+	protocol_docs = ChunkFilter(doc_groups=frozenset({"protocol", "faq"}))
+	scoped = await retriever.search("q", top_k=4, filters=protocol_docs)
+	assert [chunk.chunk_id for chunk in scoped] == ["protocol", "faq", "fallback_embedding"]
+
+	tagged = await retriever.search("q", filters=ChunkFilter(tags=frozenset({"tablets"})))
+	assert [chunk.chunk_id for chunk in tagged] == ["faq"]
+
+	missing_form = ChunkFilter(forms=frozenset({"missing"}))
+	nothing = await retriever.search("q", top_k=1, filters=missing_form)
+	assert [chunk.chunk_id for chunk in nothing] == ["best_questionnaire"]
+
+
+class _FakeEmbeddings:
+	async def embed_batch_async(self, texts: list[str]) -> list[list[float]]:
+		return [[1.0, 0.0] for _ in texts]
+
+
+@pytest.mark.asyncio
+async def test_indexer_stamps_front_matter_and_derived_metadata(tmp_path: Path) -> None:
+	"""Front matter sets group/form/tags and is not indexed as text."""
+	kb = tmp_path / "kb"
+	(kb / "faq").mkdir(parents=True)
+	(kb / "revisits.md").write_text(
+		"---\ngroup: protocol\nform: Phase A Revisit\ntags: [revisit, tracking]\n---\n"
+		"# Revisits\n## Moved respondents\n### Same barangay\nFollow them.\n",
+		encoding="utf-8",
+	)
+	(kb / "faq" / "tablets.md").write_text("## Charging\nCharge nightly.\n", encoding="utf-8")
+	(kb / "hh.md").write_text(
+		"### Variable: `hh_q1`\n**Question:** Size?\n\n---\n", encoding="utf-8"
+	)
+
+	indexer = KnowledgeIndexer(kb, _FakeEmbeddings(), cache_path=tmp_path / "index.pkl")  # type: ignore[arg-type]
+	chunks, _ = await indexer.build_index()
+	by_doc = {chunk.source_doc: chunk for chunk in chunks}
+
+	revisit = by_doc["revisits.md"]
+	assert (revisit.doc_group, revisit.form, revisit.tags) == (
+		"protocol",
+		"Phase A Revisit",
+		("revisit", "tracking"),
+	)
+	assert revisit.section_depth == 2 and "group:" not in revisit.text
+	assert by_doc["faq/tablets.md"].doc_group == "faq"
+	assert (by_doc["hh.md"].doc_group, by_doc["hh.md"].form) == ("questionnaire", "hh")
+	assert split_front_matter("no front matter\n---\n") == ({}, "no front matter\n---\n")
+
+
+def test_protocol_filter_widens_when_a_variable_is_named() -> None:
+	"""Scenario questions search protocol/FAQ docs unless they name a variable."""
+	retriever = KnowledgeRetriever(
+		[], _FixedQuery(), VariableDictionary([QuestionnaireVariable("hh_q12", "hh.md")])  # type: ignore[arg-type]
+	)
+	service = ProtocolService(retriever, None, None, None)  # type: ignore[arg-type]
+
+	moved = service.search_filter("Respondent moved, what now?", Intent.PROTOCOL)
+	assert moved.doc_groups == {"protocol", "faq"}
+	assert service.search_filter("Why is hh_q12 skipped?", Intent.PROTOCOL).doc_groups == {
+		"protocol",
+		"faq",
+		"questionnaire",
+	}
+	assert service.search_filter("anything", None) is None
+
+
+@pytest.mark.asyncio
+async def test_questionnaire_context_narrows_to_the_detected_form() -> None:
+	"""Detected form labels resolve to the doc-stem form names chunks carry."""
+	chunks = [
+		KnowledgeChunk(
+			chunk_id=chunk_id,
+			source_doc=f"{form}.xlsx",
+			section_path="root",
+			text=chunk_id,
+			embedding=embedding,
+			doc_group="questionnaire",
+			form=form,
+		)
+		for chunk_id, form, embedding in (
+			("business_best", "ICM_Business_linked_launch", [1.0, 0.0]),
+			("household_q1", "ICM_follow_up_launch_integrated", [0.8, 0.2]),
+			("household_q2", "ICM_follow_up_launch_integrated_v2", [0.6, 0.4]),
+		)
+	]
+	retriever = KnowledgeRetriever(chunks, _FixedQuery())  # type: ignore[arg-type]
+	service = SurveyCTOIssueService(None, None, retriever)  # type: ignore[arg-type]
+
+	assert service.metadata_forms("HH Survey", retriever.forms) == {
+		"ICM_follow_up_launch_integrated",
+		"ICM_follow_up_launch_integrated_v2",
+	}
+	context = await service.questionnaire_context("hh_q1 is skipped", "HH Survey")
+	assert context.split("\n\n") == ["household_q1", "household_q2"]
+	unknown = await service.questionnaire_context("something broke", "Unknown")
+	assert unknown.split("\n\n")[0] == "business_best"
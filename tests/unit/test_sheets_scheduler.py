@@ -0,0 +1,86 @@
+"""Tests for the quota-aware Sheets API scheduler."""
+
+import json
+
+import pytest
+import requests
+from gspread.exceptions import APIError
+
+from src.integrations.sheets_scheduler import SheetsApiScheduler, TokenBucket
+
+
+def _response(status: int, error: dict | None = None) -> requests.Response:
+	response = requests.Response()
+	response.status_code = status
+	response._content = json.dumps({"error": {"code": status, **(error or {})}}).encode()
+	return response
+
+
+class _Clock:
+	def __init__(self) -> None:
+		self.now = 0.0
+		self.sleeps: list[float] = []
+
+	def __call__(self) -> float:
+		return self.now
+
+	def sleep(self, seconds: float) -> None:
+		self.sleeps.append(seconds)
+		self.now += seconds
+
+
+def test_token_bucket_paces_requests_to_the_quota() -> None:
+	"""A burst up to capacity is free; further requests wait for refill."""
+	clock = _Clock()
+	bucket = TokenBucket(60, period=60.0, capacity=2, clock=clock, sleep=clock.sleep)
+
+	assert [bucket.acquire() for _ in range(2)] == [0.0, 0.0]
+	assert bucket.acquire() == pytest.approx(1.0)
+	clock.now += 5
+	assert bucket.acquire() == 0.0
+
+
+class _Session:
+	def __init__(self, statuses: list[int]) -> None:
+		self.statuses = statuses
+		self.calls = 0
+
+	def request(self, **kwargs: object) -> requests.Response:
+		self.calls += 1
+		return _response(self.statuses.pop(0))
+
+
+def test_rate_limited_requests_retry_with_backoff() -> None:
+	"""429s are retried through the quota client; other errors fail at once."""
+	sleeps: list[float] = []
+	scheduler = SheetsApiScheduler(
+		workers=1, requests_per_minute=6000, max_retries=2, backoff_seconds=0.5, sleep=sleeps.append
+	)
+	client_class = scheduler.http_client_class()
+
+	session = _Session([429, 429, 200])
+	response = client_class(None, session=session).request("get", "https://sheets.test")  # type: ignore[arg-type]
+	assert response.status_code == 200 and session.calls == 3
+	assert 0.5 <= sleeps[0] < 1.0 and 1.0 <= sleeps[1] < 1.5
+
+	with pytest.raises(APIError):
+		client_class(None, session=_Session([429, 429, 429])).request("get", "https://sheets.test")  # type: ignore[arg-type]
+	with pytest.raises(APIError):
+		client_class(None, session=_Session([404])).request("get", "https://sheets.test")  # type: ignore[arg-type]
+
+	metrics = scheduler.metrics()
+	assert (metrics["requests"], metrics["rate_limited"], metrics["retries"]) == (7, 5, 4)
+
+
+@pytest.mark.asyncio
+async def test_run_counts_queue_and_outcomes() -> None:
+	"""Jobs run on the dedicated pool and are reflected in the metrics."""
+	scheduler = SheetsApiScheduler(workers=2, requests_per_minute=60)
+
+	assert await scheduler.run(lambda value: value * 2, 21) == 42
+	with pytest.raises(ValueError):
+		await scheduler.run(int, "not a number")
+
+	metrics = scheduler.metrics()
+	assert (metrics["queued"], metrics["running"]) == (0, 0)
+	assert (metrics["completed"], metrics["failed"]) == (1, 1)
@@ -0,0 +1,36 @@
+"""Tests for bounded Stata output handling."""
+
+from pathlib import Path
+
+from src.services.stata_output import StataOutputMonitor
+
+
+def test_monitor_keeps_bounded_tail_across_chunk_boundaries(tmp_path: Path) -> None:
+	"""Lines split across chunks are reassembled and only the last N kept."""
+	monitor = StataOutputMonitor("hh", log_dir=tmp_path, tail_lines=10)
+	payload = "".join(f"line {index}\n" for index in range(100)).encode("utf-8")
+	for start in range(0, len(payload), 7):
+		monitor.feed("stdout", payload[start : start + 7])
+	monitor.close()
+
+	assert monitor.line_count == 100
+	assert list(monitor.tail) == [f"line {index}" for index in range(90, 100)]
+	assert monitor.log_path.read_text(encoding="utf-8").count("\n") == 100
+
+
+def test_monitor_treats_only_trailing_error_as_fatal(tmp_path: Path) -> None:
+	"""Captured errors followed by more output are not fatal."""
+	monitor = StataOutputMonitor("biz", log_dir=tmp_path)
+	monitor.feed("stdout", b"which sctoapi\nr(111);\nchecking sctoapi consistency\n")
+	monitor.close()
+
+	assert monitor.errors == ["r(111) after: which sctoapi"]
+	assert monitor.fatal_error is None
+
+
+def test_monitor_prunes_old_spool_files(tmp_path: Path) -> None:
+	"""Only the newest spool files are kept."""
+	for _ in range(4):
+		StataOutputMonitor("hh", log_dir=tmp_path, keep_files=2).close()
+
+	assert len(list(tmp_path.glob("*.log"))) == 2
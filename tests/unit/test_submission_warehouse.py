@@ -0,0 +1,111 @@
+"""Tests for the local SQLite submission warehouse."""
+
+import asyncio
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.services.submission_warehouse import IngestStats, SubmissionWarehouse
+
+
+def _write_csv(path: Path, text: str) -> Path:
+	path.write_text(text, encoding="utf-8-sig")
+	return path
+
+
+@pytest.mark.asyncio
+async def test_ingest_loads_rows_and_indexes_key_columns(tmp_path: Path) -> None:
+	"""Ingest should bulk-load all rows and index the known key columns."""
+	csv_path = _write_csv(
+		tmp_path / "hh.csv",
+		"SubmissionDate,KEY,caseid,enumerator,team\n"
+		'"Feb 17, 2026 2:18:18 PM",uuid:1,H1,FO-1,team_a\n'
+		'"Feb 18, 2026 9:00:00 AM",uuid:2,H2,FO-2,team_a\n'
+		'"Feb 19, 2026 9:00:00 AM",uuid:3,H3,FO-3\n',
+	)
+	warehouse = SubmissionWarehouse(tmp_path / "wh.db", batch_size=2)
+
+	stats = await warehouse.ingest_csv("household", csv_path)
+
+	assert stats.rows == 3
+	assert set(stats.indexed) >= {"KEY", "caseid", "enumerator", "SubmissionDate", "team"}
+	with sqlite3.connect(tmp_path / "wh.db") as conn:
+		indexes = conn.execute(
+			"SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'form_household'"
+		).fetchall()
+	assert len(indexes) == 6
+
+
+@pytest.mark.asyncio
+async def test_counts_by_and_since_filter(tmp_path: Path) -> None:
+	"""Grouped counts should respect the normalized submission date filter."""
+	csv_path = _write_csv(
+		tmp_path / "hh.csv",
+		"SubmissionDate,KEY,caseid,team\n"
+		'"Feb 17, 2026 2:18:18 PM",uuid:1,H1,team_a\n'
+		'"Feb 18, 2026 9:00:00 AM",uuid:2,H2,team_a\n'
+		'"Feb 19, 2026 9:00:00 AM",uuid:3,H3,team_b\n',
+	)
+	warehouse = SubmissionWarehouse(tmp_path / "wh.db")
+	await warehouse.ingest_csv("household", csv_path)
+
+	assert await warehouse.counts_by("household", "TEAM") == [("team_a", 2), ("team_b", 1)]
+	recent = await warehouse.counts_by("household", "team", since=datetime(2026, 2, 18))
+	assert recent == [("team_a", 1), ("team_b", 1)]
+	assert await warehouse.row_count("household", since=datetime(2026, 2, 19)) == 1
+
+
+@pytest.mark.asyncio
+async def test_reingest_replaces_table_and_missing_from(tmp_path: Path) -> None:
+	"""Re-ingesting replaces old rows; missing_from finds unmatched case IDs."""
+	warehouse = SubmissionWarehouse(tmp_path / "wh.db")
+	hh = _write_csv(tmp_path / "hh.csv", "KEY,caseid\nuuid:1,H1\nuuid:2,H2\n")
+	biz = _write_csv(tmp_path / "biz.csv", "KEY,caseid\nuuid:9,H1\n")
+	await warehouse.ingest_csv("household", hh)
+	await warehouse.ingest_csv("business", biz)
+
+	assert await warehouse.missing_from("household", "business") == ["H2"]
+
+	_write_csv(hh, "KEY,caseid\nuuid:1,H1\n")
+	await warehouse.ingest_csv("household", hh)
+	assert await warehouse.row_count("household") == 1
+	assert await warehouse.missing_from("household", "business") == []
+	assert warehouse.has_form("business")
+	assert not warehouse.has_form("phase_a")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_ingests_are_serialized(
+	tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+	"""Parallel downloads must not hold overlapping write transactions."""
+	warehouse = SubmissionWarehouse(tmp_path / "wh.db", batch_size=10)
+	rows = [f"uuid:{i},H{i}\n" for i in range(200)]
+	hh = _write_csv(tmp_path / "hh.csv", "KEY,caseid\n" + "".join(rows))
+	biz = _write_csv(tmp_path / "biz.csv", "KEY,caseid\n" + "".join(rows[:100]))
+	ingest = warehouse._ingest
+	active: list[str] = []
+	overlaps: list[tuple[str, ...]] = []
+
+	def _tracked(form_key: str, csv_path: Path) -> IngestStats:
+		active.append(form_key)
+		if len(active) > 1:
+			overlaps.append(tuple(active))
+		time.sleep(0.05)
+		try:
+			return ingest(form_key, csv_path)
+		finally:
+			active.remove(form_key)
+
+	monkeypatch.setattr(warehouse, "_ingest", _tracked)
+
+	stats = await asyncio.gather(
+		warehouse.ingest_csv("household", hh), warehouse.ingest_csv("business", biz)
+	)
+
+	assert [item.rows for item in stats] == [200, 100]
+	assert overlaps == []
+	assert await warehouse.row_count("business") == 100
@@ -0,0 +1,131 @@
+"""Tests for the stale-while-revalidate Sheets cache."""
+
+import asyncio
+
+import pytest
+
+from src.integrations.google_sheets import SOURCE_PRODUCTIVITY, GoogleSheetsClient
+from src.integrations.swr_cache import SWRCache
+
+
+class _Source:
+	def __init__(self) -> None:
+		self.calls = 0
+		self.fail = False
+		self.gate = asyncio.Event()
+		self.gate.set()
+
+	async def fetch(self) -> int:
+		self.calls += 1
+		await self.gate.wait()
+		if self.fail:
+			raise RuntimeError("quota exceeded")
+		return self.calls
+
+
+@pytest.mark.asyncio
+async def test_stale_copy_served_while_one_refresh_runs() -> None:
+	"""Readers never wait on a refresh once a copy exists; refreshes are single-flight."""
+	source = _Source()
+	cache = SWRCache({"rows": 60.0})
+
+	assert (await cache.get("rows", source.fetch)).value == 1
+	assert (await cache.get("rows", source.fetch)).value == 1
+	assert source.calls == 1
+
+	cache.ttls["rows"] = 0.0
+	source.gate.clear()
+	served = await asyncio.gather(*(cache.get("rows", source.fetch) for _ in range(5)))
+	assert {entry.value for entry in served} == {1}
+	assert all(entry.stale and entry.refreshing for entry in served)
+	assert source.calls == 2
+
+	source.gate.set()
+	await asyncio.sleep(0)
+	await asyncio.sleep(0)
+	assert cache.peek("rows").value == 2
+
+	assert (await cache.get("rows", source.fetch, fresh=True)).value == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_last_good_copy() -> None:
+	"""Errors only surface when there is nothing cached to fall back on."""
+	source = _Source()
+	source.fail = True
+	cache = SWRCache({}, default_ttl=60.0)
+
+	with pytest.raises(RuntimeError):
+		await cache.get("rows", source.fetch)
+
+	source.fail = False
+	await cache.get("rows", source.fetch)
+	source.fail = True
+	cache.ttls["rows"] = 0.0
+	assert (await cache.get("rows", source.fetch)).value == 2
+	await asyncio.sleep(0)
+	assert cache.peek("rows").value == 2
+
+
+@pytest.mark.asyncio
+async def test_fresh_read_raises_instead_of_serving_old_copy() -> None:
+	"""A caller that needs current data sees the failure, not an hours-old copy."""
+	source = _Source()
+	cache = SWRCache({}, default_ttl=60.0)
+	await cache.get("rows", source.fetch)
+
+	source.fail = True
+	with pytest.raises(RuntimeError):
+		await cache.get("rows", source.fetch, fresh=True)
+	assert cache.peek("rows").value == 1
+
+
+class _Worksheet:
+	def __init__(self) -> None:
+		self.reads = 0
+		self.fail = False
+
+	def get_all_records(self) -> list[dict[str, str]]:
+		self.reads += 1
+		if self.fail:
+			raise RuntimeError("quota exceeded")
+		return [{"fo": "FO-1", "team": "team_a", "completed": "4", "target": "3.5"}]
+
+
+class _Sheet:
+	def __init__(self, worksheet: _Worksheet) -> None:
+		self.worksheet = worksheet
+
+	def get_worksheet(self, index: int) -> _Worksheet:
+		return self.worksheet
+
+
+class _Client:
+	def __init__(self) -> None:
+		self.worksheet = _Worksheet()
+
+	def open_by_key(self, sheet_id: str) -> _Sheet:
+		return _Sheet(self.worksheet)
+
+
+@pytest.mark.asyncio
+async def test_productivity_reads_share_one_sheet_read() -> None:
+	"""Concurrent commands cost one get_all_records; stale replies get a footer."""
+	sheets = GoogleSheetsClient()
+	sheets.has_credentials = True
+	sheets.client = _Client()  # type: ignore[assignment]
+
+	rows = await asyncio.gather(*(sheets.read_productivity() for _ in range(4)))
+	assert all(batch == rows[0] for batch in rows) and rows[0][0]["fo"] == "FO-1"
+	assert sheets.client.worksheet.reads == 1
+	assert sheets.staleness_note(SOURCE_PRODUCTIVITY) == ""
+
+	sheets.sheet_cache.ttls[SOURCE_PRODUCTIVITY] = 0.0
+	await sheets.read_productivity()
+	note = sheets.staleness_note(SOURCE_PRODUCTIVITY)
+	assert note == "_Sheet data as of 0 min ago; refreshing now._"
+
+	sheets.client.worksheet.fail = True
+	with pytest.raises(RuntimeError):
+		await sheets.read_productivity(fresh=True)
+	assert (await sheets.read_productivity())[0]["fo"] == "FO-1"
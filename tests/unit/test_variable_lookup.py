@@ -0,0 +1,136 @@
+"""Tests for the questionnaire variable dictionary and protocol fast path."""
+
+from pathlib import Path
+
+import pytest
+
+from src.knowledge.indexer import KnowledgeIndexer
+from src.knowledge.retriever import KnowledgeRetriever
+from src.knowledge.variables import VariableDictionary, parse_variables
+from src.models.interaction import ConfidenceLevel
+from src.services.protocol_service import ProtocolService
+
+_QUESTIONNAIRE = """# Questionnaire
+## Section B: Household
+### Variable: `hh_q12`
+**Question:** Does anyone in the household own a tablet?
+
+**Options:**
+- **1**: Yes
+- **0**: No
+
+> **Logic:** Show if `hh_q11 == 1`
+
+> **Validation:** `. == 0 or . == 1`
+
+---
+
+### Variable: `hh_q13`
+**Question:** How many tablets?
+
+**Type:** Free Text / Input
+
+---
+
+### Variable: `income_total`
+**Question:** Total household income last month.
+
+**Type:** Free Text / Input
+
+---
+"""
+
+
+def _dictionary() -> VariableDictionary:
+	return VariableDictionary(parse_variables(_QUESTIONNAIRE, "questionnaire_knowledge.md"))
+
+
+def test_parse_variables_reads_every_field() -> None:
+	"""Question, options, logic, validation and section come out of each block."""
+	variables = parse_variables(_QUESTIONNAIRE, "questionnaire_knowledge.md")
+
+	assert [variable.name for variable in variables] == ["hh_q12", "hh_q13", "income_total"]
+	first = variables[0]
+	assert first.question == "Does anyone in the household own a tablet?"
+	assert first.options == ["1: Yes", "0: No"]
+	assert first.logic == "hh_q11 == 1"
+	assert first.validation == ". == 0 or . == 1"
+	assert first.section == "Section B: Household"
+	assert variables[1].value_type == "Free Text / Input" and variables[1].logic == ""
+
+
+def test_lookup_exact_prefix_and_fuzzy() -> None:
+	"""The trie answers exact names, wildcard/unique prefixes, and one-typo names."""
+	dictionary = _dictionary()
+
+	assert dictionary.lookup("HH_Q12").kind == "exact"
+	prefix = dictionary.lookup("hh_q*")
+	assert prefix.kind == "prefix" and [v.name for v in prefix.variables] == ["hh_q12", "hh_q13"]
+	assert dictionary.lookup("income_t").variables[0].name == "income_total"
+	fuzzy = dictionary.lookup("incme_total")
+	assert fuzzy.kind == "fuzzy" and fuzzy.variables[0].name == "income_total"
+	# hh_q14 is one edit from both hh_q12 and hh_q13: ambiguous, no answer.
+	assert dictionary.lookup("hh_q14") is None
+
+
+def test_match_question_only_takes_pure_lookups() -> None:
+	"""Lookup phrasing matches; questions that merely mention a variable do not."""
+	dictionary = _dictionary()
+
+	relevance = dictionary.match_question("What is the relevance of hh_q12?")
+	assert relevance.variables[0].name == "hh_q12"
+	assert dictionary.match_question("`income_total`").kind == "exact"
+	assert dictionary.match_question("Why did the enumerator skip hh_q12 for household 4?") is None
+	assert dictionary.match_question("What is consent?") is None
+
+
+class _Interactions:
+	def __init__(self) -> None:
+		self.records = []
+
+	async def create(self, record) -> None:
+		self.records.append(record)
+
+
+class _NoLLM:
+	async def embed_text_async(self, text: str) -> list[float]:
+		raise AssertionError("variable lookups must not call the embeddings API")
+
+
+@pytest.mark.asyncio
+async def test_protocol_answers_variable_lookup_without_llm() -> None:
+	"""The protocol path answers from the dictionary and logs the interaction."""
+	interactions = _Interactions()
+	retriever = KnowledgeRetriever([], _NoLLM(), _dictionary())  # type: ignore[arg-type]
+	service = ProtocolService(retriever, _NoLLM(), interactions, None)  # type: ignore[arg-type]
+
+	answer, confidence = await service.answer_question("what's the relevance of hh_q12?")
+
+	assert confidence == ConfidenceLevel.HIGH
+	assert "`hh_q11 == 1`" in answer and "Does anyone" in answer
+	assert interactions.records[0].source_docs == ["questionnaire_knowledge.md"]
+
+
+class _FakeEmbeddings:
+	async def embed_batch_async(self, texts: list[str]) -> list[list[float]]:
+		return [[1.0, 0.0] for _ in texts]
+
+
+@pytest.mark.asyncio
+async def test_variables_are_kept_with_index_cache(tmp_path: Path) -> None:
+	"""A cache hit restores the dictionary without re-reading the doc."""
+	kb = tmp_path / "kb"
+	kb.mkdir()
+	(kb / "questionnaire_knowledge.md").write_text(_QUESTIONNAIRE, encoding="utf-8")
+	cache = tmp_path / "index.pkl"
+	await KnowledgeIndexer(kb, _FakeEmbeddings(), cache_path=cache).build_index()  # type: ignore[arg-type]
+
+	indexer = KnowledgeIndexer(kb, _FakeEmbeddings(), cache_path=cache)  # type: ignore[arg-type]
+	_, stats = await indexer.build_index()
+
+	assert stats.cache_hit
+	assert [v.name for v in indexer.variables["questionnaire_knowledge.md"]] == [
+		"hh_q12",
+		"hh_q13",
+		"income_total",
+	]
@@ -0,0 +1,98 @@
+"""Tests for XLSForm expression parsing and variable dependency graphs."""
+
+import pytest
+
+from src.integrations.xlsform_logic import (
+	BinaryOp,
+	Call,
+	Current,
+	ExpressionError,
+	Literal,
+	Ref,
+	expression_references,
+	parse_expression,
+)
+from src.integrations.xlsform_snapshot import FormSnapshot
+from src.services.surveycto_issue_service import SurveyCTOIssueService
+
+_SURVEY = [
+	{"type": "select_one yesno", "name": "consent", "label": "Consent?"},
+	{"type": "begin group", "name": "sec_b", "relevant": "${consent} = 1"},
+	{"type": "integer", "name": "hh_size", "label": "Household size", "constraint": ". > 0"},
+	{"type": "begin repeat", "name": "members", "repeat_count": "${hh_size}"},
+	{"type": "integer", "name": "age", "label": "Age"},
+	{"type": "select_one yesno", "name": "in_school", "relevant": "${age} >= 5 and ${age} < 25"},
+	{"type": "end repeat", "name": ""},
+	{"type": "end group", "name": ""},
+	{"type": "calculate", "name": "n_members", "calculation": "count(${age})"},
+]
+
+
+def test_parse_expression_builds_ast_with_precedence() -> None:
+	"""``and`` binds tighter than ``or``; calls, ``.`` and predicates parse."""
+	tree = parse_expression("${a} = 'yes' or ${b} > 2 and selected(${c}, '1')")
+
+	assert tree == BinaryOp(
+		"or",
+		BinaryOp("=", Ref("a"), Literal("yes")),
+		BinaryOp(
+			"and",
+			BinaryOp(">", Ref("b"), Literal("2")),
+			Call("selected", (Ref("c"), Literal("1"))),
+		),
+	)
+	assert parse_expression("string-length(.) <= 10").left == Call("string-length", (Current(),))
+	assert expression_references("if(${x} != '', ${rep}[1], ${x} div 2)") == ["x", "rep"]
+
+	with pytest.raises(ExpressionError):
+		parse_expression("${a} = ")
+	assert expression_references("${a} = = ${b}") == ["a", "b"]
+
+
+def test_graph_follows_groups_repeats_and_expressions() -> None:
+	"""Upstream walks reach enclosing group relevance; downstream finds readers."""
+	graph = FormSnapshot.build("hh_survey", "1", {"survey": _SURVEY}).graph
+
+	assert graph.fields["in_school"].repeat == "members"
+	assert graph.fields["n_members"].groups == ()
+	upstream = graph.upstream("in_school")
+	assert list(dict.fromkeys(edge.source for edge in upstream)) == [
+		"members",
+		"age",
+		"sec_b",
+		"hh_size",
+		"consent",
+	]
+	assert ("hh_size", "members", "repeat_count") in {
+		(edge.source, edge.target, edge.column) for edge in upstream
+	}
+	assert {edge.target for edge in graph.dependents("age")} == {"in_school", "n_members"}
+	assert graph.controls("consent") == []
+
+
+class _Sheets:
+	def __init__(self) -> None:
+		self.snapshots = {"hh_survey": FormSnapshot.build("hh_survey", "1", {"survey": _SURVEY})}
+		self.calls = 0
+
+	async def current_form_snapshots(self) -> dict[str, FormSnapshot]:
+		self.calls += 1
+		return self.snapshots
+
+
+@pytest.mark.asyncio
+async def test_controls_question_is_answered_from_graph() -> None:
+	""""What controls X" needs no LLM; other questions never touch the sheets."""
+	sheets = _Sheets()
+	service = SurveyCTOIssueService(sheets, None)  # type: ignore[arg-type]
+
+	answer = await service.answer_controls_question("What controls in_school?")
+	assert answer is not None
+	assert answer.startswith("**in_school** in hh_survey (select_one yesno; repeat `members`)")
+	assert "`in_school` relevant `${age} >= 5 and ${age} < 25` reads `age`" in answer
+	assert "`sec_b` relevant `${consent} = 1` reads `consent`" in answer
+
+	assert await service.answer_controls_question("what does `hh_size` depend on?") is not None
+	assert await service.answer_controls_question("What controls unknown_var?") is None
+	assert await service.answer_controls_question("How do I charge tablets?") is None
+	assert sheets.calls == 3
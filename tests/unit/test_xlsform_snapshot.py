@@ -0,0 +1,102 @@
+"""Tests for persisted XLSForm snapshots behind SurveyCTO issue context."""
+
+from pathlib import Path
+
+import pytest
+
+from src.config import settings
+from src.integrations.google_sheets import GoogleSheetsClient
+from src.integrations.xlsform_snapshot import FormSnapshot, XLSFormSnapshotStore, issue_keywords
+
+_TABS = {
+	"survey": [
+		{
+			"type": "integer",
+			"name": "hh_size",
+			"label:English": "Household size",
+			"relevant": "",
+			"constraint": ". > 0",
+		},
+		{
+			"type": "select_one yesno",
+			"name": "owns_tablet",
+			"label": "Owns a tablet?",
+			"relevant": "${hh_size} > 0",
+		},
+		{"type": "text", "name": "respondent_name", "label": "Respondent name", "relevant": ""},
+	],
+	"choices": [{"list_name": "yesno", "name": "1", "label": "Yes"}],
+}
+
+
+def test_search_uses_token_index_and_ranks_named_rows_first() -> None:
+	"""Snake_case parts and relevance references are indexed; exact names win."""
+	snapshot = FormSnapshot.build("hh_survey", "2501", _TABS)
+
+	keywords = issue_keywords("tablet question skipped when size is zero", ["hh_size"])
+	rows = snapshot.search(keywords, {"hh_size"}, 5)
+	assert [row.name for row in rows] == ["hh_size", "owns_tablet"]
+	assert rows[0].label == "Household size" and rows[0].constraint == ". > 0"
+	assert snapshot.search({"nothing"}, set(), 5) == []
+
+
+class _Calls:
+	def __init__(self, version: str) -> None:
+		self.version = version
+		self.versions = 0
+		self.tabs = 0
+
+	async def fetch_version(self) -> str:
+		self.versions += 1
+		return self.version
+
+	async def fetch_tabs(self) -> dict:
+		self.tabs += 1
+		return _TABS
+
+
+@pytest.mark.asyncio
+async def test_store_redownloads_only_when_version_changes(tmp_path: Path) -> None:
+	"""Tabs are fetched once per version; snapshots survive a restart."""
+	calls = _Calls("2501")
+	store = XLSFormSnapshotStore(tmp_path, check_interval_seconds=0)
+
+	first = await store.current("hh_survey", calls.fetch_version, calls.fetch_tabs)
+	await store.current("hh_survey", calls.fetch_version, calls.fetch_tabs)
+	assert (calls.versions, calls.tabs) == (2, 1)
+
+	restarted = XLSFormSnapshotStore(tmp_path, check_interval_seconds=0)
+	loaded = await restarted.current("hh_survey", calls.fetch_version, calls.fetch_tabs)
+	assert calls.tabs == 1
+	assert loaded.rows == first.rows and loaded.index == first.index
+
+	calls.version = "2502"
+	refreshed = await restarted.current("hh_survey", calls.fetch_version, calls.fetch_tabs)
+	assert calls.tabs == 2 and refreshed.version == "2502"
+
+	throttled = XLSFormSnapshotStore(tmp_path, check_interval_seconds=600)
+	throttled.note_version("hh_survey", "2502")
+	await throttled.current("hh_survey", calls.fetch_version, calls.fetch_tabs)
+	assert calls.versions == 4  # the monitor's version read stood in for a check
+
+
+@pytest.mark.asyncio
+async def test_issue_context_queries_local_snapshot(monkeypatch, tmp_path: Path) -> None:
+	"""Repeated issue reports cost no tab downloads once a snapshot exists."""
+	monkeypatch.setattr(settings, "google_form_hh_survey_sheet_id", "sheet-hh")
+	monkeypatch.setattr(settings, "google_form_icm_business_sheet_id", "")
+	monkeypatch.setattr(settings, "google_form_phase_a_revisit_sheet_id", "")
+	client = GoogleSheetsClient()
+	client.has_credentials = True
+	client.form_snapshots = XLSFormSnapshotStore(tmp_path, check_interval_seconds=600)
+	calls = _Calls("2501")
+	monkeypatch.setattr(client, "read_form_version", lambda sheet_id: calls.fetch_version())
+	monkeypatch.setattr(client, "read_form_sheet_tabs", lambda sheet_id: calls.fetch_tabs())
+
+	for _ in range(3):
+		context = await client.surveycto_issue_context(
+			"owns_tablet did not appear", ["owns_tablet"]
+		)
+
+	assert context.startswith("Form hh_survey:\n[survey] name=owns_tablet type=select_one yesno")
+	assert (calls.versions, calls.tabs) == (1, 1)
@@ -0,0 +1,132 @@
+"""Tests for the per-version question embedding index behind symptom matching."""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from src.integrations.xlsform_snapshot import FormSnapshot
+from src.integrations.xlsform_vectors import XLSFormVectorStore
+from src.services.surveycto_issue_service import SurveyCTOIssueService
+
+_VOCABULARY = ["income", "business", "age", "school", "consent", "household"]
+
+_SURVEY = [
+	{"type": "select_one yesno", "name": "has_biz", "label": "Does the household run a business?"},
+	{
+		"type": "integer",
+		"name": "biz_inc",
+		"label": "Monthly business income",
+		"hint": "Net of costs",
+		"relevant": "${has_biz} = 1",
+	},
+	{"type": "begin group", "name": "sec_c", "label": "Schooling"},
+	{"type": "integer", "name": "age", "label": "Age of member"},
+	{"type": "end group", "name": ""},
+	{"type": "calculate", "name": "total", "calculation": "${biz_inc} * 12"},
+]
+
+
+class _BagOfWords:
+	def __init__(self) -> None:
+		self.batches = 0
+		self.queries = 0
+
+	@staticmethod
+	def _vector(text: str) -> list[float]:
+		words = set(re.findall(r"[a-z]+", text.lower()))
+		return [1.0 if word in words else 0.0 for word in _VOCABULARY]
+
+	async def embed_batch_async(self, texts: list[str]) -> list[list[float]]:
+		self.batches += 1
+		return [self._vector(text) for text in texts]
+
+	async def embed_text_async(self, text: str) -> list[float]:
+		self.queries += 1
+		return self._vector(text)
+
+
+@pytest.mark.asyncio
+async def test_index_is_embedded_once_per_version_and_results_cached(tmp_path: Path) -> None:
+	"""Questions are embedded per version; repeated symptoms reuse results."""
+	embedder = _BagOfWords()
+	store = XLSFormVectorStore(embedder, tmp_path)  # type: ignore[arg-type]
+	snapshots = {"hh_survey": FormSnapshot.build("hh_survey", "1", {"survey": _SURVEY})}
+
+	symptom = "the income question shows with no business"
+	first = await store.candidates(snapshots, symptom, top_k=2)
+	again = await store.candidates(snapshots, symptom.replace("the", "The  "), top_k=2)
+	assert [candidate.name for candidate in first] == ["biz_inc", "has_biz"]
+	assert again == first
+	assert (embedder.batches, embedder.queries) == (1, 1)
+	assert (await store.index_for(snapshots["hh_survey"])).names == ["has_biz", "biz_inc", "age"]
+
+	reloaded = XLSFormVectorStore(embedder, tmp_path)  # type: ignore[arg-type]
+	await reloaded.candidates(snapshots, "age wrong", top_k=1)
+	assert embedder.batches == 1
+
+	snapshots = {"hh_survey": FormSnapshot.build("hh_survey", "2", {"survey": _SURVEY})}
+	await reloaded.candidates(snapshots, "age wrong", top_k=1)
+	assert embedder.batches == 2
+
+
+class _FlakyBatches(_BagOfWords):
+	async def embed_batch_async(self, texts: list[str]) -> list[list[float]]:
+		vectors = await super().embed_batch_async(texts)
+		# The first build loses a batch to 32-float placeholder vectors.
+		return [[0.5] * 32, *vectors[1:]] if self.batches == 1 else vectors
+
+
+@pytest.mark.asyncio
+async def test_placeholder_vectors_are_not_cached_or_saved(tmp_path: Path) -> None:
+	"""A build with mismatched vector lengths is retried instead of persisted."""
+	embedder = _FlakyBatches()
+	store = XLSFormVectorStore(embedder, tmp_path)  # type: ignore[arg-type]
+	snapshots = {"hh_survey": FormSnapshot.build("hh_survey", "1", {"survey": _SURVEY})}
+
+	assert await store.candidates(snapshots, "business income", top_k=1) == []
+	assert not (tmp_path / "hh_survey.vectors.pkl").exists()
+
+	found = await store.candidates(snapshots, "business income", top_k=1)
+	assert [candidate.name for candidate in found] == ["biz_inc"]
+	assert embedder.batches == 2
+	assert (tmp_path / "hh_survey.vectors.pkl").exists()
+
+
+class _Sheets:
+	def __init__(self) -> None:
+		self.snapshot = FormSnapshot.build("hh_survey", "1", {"survey": _SURVEY})
+		self.issue_hints: list[str] = []
+
+	async def current_form_snapshots(self) -> dict[str, FormSnapshot]:
+		return {"hh_survey": self.snapshot}
+
+	async def surveycto_issue_context(self, issue_text: str, variable_hints: list[str]) -> str:
+		self.issue_hints = variable_hints
+		return ""
+
+
+class _Chat(_BagOfWords):
+	def __init__(self) -> None:
+		super().__init__()
+		self.context = ""
+
+	async def chat_with_system_prompt(
+		self, system_prompt: str, user_message: str, context: str
+	) -> str:
+		self.context = context
+		return "DIAGNOSIS: Shown when has_biz is 1.\nSUGGESTED_FIX: Check has_biz."
+
+
+@pytest.mark.asyncio
+async def test_diagnose_locates_variable_from_symptom(tmp_path: Path) -> None:
+	"""A described symptom resolves to a variable and its upstream chain."""
+	sheets, chat = _Sheets(), _Chat()
+	service = SurveyCTOIssueService(sheets, chat)  # type: ignore[arg-type]
+	service.question_index = XLSFormVectorStore(chat, tmp_path)  # type: ignore[arg-type]
+
+	diagnosis = await service.diagnose("The income question keeps showing even when no business")
+
+	assert diagnosis.variable_name == "biz_inc"
+	assert sheets.issue_hints[:2] == ["biz_inc", "has_biz"]
+	assert "`biz_inc` relevant `${has_biz} = 1` reads `has_biz`" in chat.context